@@ -0,0 +1,78 @@
+import json
+import time
+
+from spypointapi.cameras.camera_api_response import CameraApiResponse
+from spypointapi.json_backend import backend
+
+COUNT = 10_000
+
+
+def camera_json(i):
+    return {
+        "id": str(i),
+        "config": {
+            "name": f"camera {i}",
+            "captureMode": "photo",
+            "delay": 30,
+            "multiShot": 1,
+            "quality": "high",
+            "operationMode": "standard",
+            "sensibility": {"level": "medium"},
+            "transmitAuto": True,
+            "transmitFormat": "full",
+            "transmitFreq": 6,
+            "transmitTime": {"hour": 6, "minute": 0},
+            "triggerSpeed": "optimal",
+        },
+        "status": {
+            "model": "FLEX",
+            "modemFirmware": "1.0.0",
+            "version": "2.0.0",
+            "lastUpdate": "2024-10-30T02:03:48.716Z",
+            "signal": {"processed": {"percentage": 77}},
+            "temperature": {"unit": "C", "value": 20},
+            "batteries": [0, 90, 0],
+            "batteryType": "AA",
+            "memory": {"used": 100, "size": 1000},
+            "notifications": ["low_battery"],
+            "coordinates": [{"position": {"type": "Point", "coordinates": [-70.1234, 45.123456]}}],
+        },
+        "activationDate": "2024-09-30T01:02:03.456Z",
+        "creationDate": "2024-09-20T10:00:00.000Z",
+        "isCellular": True,
+    }
+
+
+def per_camera_decoding(raw):
+    # the decoding path before timezones were resolved per batch
+    return [CameraApiResponse.camera_from_json(data) for data in json.loads(raw.decode())]
+
+
+def batch_decoding(raw):
+    return CameraApiResponse.from_bytes(raw)
+
+
+def measure(decode, raw, rounds=5):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        cameras = decode(raw)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, cameras
+
+
+def run():
+    raw = json.dumps([camera_json(i) for i in range(COUNT)]).encode()
+    print(f'{COUNT} cameras, {len(raw) / 1024 / 1024:.1f} MiB, json backend={backend}')
+
+    per_camera_time, per_camera_cameras = measure(per_camera_decoding, raw)
+    batch_time, batch_cameras = measure(batch_decoding, raw)
+    assert per_camera_cameras == batch_cameras
+
+    print(f'per camera: {per_camera_time * 1000:.1f} ms')
+    print(f'     batch: {batch_time * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+from dataclasses import make_dataclass
+from datetime import datetime, timedelta
+
+from spypointapi import Camera
+from spypointapi.cameras.camera import field_specs
+
+COUNT = 10_000
+
+
+class LegacyCameraBase:
+
+    @property
+    def is_online(self) -> bool:
+        now = datetime.now().astimezone()
+        diff = now - self.last_update_time
+        return diff <= timedelta(hours=24)
+
+
+# the Camera model before it was slotted: a plain dataclass with a per instance __dict__
+LegacyCamera = make_dataclass(
+    'LegacyCamera',
+    field_specs(Camera),
+    bases=(LegacyCameraBase,),
+)
+
+
+def create(camera_class, count):
+    last_update_time = datetime.now().astimezone()
+    return [camera_class(id=str(i), name=f'camera {i}', model='model', modem_firmware='1.0', camera_firmware='2.0',
+                         last_update_time=last_update_time, signal=80, temperature=20, battery=90, memory=10.5)
+            for i in range(count)]
+
+
+def measure(camera_class):
+    tracemalloc.start()
+    start = time.perf_counter()
+    cameras = create(camera_class, COUNT)
+    create_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    online = sum(camera.is_online for camera in cameras)
+    is_online_time = time.perf_counter() - start
+    assert online == COUNT
+    return memory, create_time, is_online_time
+
+
+def run():
+    print(f'{COUNT} cameras')
+    for camera_class in (LegacyCamera, Camera):
+        memory, create_time, is_online_time = measure(camera_class)
+        print(f'{camera_class.__name__:>13}: memory={memory / 1024:.0f} KiB, '
+              f'create={create_time * 1000:.1f} ms, is_online={is_online_time * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import aiohttp
+
+from spypointapi import SpypointApi
+from .load_benchmark import async_start_server, free_port
+
+FLEET_SIZES = (1_000, 10_000)
+OFFLOAD_THRESHOLD = 64 * 1024
+
+
+async def async_heartbeat(lags, interval=0.001):
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def async_max_lag(api: SpypointApi, rounds: int = 5) -> float:
+    lags = []
+    heartbeat = asyncio.create_task(async_heartbeat(lags))
+    try:
+        for _ in range(rounds):
+            await api.async_get_own_cameras()
+    finally:
+        heartbeat.cancel()
+    return max(lags)
+
+
+async def async_run():
+    for cameras in FLEET_SIZES:
+        port = free_port()
+        server = await async_start_server(port, cameras, 0, 0.0)
+        try:
+            async with aiohttp.ClientSession() as session:
+                for threshold in (None, OFFLOAD_THRESHOLD):
+                    api = SpypointApi('username', 'password', session, decode_offload_threshold=threshold)
+                    api.base_url = f'http://127.0.0.1:{port}/api/v3'
+                    await api.async_authenticate()
+                    lag = await async_max_lag(api)
+                    mode = 'on loop' if threshold is None else 'offloaded'
+                    print(f'{cameras:>6} cameras {mode:>9}: max event loop lag={lag * 1000:7.1f} ms')
+        finally:
+            server.terminate()
+            await server.wait()
+
+
+if __name__ == '__main__':
+    asyncio.run(async_run())
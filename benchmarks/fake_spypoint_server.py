@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+from typing import Dict
+
+from aiohttp import web
+
+from .camera_decoding import camera_json
+
+
+def jwt_for_test(expires_at: float) -> str:
+    def encode(data: Dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+
+    signature = base64.urlsafe_b64encode(b'not-a-real-signature').rstrip(b'=').decode()
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode({'exp': int(expires_at)})}.{signature}"
+
+
+class FakeSpypointServer:
+
+    def __init__(self, cameras: int = 10, shared_cameras: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: int = 1, token_lifetime: float = 3600.0, seed: int | None = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.token_lifetime = token_lifetime
+        self.random = random.Random(seed)
+        self.tokens: Dict[str, float] = {}
+        self.requests: Dict[str, int] = {}
+        # bodies are serialized once, the server should not be what the benchmark measures
+        self.cameras_body = json.dumps([camera_json(i) for i in range(cameras)]).encode()
+        shared_camera_ids = [f'shared{i}' for i in range(shared_cameras)]
+        self.shared_cameras_body = json.dumps(
+            [{'sharedCameras': [{'cameraId': camera_id} for camera_id in shared_camera_ids]}]).encode()
+        self.shared_camera_bodies = {}
+        for camera_id in shared_camera_ids:
+            camera = camera_json(camera_id)
+            del camera['id']
+            self.shared_camera_bodies[camera_id] = json.dumps(camera).encode()
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post('/api/v3/user/login', self._login)
+        app.router.add_get('/api/v3/camera/all', self._cameras)
+        app.router.add_get('/api/v3/shared-cameras/all', self._shared_cameras)
+        app.router.add_get('/api/v3/shared-cameras/{camera_id}', self._shared_camera)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        self.requests[route] = self.requests.get(route, 0) + 1
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.random.random() < self.throttle_rate:
+            return web.json_response({'error': 'too many requests'}, status=429, headers={'Retry-After': str(self.retry_after)})
+        if self.random.random() < self.error_rate:
+            return web.json_response({'error': 'internal error'}, status=500)
+        if not request.path.endswith('/user/login') and not self._is_authorized(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        return await handler(request)
+
+    def _is_authorized(self, request: web.Request) -> bool:
+        token = request.headers.get('Authorization', '').removeprefix('Bearer ')
+        return self.tokens.get(token, 0) > time.time()
+
+    async def _login(self, request: web.Request) -> web.Response:
+        expires_at = time.time() + self.token_lifetime
+        token = jwt_for_test(expires_at)
+        self.tokens[token] = expires_at
+        return web.json_response({'token': token})
+
+    async def _cameras(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.cameras_body, content_type='application/json')
+
+    async def _shared_cameras(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.shared_cameras_body, content_type='application/json')
+
+    async def _shared_camera(self, request: web.Request) -> web.Response:
+        body = self.shared_camera_bodies.get(request.match_info['camera_id'])
+        if body is None:
+            return web.json_response({'error': 'not found'}, status=404)
+        return web.Response(body=body, content_type='application/json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Spypoint REST api')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--cameras', type=int, default=10)
+    parser.add_argument('--shared-cameras', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='seconds of random latency variation')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of 429 responses')
+    parser.add_argument('--token-lifetime', type=float, default=3600.0, help='seconds before tokens expire')
+    args = parser.parse_args()
+
+    server = FakeSpypointServer(cameras=args.cameras, shared_cameras=args.shared_cameras,
+                                latency=args.latency, jitter=args.jitter,
+                                error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                                token_lifetime=args.token_lifetime)
+    web.run_app(server.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
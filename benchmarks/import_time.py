@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+STATEMENTS = (
+    'import spypointapi',
+    'from spypointapi import Camera',
+    'from spypointapi import SpypointApi',
+)
+
+
+def import_times(statement: str) -> dict:
+    # -X importtime reports, per module, the cumulative import time in microseconds and the nesting by indentation
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.removeprefix('import time:').split('|')
+        top_level = len(module) - len(module.lstrip()) == 1
+        times[module.strip()] = (int(cumulative), top_level)
+    return times
+
+
+def main():
+    # modules imported by interpreter startup are reported too, the baseline is subtracted
+    baseline = import_times('pass')
+    for statement in STATEMENTS:
+        times = import_times(statement)
+        total = sum(cumulative for module, (cumulative, top_level) in times.items()
+                    if top_level and module not in baseline)
+        print(f'{statement:<40} modules={len(times) - len(baseline):>4}  total={total / 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
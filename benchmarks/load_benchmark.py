@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import aiohttp
+
+from spypointapi import SpypointApi
+
+FLEET_SIZES = (10, 1_000, 10_000)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def async_start_server(port: int, cameras: int, shared_cameras: int, latency: float) -> asyncio.subprocess.Process:
+    # the server runs in its own process so its cpu and memory are not counted as the client's
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-m', 'benchmarks.fake_spypoint_server', '--port', str(port),
+        '--cameras', str(cameras), '--shared-cameras', str(shared_cameras), '--latency', str(latency))
+    for _ in range(200):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return process
+        except OSError:
+            await asyncio.sleep(0.05)
+    process.kill()
+    raise RuntimeError('fake spypoint server did not start')
+
+
+async def async_run_fleet(cameras: int, shared_cameras: int, iterations: int, latency: float):
+    port = free_port()
+    server = await async_start_server(port, cameras, shared_cameras, latency)
+    try:
+        async with aiohttp.ClientSession() as session:
+            api = SpypointApi('username', 'password', session)
+            api.base_url = f'http://127.0.0.1:{port}/api/v3'
+            await api.async_get_cameras()
+
+            latencies = []
+            requests = api.request_stats.requests
+            start = time.perf_counter()
+            for _ in range(iterations):
+                iteration_start = time.perf_counter()
+                assert len(await api.async_get_cameras()) == cameras + shared_cameras
+                latencies.append(time.perf_counter() - iteration_start)
+            elapsed = time.perf_counter() - start
+            requests = api.request_stats.requests - requests
+
+            # tracing allocations slows every allocation down, it gets its own pass outside the timings
+            tracemalloc.start()
+            await api.async_get_cameras()
+            _, peak_allocated = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        server.terminate()
+        await server.wait()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'{cameras:>6} cameras: p50={statistics.median(latencies) * 1000:8.1f} ms  p99={p99 * 1000:8.1f} ms  '
+          f'requests/s={requests / elapsed:8.1f}  peak allocated={peak_allocated / 1024 / 1024:6.1f} MiB  '
+          f'peak rss={peak_rss / 1024:6.1f} MiB')
+
+
+def run_fleets(fleet_sizes, shared_cameras: int, iterations: int, latency: float):
+    # ru_maxrss is the peak of the whole process, each fleet size runs in its own process to get its own peak
+    for cameras in fleet_sizes:
+        subprocess.run([sys.executable, '-m', 'benchmarks.load_benchmark', '--cameras', str(cameras),
+                        '--shared-cameras', str(shared_cameras), '--iterations', str(iterations),
+                        '--latency', str(latency)], check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive SpypointApi against the fake spypoint server')
+    parser.add_argument('--cameras', type=int, nargs='*', default=FLEET_SIZES)
+    parser.add_argument('--shared-cameras', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0)
+    args = parser.parse_args()
+    if len(args.cameras) == 1:
+        asyncio.run(async_run_fleet(args.cameras[0], args.shared_cameras, args.iterations, args.latency))
+    else:
+        run_fleets(args.cameras, args.shared_cameras, args.iterations, args.latency)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,108 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
 __all__ = [
+    "AdaptiveRateLimiter",
+    "Alert",
+    "AlertEngine",
     "Camera",
+    "CameraChange",
+    "CameraChangeType",
+    "CameraConfig",
+    "CameraGeoIndex",
+    "CameraPoller",
+    "ConfigReconciler",
+    "ConnectionMetrics",
     "Coordinates",
+    "FileTokenStore",
+    "FleetSnapshot",
+    "FrozenCamera",
+    "KeyValueTokenStore",
+    "MemoryTokenStore",
+    "NewItemsRule",
+    "OfflineRule",
+    "OpenTelemetryObserver",
+    "Photo",
+    "PrometheusObserver",
+    "ResponseCache",
+    "RetryPolicy",
+    "SharedFleetPublisher",
+    "SharedFleetReader",
     "SpypointApiError",
     "SpypointApiInvalidCredentialsError",
     "SpypointApi",
+    "SpypointAccountPool",
+    "TelemetryHistory",
+    "ThresholdRule",
 ]
 
-from .cameras.camera import Camera, Coordinates
-from .spypoint_api_errors import SpypointApiError, SpypointApiInvalidCredentialsError
-from .spypoint_api import SpypointApi
+# symbols are imported on first use, importing the package does not load aiohttp
+_MODULES = {
+    "AdaptiveRateLimiter": ".rate_limiter",
+    "Alert": ".alert_rules",
+    "AlertEngine": ".alert_rules",
+    "Camera": ".cameras.camera",
+    "CameraChange": ".cameras.camera_changes",
+    "CameraChangeType": ".cameras.camera_changes",
+    "CameraConfig": ".cameras.camera_config",
+    "CameraGeoIndex": ".cameras.camera_geo_index",
+    "CameraPoller": ".camera_poller",
+    "ConfigReconciler": ".config_reconciler",
+    "ConnectionMetrics": ".connection_metrics",
+    "Coordinates": ".cameras.camera",
+    "FileTokenStore": ".token_store",
+    "FleetSnapshot": ".cameras.fleet_snapshot",
+    "FrozenCamera": ".cameras.camera",
+    "KeyValueTokenStore": ".token_store",
+    "MemoryTokenStore": ".token_store",
+    "NewItemsRule": ".alert_rules",
+    "OfflineRule": ".alert_rules",
+    "OpenTelemetryObserver": ".instrumentation",
+    "Photo": ".photos.photo",
+    "PrometheusObserver": ".instrumentation",
+    "ResponseCache": ".response_cache",
+    "RetryPolicy": ".retry_policy",
+    "SharedFleetPublisher": ".shared_fleet",
+    "SharedFleetReader": ".shared_fleet",
+    "SpypointApiError": ".spypoint_api_errors",
+    "SpypointApiInvalidCredentialsError": ".spypoint_api_errors",
+    "SpypointApi": ".spypoint_api",
+    "SpypointAccountPool": ".spypoint_account_pool",
+    "TelemetryHistory": ".telemetry_history",
+    "ThresholdRule": ".alert_rules",
+}
+
+if TYPE_CHECKING:
+    from .cameras.camera import Camera, Coordinates, FrozenCamera
+    from .cameras.camera_changes import CameraChange, CameraChangeType
+    from .cameras.camera_config import CameraConfig
+    from .cameras.camera_geo_index import CameraGeoIndex
+    from .cameras.fleet_snapshot import FleetSnapshot
+    from .photos.photo import Photo
+    from .connection_metrics import ConnectionMetrics
+    from .instrumentation import OpenTelemetryObserver, PrometheusObserver
+    from .rate_limiter import AdaptiveRateLimiter
+    from .response_cache import ResponseCache
+    from .retry_policy import RetryPolicy
+    from .shared_fleet import SharedFleetPublisher, SharedFleetReader
+    from .telemetry_history import TelemetryHistory
+    from .token_store import FileTokenStore, KeyValueTokenStore, MemoryTokenStore
+    from .spypoint_api_errors import SpypointApiError, SpypointApiInvalidCredentialsError
+    from .spypoint_api import SpypointApi
+    from .spypoint_account_pool import SpypointAccountPool
+    from .camera_poller import CameraPoller
+    from .config_reconciler import ConfigReconciler
+    from .alert_rules import Alert, AlertEngine, NewItemsRule, OfflineRule, ThresholdRule
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,265 @@
+import heapq
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from .cameras.camera import Camera
+from .cameras.camera_changes import CameraChange, CameraChangeType
+from .cameras.fleet_snapshot import OPERATORS, FleetSnapshot
+
+_CAMERA_FIELDS = frozenset(camera_field.name for camera_field in fields(Camera))
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdRule:
+    name: str
+    field: str
+    op: str
+    threshold: Any
+    # hysteresis, once firing the alert holds while the value still compares true to this, defaults to threshold
+    clear_threshold: Any = None
+    # debounce, the condition must hold on this many consecutive reports of a camera before firing
+    debounce: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class OfflineRule:
+    name: str = 'offline'
+    # same default as Camera.is_online_at
+    after: timedelta = timedelta(hours=24)
+
+
+@dataclass(frozen=True, slots=True)
+class NewItemsRule:
+    name: str = 'new_notifications'
+    field: str = 'notifications'
+
+
+Rule = ThresholdRule | OfflineRule | NewItemsRule
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    rule: str
+    camera_id: str
+    firing: bool
+    value: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class _CompiledThreshold:
+    rule: ThresholdRule
+    fire: Callable[[Any], bool]
+    hold: Callable[[Any], bool]
+
+
+def _compile(rule: ThresholdRule) -> _CompiledThreshold:
+    compare = OPERATORS[rule.op]
+    threshold = rule.threshold
+    clear_threshold = threshold if rule.clear_threshold is None else rule.clear_threshold
+    # an unknown value neither fires nor clears
+    return _CompiledThreshold(rule,
+                              lambda value: value is not None and bool(compare(value, threshold)),
+                              lambda value: value is None or bool(compare(value, clear_threshold)))
+
+
+def _rows(mask: bytes) -> Iterator[int]:
+    # find scans in C, the cost follows the selected rows and not the fleet size
+    row = mask.find(1)
+    while row != -1:
+        yield row
+        row = mask.find(1, row + 1)
+
+
+class AlertEngine:
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules: List[Rule] = list(rules)
+        self._threshold_rules: Dict[str, List[_CompiledThreshold]] = {}
+        self._new_items_rules: List[NewItemsRule] = []
+        self._offline_rules: List[OfflineRule] = []
+        names: Set[str] = set()
+        for rule in self.rules:
+            if rule.name in names:
+                raise ValueError(f'Duplicate rule [{rule.name}]')
+            names.add(rule.name)
+            if isinstance(rule, OfflineRule):
+                self._offline_rules.append(rule)
+                continue
+            if rule.field not in _CAMERA_FIELDS:
+                raise ValueError(f'Unknown camera field [{rule.field}] in rule [{rule.name}]')
+            if isinstance(rule, NewItemsRule):
+                self._new_items_rules.append(rule)
+            elif rule.op not in OPERATORS:
+                raise ValueError(f'Unknown operator [{rule.op}] in rule [{rule.name}]')
+            else:
+                self._threshold_rules.setdefault(rule.field, []).append(_compile(rule))
+
+        # rule name to camera id to the value the alert fired with
+        self.firing: Dict[str, Dict[str, Any]] = {name: {} for name in names}
+        self._pending: Dict[str, Dict[str, int]] = {name: {} for name in names}
+        self._seen_items: Dict[str, Dict[str, frozenset]] = {rule.name: {} for rule in self._new_items_rules}
+        self._last_update_times: Dict[str, datetime] = {}
+        # (deadline, rule name, camera id, last update time) of every tracked camera, stale entries are skipped
+        self._deadlines: List[Tuple[datetime, str, str, datetime]] = []
+
+    def is_firing(self, rule: str, camera_id: str) -> bool:
+        return camera_id in self.firing[rule]
+
+    def evaluate_changes(self, changes: Iterable[CameraChange], now: datetime | None = None) -> List[Alert]:
+        now = now or datetime.now(timezone.utc)
+        alerts = []
+        for change in changes:
+            camera = change.camera
+            if change.type == CameraChangeType.REMOVED:
+                alerts.extend(self._remove(camera.id))
+                continue
+
+            # a new report moves last_update_time, debounce counts reports and not only value changes
+            added = change.type == CameraChangeType.ADDED
+            reported = added or 'last_update_time' in change.changes
+            for field, compiled_rules in self._threshold_rules.items():
+                if reported or field in change.changes:
+                    value = getattr(camera, field)
+                    for compiled in compiled_rules:
+                        alert = self._evaluate_threshold(compiled, camera.id, value)
+                        if alert is not None:
+                            alerts.append(alert)
+            for rule in self._new_items_rules:
+                if added or rule.field in change.changes:
+                    alert = self._evaluate_new_items(rule, camera.id, getattr(camera, rule.field))
+                    if alert is not None:
+                        alerts.append(alert)
+            if self._offline_rules and reported:
+                alerts.extend(self._schedule(camera, now))
+
+        alerts.extend(self._expire(now))
+        return alerts
+
+    def evaluate_snapshot(self, snapshot: FleetSnapshot, now: datetime | None = None) -> List[Alert]:
+        # full re-evaluation, masks are computed over whole columns and only rows changing state are visited;
+        # new items rules compare every row with the items seen, rules on other fields without a snapshot column
+        # only run from evaluate_changes
+        now = now or snapshot.taken_at
+        rows = {camera_id: row for row, camera_id in enumerate(snapshot.ids)}
+        alerts = []
+        for field, compiled_rules in self._threshold_rules.items():
+            if field not in snapshot.columns:
+                continue
+            column = snapshot.column(field)
+            for compiled in compiled_rules:
+                rule = compiled.rule
+                firing = self._firing_mask(rule.name, rows, len(snapshot))
+                fire = snapshot.where(field, rule.op, rule.threshold)
+                clear_threshold = rule.threshold if rule.clear_threshold is None else rule.clear_threshold
+                hold = snapshot.any_of(snapshot.where(field, rule.op, clear_threshold), snapshot.is_null(field))
+                pending = self._pending[rule.name]
+                for camera_id in [camera_id for camera_id in pending
+                                  if camera_id in rows and not fire[rows[camera_id]]]:
+                    del pending[camera_id]
+                changing = snapshot.any_of(snapshot.all_of(firing, snapshot.negate(hold)),
+                                           snapshot.all_of(snapshot.negate(firing), fire))
+                for row in _rows(changing):
+                    alert = self._evaluate_threshold(compiled, snapshot.ids[row], column[row])
+                    if alert is not None:
+                        alerts.append(alert)
+
+        for rule in self._new_items_rules:
+            if rule.field != 'notifications':
+                continue
+            for camera_id, items in zip(snapshot.ids, snapshot.notifications):
+                alert = self._evaluate_new_items(rule, camera_id, items)
+                if alert is not None:
+                    alerts.append(alert)
+
+        for rule in self._offline_rules:
+            firing = self._firing_mask(rule.name, rows, len(snapshot))
+            online = snapshot.online(now, rule.after)
+            last_update_times = snapshot.column('last_update_time')
+            for row in _rows(snapshot.all_of(snapshot.negate(firing), snapshot.negate(online))):
+                last_update_time = _EPOCH + timedelta(microseconds=last_update_times[row])
+                alerts.append(self._fire(rule.name, snapshot.ids[row], last_update_time))
+            for row in _rows(snapshot.all_of(firing, online)):
+                last_update_time = _EPOCH + timedelta(microseconds=last_update_times[row])
+                alerts.append(self._resolve(rule.name, snapshot.ids[row], last_update_time))
+        return alerts
+
+    def _evaluate_threshold(self, compiled: _CompiledThreshold, camera_id: str, value: Any) -> Alert | None:
+        name = compiled.rule.name
+        if camera_id in self.firing[name]:
+            if compiled.hold(value):
+                return None
+            return self._resolve(name, camera_id, value)
+
+        pending = self._pending[name]
+        if not compiled.fire(value):
+            pending.pop(camera_id, None)
+            return None
+        count = pending.get(camera_id, 0) + 1
+        if count < compiled.rule.debounce:
+            pending[camera_id] = count
+            return None
+        pending.pop(camera_id, None)
+        return self._fire(name, camera_id, value)
+
+    def _evaluate_new_items(self, rule: NewItemsRule, camera_id: str, items: Iterable[str] | None) -> Alert | None:
+        items = items or ()
+        seen = self._seen_items[rule.name]
+        previous = seen.get(camera_id, frozenset())
+        seen[camera_id] = frozenset(items)
+        new_items = [item for item in items if item not in previous]
+        # a one shot event, nothing stays firing
+        return Alert(rule.name, camera_id, True, new_items) if new_items else None
+
+    def _schedule(self, camera: Camera, now: datetime) -> List[Alert]:
+        self._last_update_times[camera.id] = camera.last_update_time
+        alerts = []
+        for rule in self._offline_rules:
+            deadline = camera.last_update_time + rule.after
+            if deadline >= now and camera.id in self.firing[rule.name]:
+                alerts.append(self._resolve(rule.name, camera.id, camera.last_update_time))
+            heapq.heappush(self._deadlines, (deadline, rule.name, camera.id, camera.last_update_time))
+        if len(self._deadlines) > 2 * len(self._last_update_times) * len(self._offline_rules):
+            self._compact_deadlines()
+        return alerts
+
+    def _compact_deadlines(self):
+        # every report pushes a new deadline, rebuilding once stale ones are half the heap keeps one per camera
+        self._deadlines = [(last_update_time + rule.after, rule.name, camera_id, last_update_time)
+                           for camera_id, last_update_time in self._last_update_times.items()
+                           for rule in self._offline_rules if camera_id not in self.firing[rule.name]]
+        heapq.heapify(self._deadlines)
+
+    def _expire(self, now: datetime) -> List[Alert]:
+        alerts = []
+        while self._deadlines and self._deadlines[0][0] < now:
+            _, name, camera_id, last_update_time = heapq.heappop(self._deadlines)
+            if self._last_update_times.get(camera_id) == last_update_time and camera_id not in self.firing[name]:
+                alerts.append(self._fire(name, camera_id, last_update_time))
+        return alerts
+
+    def _remove(self, camera_id: str) -> List[Alert]:
+        self._last_update_times.pop(camera_id, None)
+        for pending in self._pending.values():
+            pending.pop(camera_id, None)
+        for seen in self._seen_items.values():
+            seen.pop(camera_id, None)
+        return [self._resolve(name, camera_id, firing[camera_id])
+                for name, firing in self.firing.items() if camera_id in firing]
+
+    def _fire(self, name: str, camera_id: str, value: Any) -> Alert:
+        self.firing[name][camera_id] = value
+        return Alert(name, camera_id, True, value)
+
+    def _resolve(self, name: str, camera_id: str, value: Any) -> Alert:
+        del self.firing[name][camera_id]
+        return Alert(name, camera_id, False, value)
+
+    def _firing_mask(self, name: str, rows: Dict[str, int], size: int) -> bytes:
+        mask = bytearray(size)
+        for camera_id in self.firing[name]:
+            row = rows.get(camera_id)
+            if row is not None:
+                mask[row] = 1
+        return bytes(mask)
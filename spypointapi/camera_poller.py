@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta
+from logging import Logger, getLogger
+from typing import AsyncIterator, Callable, Dict, List, Set
+
+from .cameras.camera import Camera
+from .cameras.camera_changes import CameraChange, CameraChangeTracker
+from .shared_fleet import SharedFleetPublisher
+from .spypoint_api import SpypointApi
+
+LOGGER: Logger = getLogger(__package__)
+
+
+def next_expected_report(camera: Camera, now: datetime, default_interval: timedelta) -> datetime:
+    # transmit_freq is the number of hours between scheduled transmissions, starting at transmit_time;
+    # instant (0) or automatic transmissions are not predictable
+    if camera.transmit_auto or not camera.transmit_freq or camera.transmit_time is None:
+        return now + default_interval
+
+    period = timedelta(hours=camera.transmit_freq)
+    last_update_time = camera.last_update_time
+    anchor = last_update_time.replace(hour=camera.transmit_time.hour, minute=camera.transmit_time.minute,
+                                      second=0, microsecond=0)
+    after = max(last_update_time, now)
+    periods = (after - anchor) // period + 1
+    return anchor + periods * period
+
+
+class CameraPoller:
+
+    def __init__(self, api: SpypointApi,
+                 callback: Callable[[CameraChange], None] | None = None,
+                 default_interval: timedelta = timedelta(hours=1),
+                 offline_interval: timedelta = timedelta(hours=6),
+                 error_interval: timedelta = timedelta(minutes=5),
+                 report_margin: timedelta = timedelta(minutes=5),
+                 full_refresh_interval: timedelta = timedelta(hours=24),
+                 publisher: SharedFleetPublisher | None = None):
+        self.api = api
+        self.callback = callback
+        self.default_interval = default_interval
+        self.offline_interval = offline_interval
+        self.error_interval = error_interval
+        self.report_margin = report_margin
+        self.full_refresh_interval = full_refresh_interval
+        self.publisher = publisher
+        self._publish_pending = False
+        self.cameras: Dict[str, Camera] = {}
+        self.next_polls: Dict[str, datetime] = {}
+        self.next_full_refresh: datetime | None = None
+        self._changes = CameraChangeTracker()
+        self._subscribers: List[asyncio.Queue] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.async_run())
+
+    async def async_stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def async_run(self):
+        while True:
+            next_poll = await self.async_poll(datetime.now().astimezone())
+            delay = (next_poll - datetime.now().astimezone()).total_seconds()
+            await asyncio.sleep(max(0.0, delay))
+
+    async def async_iter_changes(self) -> AsyncIterator[CameraChange]:
+        queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.remove(queue)
+
+    async def async_poll(self, now: datetime) -> datetime:
+        try:
+            if self.next_full_refresh is None or now >= self.next_full_refresh:
+                await self._async_full_refresh(now)
+            else:
+                await self._async_poll_due(now)
+        except Exception as error:
+            LOGGER.warning(f"Camera poll failed, retrying in {self.error_interval} [{error!r}]")
+            return now + self.error_interval
+        return min([*self.next_polls.values(), self.next_full_refresh])
+
+    async def _async_full_refresh(self, now: datetime):
+        cameras = await self.api.async_get_cameras()
+        self.cameras = {camera.id: camera for camera in cameras}
+        self.next_polls = {camera.id: self._next_poll(camera, now) for camera in self.cameras.values()}
+        self.next_full_refresh = now + self.full_refresh_interval
+        await self._async_publish()
+
+    async def _async_poll_due(self, now: datetime):
+        due = [camera_id for camera_id, next_poll in self.next_polls.items() if next_poll <= now]
+        # cameras that fail to refresh are retried later rather than on every loop
+        for camera_id in due:
+            self.next_polls[camera_id] = now + self.error_interval
+
+        failed_ids: Set[str] = set()
+        cameras = await self.api.async_get_cameras_by_ids(due, failed_ids=failed_ids)
+        for camera_id in due:
+            if camera_id in cameras:
+                self._update(cameras[camera_id], now)
+            elif camera_id not in failed_ids:
+                # removed, or no longer shared with this account
+                del self.cameras[camera_id]
+                del self.next_polls[camera_id]
+        await self._async_publish()
+
+    def _update(self, camera: Camera, now: datetime):
+        self.cameras[camera.id] = camera
+        self.next_polls[camera.id] = self._next_poll(camera, now)
+
+    def _next_poll(self, camera: Camera, now: datetime) -> datetime:
+        if not camera.is_online_at(now):
+            return now + self.offline_interval
+        return next_expected_report(camera, now, self.default_interval) + self.report_margin
+
+    async def _async_publish(self):
+        changes = self._changes.update(list(self.cameras.values()))
+        for change in changes:
+            if self.callback is not None:
+                self.callback(change)
+            for queue in self._subscribers:
+                queue.put_nowait(change)
+
+        # a failed publish stays pending and is retried on the next poll, changed or not
+        self._publish_pending = self._publish_pending or bool(changes)
+        if not self._publish_pending or self.publisher is None:
+            return
+        # other processes read the fleet from the shared file instead of polling the api themselves,
+        # encoding and writing the whole fleet runs in a thread
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.publisher.publish_cameras,
+                                                             list(self.cameras.values()))
+        except Exception as error:
+            # the poll itself succeeded
+            LOGGER.warning(f"Fleet snapshot publish failed [{error!r}]")
+            return
+        self._publish_pending = False
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import MISSING, dataclass, field, fields, make_dataclass
+from datetime import datetime, timedelta, timezone
 from typing import TypeAlias, List
 
 Percentage: TypeAlias = float
@@ -7,20 +7,72 @@ Celsius: TypeAlias = int
 Degrees: TypeAlias = float
 
 
-@dataclass()
+@dataclass(slots=True)
 class Coordinates:
     latitude: Degrees
     longitude: Degrees
 
 
-@dataclass()
+@dataclass(slots=True)
 class TransmitTime:
     hour: int
     minute: int
 
 
-@dataclass()
-class Camera:
+# hashable copies used by FrozenCamera, Coordinates and TransmitTime stay mutable for existing callers
+@dataclass(frozen=True, slots=True)
+class FrozenCoordinates:
+    latitude: Degrees
+    longitude: Degrees
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenTransmitTime:
+    hour: int
+    minute: int
+
+
+def field_specs(cls: type) -> List[tuple]:
+    # the fields of a dataclass in the form make_dataclass takes them
+    return [(dataclass_field.name, dataclass_field.type) if dataclass_field.default is MISSING
+            else (dataclass_field.name, dataclass_field.type, field(default=dataclass_field.default))
+            for dataclass_field in fields(cls)]
+
+
+class CameraBase:
+    __slots__ = ()
+
+    @property
+    def is_online(self) -> bool:
+        return self.is_online_at()
+
+    def is_online_at(self, now: datetime | None = None) -> bool:
+        # comparing aware datetimes does not need the local timezone, utc is much cheaper to get
+        if now is None:
+            now = datetime.now(timezone.utc)
+        diff = now - self.last_update_time
+        return diff <= timedelta(hours=24)
+
+    def __str__(self) -> str:
+        return (
+            f"Camera(id={self.id}, name={self.name}, model={self.model}, "
+            f"modem_firmware={self.modem_firmware}, camera_firmware={self.camera_firmware}, "
+            f"last_update_time={self.last_update_time}, signal={self.signal}, "
+            f"temperature={self.temperature}, battery={self.battery}, battery_type={self.battery_type}, "
+            f"memory={self.memory}, notifications={self.notifications}, "
+            f"online={self.is_online}), owner={self.owner}, coordinates={self.coordinates}, "
+            f"activation_date={self.activation_date}, creation_date={self.creation_date}, "
+            f"is_cellular={self.is_cellular}, capture_mode={self.capture_mode}, "
+            f"delay={self.delay}, multi_shot={self.multi_shot}, quality={self.quality}, "
+            f"operation_mode={self.operation_mode}, sensibility={self.sensibility}, "
+            f"transmit_auto={self.transmit_auto}, transmit_format={self.transmit_format}, "
+            f"transmit_freq={self.transmit_freq}, transmit_time={self.transmit_time}, "
+            f"trigger_speed={self.trigger_speed})"
+        )
+
+
+@dataclass(slots=True)
+class Camera(CameraBase):
     id: str
     name: str
     model: str
@@ -50,25 +102,24 @@ class Camera:
     transmit_time: TransmitTime | None = None
     trigger_speed: str | None = None
 
-    @property
-    def is_online(self) -> bool:
-        now = datetime.now().astimezone()
-        diff = now - self.last_update_time
-        return diff <= timedelta(hours=24)
+    def freeze(self) -> 'FrozenCamera':
+        values = {camera_field.name: getattr(self, camera_field.name) for camera_field in fields(self)}
+        if self.notifications is not None:
+            values['notifications'] = tuple(self.notifications)
+        if self.coordinates is not None:
+            values['coordinates'] = FrozenCoordinates(self.coordinates.latitude, self.coordinates.longitude)
+        if self.transmit_time is not None:
+            values['transmit_time'] = FrozenTransmitTime(self.transmit_time.hour, self.transmit_time.minute)
+        return FrozenCamera(**values)
 
-    def __str__(self) -> str:
-        return (
-            f"Camera(id={self.id}, name={self.name}, model={self.model}, "
-            f"modem_firmware={self.modem_firmware}, camera_firmware={self.camera_firmware}, "
-            f"last_update_time={self.last_update_time}, signal={self.signal}, "
-            f"temperature={self.temperature}, battery={self.battery}, battery_type={self.battery_type}, "
-            f"memory={self.memory}, notifications={self.notifications}, "
-            f"online={self.is_online}), owner={self.owner}, coordinates={self.coordinates}, "
-            f"activation_date={self.activation_date}, creation_date={self.creation_date}, "
-            f"is_cellular={self.is_cellular}, capture_mode={self.capture_mode}, "
-            f"delay={self.delay}, multi_shot={self.multi_shot}, quality={self.quality}, "
-            f"operation_mode={self.operation_mode}, sensibility={self.sensibility}, "
-            f"transmit_auto={self.transmit_auto}, transmit_format={self.transmit_format}, "
-            f"transmit_freq={self.transmit_freq}, transmit_time={self.transmit_time}, "
-            f"trigger_speed={self.trigger_speed})"
-        )
+
+# same fields as Camera, immutable and hashable by value; notifications are stored as a tuple,
+# coordinates and transmit time as their frozen copies
+FrozenCamera = make_dataclass(
+    'FrozenCamera',
+    field_specs(Camera),
+    bases=(CameraBase,),
+    frozen=True,
+    slots=True,
+)
+FrozenCamera.__module__ = __name__
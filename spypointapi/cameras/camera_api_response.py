@@ -1,28 +1,42 @@
-from datetime import datetime
+from datetime import datetime, tzinfo
 from typing import Dict, Any, List
 
 from .. import Camera
 from .camera import Coordinates, TransmitTime
+from ..json_backend import loads
+
+# read only default for missing objects, avoids allocating an empty dict per lookup
+_EMPTY: Dict[str, Any] = {}
+
+
+def local_timezone() -> tzinfo:
+    return datetime.now().astimezone().tzinfo
 
 
 class CameraApiResponse:
 
     @classmethod
-    def from_json(cls, data: List[Dict[str, Any]]) -> List[Camera]:
-        return [CameraApiResponse.camera_from_json(d) for d in data]
+    def from_bytes(cls, raw: bytes | str, timezone: tzinfo | None = None) -> List[Camera]:
+        return CameraApiResponse.from_json(loads(raw), timezone)
 
     @classmethod
-    def camera_from_json(cls, data: Dict[str, Any]) -> Camera:
-        config = data.get('config', {})
-        status = data.get('status', {})
+    def from_json(cls, data: List[Dict[str, Any]], timezone: tzinfo | None = None) -> List[Camera]:
+        timezone = timezone or local_timezone()
+        return [CameraApiResponse.camera_from_json(d, timezone) for d in data]
+
+    @classmethod
+    def camera_from_json(cls, data: Dict[str, Any], timezone: tzinfo | None = None) -> Camera:
+        timezone = timezone or local_timezone()
+        config = data.get('config', _EMPTY)
+        status = data.get('status', _EMPTY)
         return Camera(
             id=data['id'],
             name=config['name'],
             model=status['model'],
             modem_firmware=status.get('modemFirmware', ''),
             camera_firmware=status.get('version', ''),
-            last_update_time=datetime.fromisoformat(status['lastUpdate'][:-1]).replace(tzinfo=datetime.now().astimezone().tzinfo),
-            signal=status.get('signal', {}).get('processed', {}).get('percentage', None),
+            last_update_time=CameraApiResponse.timestamp_from_json(status['lastUpdate'], timezone),
+            signal=status.get('signal', _EMPTY).get('processed', _EMPTY).get('percentage', None),
             temperature=CameraApiResponse.temperature_from_json(status.get('temperature', None)),
             battery=CameraApiResponse.battery_from_json(status.get('batteries', None)),
             battery_type=status.get('batteryType', None),
@@ -30,15 +44,15 @@ class CameraApiResponse:
             notifications=CameraApiResponse.notifications_from_json(status.get('notifications', None)),
             owner=CameraApiResponse.owner_from_json(data),
             coordinates=CameraApiResponse.coordinates_from_json(status.get('coordinates', None)),
-            activation_date=CameraApiResponse.datetime_from_json(data.get('activationDate')),
-            creation_date=CameraApiResponse.datetime_from_json(data.get('creationDate')),
+            activation_date=CameraApiResponse.datetime_from_json(data.get('activationDate'), timezone),
+            creation_date=CameraApiResponse.datetime_from_json(data.get('creationDate'), timezone),
             is_cellular=data.get('isCellular', data.get('cellular', None)),
             capture_mode=config.get('captureMode', None),
             delay=config.get('delay', None),
             multi_shot=config.get('multiShot', None),
             quality=config.get('quality', None),
             operation_mode=config.get('operationMode', None),
-            sensibility=config.get('sensibility', {}).get('level', None),
+            sensibility=config.get('sensibility', _EMPTY).get('level', None),
             transmit_auto=config.get('transmitAuto', None),
             transmit_format=config.get('transmitFormat', None),
             transmit_freq=config.get('transmitFreq', None),
@@ -99,8 +113,13 @@ class CameraApiResponse:
         return Coordinates(latitude=lat_lon[1], longitude=lat_lon[0])
 
     @classmethod
-    def datetime_from_json(cls, date_str: str | None) -> datetime | None:
+    def datetime_from_json(cls, date_str: str | None, timezone: tzinfo | None = None) -> datetime | None:
         if not date_str:
             return None
-        current_timezone = datetime.now().astimezone().tzinfo
-        return datetime.fromisoformat(date_str.rstrip('Z')).replace(tzinfo=current_timezone)
+        return CameraApiResponse.timestamp_from_json(date_str, timezone or local_timezone())
+
+    @classmethod
+    def timestamp_from_json(cls, date_str: str, timezone: tzinfo) -> datetime:
+        if date_str[-1] == 'Z':
+            date_str = date_str[:-1]
+        return datetime.fromisoformat(date_str).replace(tzinfo=timezone)
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .camera import Camera
+from .camera_api_response import CameraApiResponse
+
+
+class CameraChangeType(Enum):
+    ADDED = 'added'
+    REMOVED = 'removed'
+    CHANGED = 'changed'
+
+
+@dataclass()
+class CameraChange:
+    type: CameraChangeType
+    camera: Camera
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+
+class CameraChangeTracker:
+
+    def __init__(self):
+        self.cameras: Dict[str, Camera] = {}
+
+    def update(self, cameras: List[Camera], unavailable_ids: Iterable[str] = ()) -> List[CameraChange]:
+        previous_cameras = self.cameras
+        self.cameras = {camera.id: camera for camera in cameras}
+        # cameras that could not be fetched keep their last known state instead of being reported removed
+        for camera_id in unavailable_ids:
+            if camera_id in previous_cameras and camera_id not in self.cameras:
+                self.cameras[camera_id] = previous_cameras[camera_id]
+
+        changes = []
+        for camera in self.cameras.values():
+            previous = previous_cameras.get(camera.id)
+            if previous is None:
+                changes.append(CameraChange(CameraChangeType.ADDED, camera))
+                continue
+            # renames and config changes keep the last update time, only an unchanged object is skipped
+            if previous is camera:
+                continue
+            diff = self.diff(previous, camera)
+            if diff:
+                changes.append(CameraChange(CameraChangeType.CHANGED, camera, diff))
+
+        for camera_id, previous in previous_cameras.items():
+            if camera_id not in self.cameras:
+                changes.append(CameraChange(CameraChangeType.REMOVED, previous))
+        return changes
+
+    def parse_json(self, data: List[Dict[str, Any]]) -> List[Camera]:
+        return self.reuse_unchanged(CameraApiResponse.from_json(data))
+
+    def reuse_unchanged(self, cameras: List[Camera]) -> List[Camera]:
+        # an equal camera is replaced by the tracked one, update skips it without diffing
+        reused = []
+        for camera in cameras:
+            previous = self.cameras.get(camera.id)
+            reused.append(previous if previous == camera else camera)
+        return reused
+
+    @staticmethod
+    def diff(previous: Camera, camera: Camera) -> Dict[str, Tuple[Any, Any]]:
+        changes = {}
+        for camera_field in fields(Camera):
+            old_value = getattr(previous, camera_field.name)
+            new_value = getattr(camera, camera_field.name)
+            if old_value != new_value:
+                changes[camera_field.name] = (old_value, new_value)
+        return changes
@@ -0,0 +1,69 @@
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Tuple
+
+from .camera import Camera, TransmitTime
+
+# Camera field name to the config key CameraApiResponse reads it from
+JSON_KEYS = {
+    'capture_mode': 'captureMode',
+    'delay': 'delay',
+    'multi_shot': 'multiShot',
+    'quality': 'quality',
+    'operation_mode': 'operationMode',
+    'sensibility': 'sensibility',
+    'transmit_auto': 'transmitAuto',
+    'transmit_format': 'transmitFormat',
+    'transmit_freq': 'transmitFreq',
+    'transmit_time': 'transmitTime',
+    'trigger_speed': 'triggerSpeed',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CameraConfig:
+    # None leaves the setting as it is
+    capture_mode: str | None = None
+    delay: int | None = None
+    multi_shot: int | None = None
+    quality: str | None = None
+    operation_mode: str | None = None
+    sensibility: str | None = None
+    transmit_auto: bool | None = None
+    transmit_format: str | None = None
+    transmit_freq: int | None = None
+    transmit_time: TransmitTime | None = None
+    trigger_speed: str | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return all(getattr(self, config_field.name) is None for config_field in fields(self))
+
+    def merged(self, override: 'CameraConfig') -> 'CameraConfig':
+        return replace(self, **{config_field.name: getattr(override, config_field.name)
+                                for config_field in fields(override)
+                                if getattr(override, config_field.name) is not None})
+
+    def changes(self, camera: Camera) -> Dict[str, Tuple[Any, Any]]:
+        changes = {}
+        for config_field in fields(self):
+            desired = getattr(self, config_field.name)
+            current = getattr(camera, config_field.name)
+            if desired is not None and desired != current:
+                changes[config_field.name] = (current, desired)
+        return changes
+
+    def diff(self, camera: Camera) -> 'CameraConfig':
+        return CameraConfig(**{name: desired for name, (_, desired) in self.changes(camera).items()})
+
+    def to_json(self) -> Dict[str, Any]:
+        data = {}
+        for config_field in fields(self):
+            value = getattr(self, config_field.name)
+            if value is None:
+                continue
+            if config_field.name == 'sensibility':
+                value = {'level': value}
+            elif config_field.name == 'transmit_time':
+                value = {'hour': value.hour, 'minute': value.minute}
+            data[JSON_KEYS[config_field.name]] = value
+        return data
@@ -0,0 +1,187 @@
+import heapq
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .camera import Camera, Coordinates, Degrees
+from .camera_changes import CameraChange, CameraChangeType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EARTH_RADIUS = 6_371_008.8
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS / 180
+# below this many candidates the numpy conversion costs more than it saves
+VECTORIZE_THRESHOLD = 256
+
+Cell = Tuple[int, int]
+
+
+def haversine(latitude1: Degrees, longitude1: Degrees, latitude2: Degrees, longitude2: Degrees) -> float:
+    latitude1, longitude1, latitude2, longitude2 = map(math.radians, (latitude1, longitude1, latitude2, longitude2))
+    a = (math.sin((latitude2 - latitude1) / 2) ** 2
+         + math.cos(latitude1) * math.cos(latitude2) * math.sin((longitude2 - longitude1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def haversine_many(latitude: Degrees, longitude: Degrees,
+                   latitudes: Sequence[Degrees], longitudes: Sequence[Degrees]) -> List[float]:
+    if numpy is None or len(latitudes) < VECTORIZE_THRESHOLD:
+        return [haversine(latitude, longitude, other_latitude, other_longitude)
+                for other_latitude, other_longitude in zip(latitudes, longitudes)]
+
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    latitudes = numpy.radians(numpy.asarray(latitudes, dtype=float))
+    longitudes = numpy.radians(numpy.asarray(longitudes, dtype=float))
+    a = (numpy.sin((latitudes - latitude) / 2) ** 2
+         + math.cos(latitude) * numpy.cos(latitudes) * numpy.sin((longitudes - longitude) / 2) ** 2)
+    return (2 * EARTH_RADIUS * numpy.arcsin(numpy.sqrt(a))).tolist()
+
+
+class CameraGeoIndex:
+
+    def __init__(self, cell_size: Degrees = 0.1):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Dict[str, Coordinates]] = {}
+        self._coordinates: Dict[str, Coordinates] = {}
+
+    @classmethod
+    def from_cameras(cls, cameras: Iterable[Camera], cell_size: Degrees = 0.1) -> 'CameraGeoIndex':
+        index = cls(cell_size)
+        for camera in cameras:
+            index.update(camera)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._coordinates)
+
+    def __contains__(self, camera_id: str) -> bool:
+        return camera_id in self._coordinates
+
+    def update(self, camera: Camera):
+        if camera.coordinates is None:
+            self.remove(camera.id)
+            return
+
+        previous = self._coordinates.get(camera.id)
+        if previous == camera.coordinates:
+            return
+        if previous is not None:
+            self._discard(camera.id, previous)
+        self._coordinates[camera.id] = camera.coordinates
+        self._cells.setdefault(self._cell(camera.coordinates.latitude, camera.coordinates.longitude),
+                               {})[camera.id] = camera.coordinates
+
+    def remove(self, camera_id: str):
+        coordinates = self._coordinates.pop(camera_id, None)
+        if coordinates is not None:
+            self._discard(camera_id, coordinates)
+
+    def apply_changes(self, changes: Iterable[CameraChange]):
+        for change in changes:
+            if change.type == CameraChangeType.REMOVED:
+                self.remove(change.camera.id)
+            elif change.type == CameraChangeType.ADDED or 'coordinates' in change.changes:
+                self.update(change.camera)
+
+    def within_bbox(self, south: Degrees, west: Degrees, north: Degrees, east: Degrees) -> List[str]:
+        return [camera_id for camera_id, coordinates in self._candidates(south, west, north, east)
+                if south <= coordinates.latitude <= north and west <= coordinates.longitude <= east]
+
+    def within_radius(self, latitude: Degrees, longitude: Degrees, meters: float) -> List[Tuple[str, float]]:
+        latitude_delta = meters / METERS_PER_DEGREE
+        longitude_delta = latitude_delta / max(math.cos(math.radians(min(abs(latitude) + latitude_delta, 89.9))),
+                                               1e-6)
+        candidates = self._candidates(latitude - latitude_delta, longitude - longitude_delta,
+                                      latitude + latitude_delta, longitude + longitude_delta)
+        distances = self._distances(latitude, longitude, candidates)
+        return sorted(((camera_id, distance) for (camera_id, _), distance in zip(candidates, distances)
+                       if distance <= meters), key=lambda result: result[1])
+
+    def within_polygon(self, polygon: Sequence[Coordinates]) -> List[str]:
+        latitudes = [vertex.latitude for vertex in polygon]
+        longitudes = [vertex.longitude for vertex in polygon]
+        return [camera_id for camera_id, coordinates
+                in self._candidates(min(latitudes), min(longitudes), max(latitudes), max(longitudes))
+                if self._contains(polygon, coordinates)]
+
+    def nearest(self, latitude: Degrees, longitude: Degrees, k: int = 1) -> List[Tuple[str, float]]:
+        if k <= 0 or not self._coordinates:
+            return []
+
+        center_row, center_column = self._cell(latitude, longitude)
+        max_ring = max(max(abs(row - center_row), abs(column - center_column)) for row, column in self._cells)
+        nearest: List[Tuple[float, str]] = []
+        for ring in range(max_ring + 1):
+            candidates = [(camera_id, coordinates) for cell in self._ring(center_row, center_column, ring)
+                          for camera_id, coordinates in self._cells.get(cell, {}).items()]
+            for (camera_id, _), distance in zip(candidates, self._distances(latitude, longitude, candidates)):
+                # kept as a max heap of the k closest
+                if len(nearest) < k:
+                    heapq.heappush(nearest, (-distance, camera_id))
+                elif distance < -nearest[0][0]:
+                    heapq.heapreplace(nearest, (-distance, camera_id))
+            # cameras outside the searched rings are at least this far, east-west being the shortest side
+            outside_latitude = min(abs(latitude) + (ring + 1) * self.cell_size, 89.9)
+            outside_meters = ring * self.cell_size * METERS_PER_DEGREE * math.cos(math.radians(outside_latitude))
+            if len(nearest) == k and -nearest[0][0] <= outside_meters:
+                break
+        return sorted(((camera_id, -distance) for distance, camera_id in nearest), key=lambda result: result[1])
+
+    def _cell(self, latitude: Degrees, longitude: Degrees) -> Cell:
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    def _discard(self, camera_id: str, coordinates: Coordinates):
+        cell = self._cell(coordinates.latitude, coordinates.longitude)
+        cameras = self._cells[cell]
+        del cameras[camera_id]
+        if not cameras:
+            del self._cells[cell]
+
+    def _candidates(self, south: Degrees, west: Degrees, north: Degrees,
+                    east: Degrees) -> List[Tuple[str, Coordinates]]:
+        # boxes crossing the antimeridian are not split, west must be lower than east
+        south_row, west_column = self._cell(south, west)
+        north_row, east_column = self._cell(north, east)
+        if (north_row - south_row + 1) * (east_column - west_column + 1) > len(self._cells):
+            # a box larger than the occupied grid is cheaper to answer from the occupied cells
+            cells = [cameras for (row, column), cameras in self._cells.items()
+                     if south_row <= row <= north_row and west_column <= column <= east_column]
+        else:
+            cells = [self._cells[(row, column)] for row in range(south_row, north_row + 1)
+                     for column in range(west_column, east_column + 1) if (row, column) in self._cells]
+        return [item for cameras in cells for item in cameras.items()]
+
+    @staticmethod
+    def _ring(center_row: int, center_column: int, ring: int) -> Iterable[Cell]:
+        if ring == 0:
+            return [(center_row, center_column)]
+        cells = []
+        for column in range(center_column - ring, center_column + ring + 1):
+            cells.append((center_row - ring, column))
+            cells.append((center_row + ring, column))
+        for row in range(center_row - ring + 1, center_row + ring):
+            cells.append((row, center_column - ring))
+            cells.append((row, center_column + ring))
+        return cells
+
+    @staticmethod
+    def _distances(latitude: Degrees, longitude: Degrees, candidates: List[Tuple[str, Coordinates]]) -> List[float]:
+        return haversine_many(latitude, longitude,
+                              [coordinates.latitude for _, coordinates in candidates],
+                              [coordinates.longitude for _, coordinates in candidates])
+
+    @staticmethod
+    def _contains(polygon: Sequence[Coordinates], point: Coordinates) -> bool:
+        # ray casting on latitude and longitude, fine for zones much smaller than a hemisphere
+        inside = False
+        previous = polygon[-1]
+        for vertex in polygon:
+            if (vertex.latitude > point.latitude) != (previous.latitude > point.latitude):
+                crossing = (previous.longitude - vertex.longitude) * (point.latitude - vertex.latitude) / (
+                        previous.latitude - vertex.latitude) + vertex.longitude
+                if point.longitude < crossing:
+                    inside = not inside
+            previous = vertex
+        return inside
@@ -0,0 +1,232 @@
+import operator
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .camera import Camera
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.compute
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def _typecode(values: array | memoryview) -> str:
+    # columns of a mapped snapshot are memoryviews over the shared file
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def _require(module: Any, name: str):
+    if module is None:
+        raise ImportError(f'{name} is required for this FleetSnapshot export')
+
+
+@dataclass(slots=True)
+class NumericColumn:
+    values: array
+    # one byte per row, 1 when the value is present, viewable as a numpy bool array without copying
+    validity: bytearray = field(default_factory=bytearray)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[index] if self.validity[index] else None
+
+    def append(self, value: Any):
+        self.values.append(0 if value is None else value)
+        self.validity.append(value is not None)
+
+
+@dataclass(slots=True)
+class DictionaryColumn:
+    codes: array = field(default_factory=lambda: array('i'))
+    validity: bytearray = field(default_factory=bytearray)
+    dictionary: List[str] = field(default_factory=list)
+    _codes_by_value: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str | None:
+        return self.dictionary[self.codes[index]] if self.validity[index] else None
+
+    def append(self, value: str | None):
+        if value is None:
+            self.codes.append(0)
+            self.validity.append(False)
+            return
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = len(self.dictionary)
+            self.dictionary.append(value)
+            self._codes_by_value[value] = code
+        self.codes.append(code)
+        self.validity.append(True)
+
+
+class FleetSnapshot:
+    numeric_columns = {
+        'last_update_time': 'q',
+        'signal': 'd',
+        'temperature': 'd',
+        'battery': 'd',
+        'memory': 'd',
+        'latitude': 'd',
+        'longitude': 'd',
+    }
+    dictionary_columns = ('model', 'modem_firmware', 'camera_firmware', 'battery_type')
+
+    def __init__(self, taken_at: datetime | None = None):
+        self.taken_at = taken_at or datetime.now(timezone.utc)
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.notifications: List[Tuple[str, ...] | None] = []
+        self.columns: Dict[str, NumericColumn | DictionaryColumn] = {
+            **{name: NumericColumn(array(typecode)) for name, typecode in self.numeric_columns.items()},
+            **{name: DictionaryColumn() for name in self.dictionary_columns},
+        }
+
+    @classmethod
+    def from_cameras(cls, cameras: Iterable[Camera], taken_at: datetime | None = None) -> 'FleetSnapshot':
+        snapshot = cls(taken_at)
+        for camera in cameras:
+            snapshot.append(camera)
+        return snapshot
+
+    def append(self, camera: Camera):
+        columns = self.columns
+        self.ids.append(camera.id)
+        self.names.append(camera.name)
+        self.notifications.append(None if camera.notifications is None else tuple(camera.notifications))
+        # last update times are stored as utc microseconds, the unit arrow timestamps use
+        columns['last_update_time'].append((camera.last_update_time - _EPOCH) // _MICROSECOND)
+        columns['signal'].append(camera.signal)
+        columns['temperature'].append(camera.temperature)
+        columns['battery'].append(camera.battery)
+        columns['memory'].append(camera.memory)
+        columns['latitude'].append(camera.coordinates.latitude if camera.coordinates else None)
+        columns['longitude'].append(camera.coordinates.longitude if camera.coordinates else None)
+        columns['model'].append(camera.model)
+        columns['modem_firmware'].append(camera.modem_firmware)
+        columns['camera_firmware'].append(camera.camera_firmware)
+        columns['battery_type'].append(camera.battery_type)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, name: str) -> NumericColumn | DictionaryColumn:
+        return self.columns[name]
+
+    def where(self, name: str, op: str, value: Any) -> bytes:
+        column = self.columns[name]
+        compare = OPERATORS[op]
+        if isinstance(column, DictionaryColumn):
+            return self._where_dictionary(column, compare, value)
+
+        values = column.values
+        if numpy is not None and len(values):
+            mask = compare(numpy.frombuffer(values, dtype=_typecode(values)), value)
+            return (mask & numpy.frombuffer(column.validity, dtype=bool)).tobytes()
+        return bytes(valid and compare(row, value) for row, valid in zip(values, column.validity))
+
+    @staticmethod
+    def _where_dictionary(column: DictionaryColumn, compare: Callable[[Any, Any], Any], value: Any) -> bytes:
+        # codes follow insertion order, not string order; each distinct string is compared once
+        # and rows look their result up by code
+        if not column.dictionary:
+            return bytes(len(column))
+        matches = bytes(bool(compare(entry, value)) for entry in column.dictionary)
+        if numpy is not None and len(column):
+            codes = numpy.frombuffer(column.codes, dtype=_typecode(column.codes))
+            mask = numpy.frombuffer(matches, dtype=bool)[codes]
+            return (mask & numpy.frombuffer(column.validity, dtype=bool)).tobytes()
+        return bytes(valid and matches[code] for code, valid in zip(column.codes, column.validity))
+
+    def is_null(self, name: str) -> bytes:
+        return self.negate(bytes(self.columns[name].validity))
+
+    def online(self, now: datetime | None = None, within: timedelta = timedelta(hours=24)) -> bytes:
+        # same rule as Camera.is_online_at, updated within the last 24 hours
+        now = now or datetime.now(timezone.utc)
+        return self.where('last_update_time', '>=', (now - within - _EPOCH) // _MICROSECOND)
+
+    @staticmethod
+    def all_of(*masks: bytes) -> bytes:
+        # masks are 0/1 bytes, big integers combine them a machine word at a time
+        result = int.from_bytes(masks[0], 'little')
+        for mask in masks[1:]:
+            result &= int.from_bytes(mask, 'little')
+        return result.to_bytes(len(masks[0]), 'little')
+
+    @staticmethod
+    def any_of(*masks: bytes) -> bytes:
+        result = int.from_bytes(masks[0], 'little')
+        for mask in masks[1:]:
+            result |= int.from_bytes(mask, 'little')
+        return result.to_bytes(len(masks[0]), 'little')
+
+    @staticmethod
+    def negate(mask: bytes) -> bytes:
+        ones = int.from_bytes(b'\x01' * len(mask), 'little')
+        return (int.from_bytes(mask, 'little') ^ ones).to_bytes(len(mask), 'little')
+
+    def select(self, mask: bytes) -> List[str]:
+        return [camera_id for camera_id, selected in zip(self.ids, mask) if selected]
+
+    def to_numpy(self, name: str) -> Any:
+        _require(numpy, 'numpy')
+        column = self.columns[name]
+        values = column.codes if isinstance(column, DictionaryColumn) else column.values
+        # the values are shared with the snapshot, only the mask is computed
+        return numpy.ma.MaskedArray(numpy.frombuffer(values, dtype=_typecode(values)),
+                                    mask=~numpy.frombuffer(column.validity, dtype=bool))
+
+    def to_arrow(self) -> Any:
+        _require(pyarrow, 'pyarrow')
+        types = {'d': pyarrow.float64(), 'q': pyarrow.int64()}
+        arrays = {'id': pyarrow.array(self.ids, pyarrow.string()),
+                  'name': pyarrow.array(self.names, pyarrow.string()),
+                  'notifications': pyarrow.array(list(self.notifications), pyarrow.list_(pyarrow.string()))}
+        for name, column in self.columns.items():
+            validity = self._arrow_validity(column.validity)
+            if isinstance(column, DictionaryColumn):
+                indices = pyarrow.Array.from_buffers(pyarrow.int32(), len(self),
+                                                     [validity, pyarrow.py_buffer(column.codes)])
+                arrays[name] = pyarrow.DictionaryArray.from_arrays(
+                    indices, pyarrow.array(column.dictionary, pyarrow.string()))
+            else:
+                data_type = (pyarrow.timestamp('us', tz='UTC') if name == 'last_update_time'
+                             else types[_typecode(column.values)])
+                arrays[name] = pyarrow.Array.from_buffers(data_type, len(self),
+                                                          [validity, pyarrow.py_buffer(column.values)])
+        return pyarrow.table(arrays)
+
+    def write_parquet(self, path: str):
+        _require(pyarrow, 'pyarrow')
+        pyarrow.parquet.write_table(self.to_arrow(), path)
+
+    def _arrow_validity(self, validity: bytearray) -> Any:
+        # arrow wants one bit per row, the byte mask is packed by arrow itself
+        as_bytes = pyarrow.Array.from_buffers(pyarrow.uint8(), len(validity), [None, pyarrow.py_buffer(validity)])
+        return pyarrow.compute.not_equal(as_bytes, 0).buffers()[1]
@@ -0,0 +1,86 @@
+import asyncio
+from dataclasses import dataclass, field
+from enum import Enum
+from logging import Logger, getLogger
+from typing import Any, Dict, List, Mapping, Tuple
+
+from aiohttp import ClientConnectionError
+
+from .cameras.camera import Camera
+from .cameras.camera_config import CameraConfig
+from .retry_policy import RetryPolicy
+from .spypoint_api import SpypointApi
+from .spypoint_api_errors import SpypointApiError
+
+LOGGER: Logger = getLogger(__package__)
+
+
+class ReconcileStatus(Enum):
+    UNCHANGED = 'unchanged'
+    UPDATED = 'updated'
+    FAILED = 'failed'
+    NOT_FOUND = 'not_found'
+
+
+@dataclass()
+class ReconcileResult:
+    camera_id: str
+    status: ReconcileStatus
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    attempts: int = 0
+    error: Exception | None = None
+
+
+class ConfigReconciler:
+
+    def __init__(self, api: SpypointApi, max_concurrency: int = 8, retry_policy: RetryPolicy | None = None):
+        self.api = api
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    async def async_reconcile(self, desired: Mapping[str, CameraConfig] | None = None,
+                              default: CameraConfig | None = None,
+                              cameras: List[Camera] | None = None) -> List[ReconcileResult]:
+        if cameras is None:
+            cameras = await self.api.async_get_cameras()
+        cameras_by_id = {camera.id: camera for camera in cameras}
+
+        # the default applies to every camera, per camera configs override it field by field
+        targets = {camera_id: default for camera_id in cameras_by_id} if default is not None else {}
+        for camera_id, config in (desired or {}).items():
+            targets[camera_id] = default.merged(config) if default is not None else config
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return list(await asyncio.gather(*[
+            self._async_reconcile_camera(camera_id, cameras_by_id.get(camera_id), config, semaphore)
+            for camera_id, config in targets.items()]))
+
+    async def _async_reconcile_camera(self, camera_id: str, camera: Camera | None, config: CameraConfig,
+                                      semaphore: asyncio.Semaphore) -> ReconcileResult:
+        if camera is None:
+            return ReconcileResult(camera_id, ReconcileStatus.NOT_FOUND)
+        changes = config.changes(camera)
+        if not changes:
+            return ReconcileResult(camera_id, ReconcileStatus.UNCHANGED)
+
+        # every changed field goes in a single request, unchanged ones are not sent
+        update = config.diff(camera)
+        result = ReconcileResult(camera_id, ReconcileStatus.UPDATED, changes)
+        while True:
+            try:
+                async with semaphore:
+                    result.attempts += 1
+                    await self.api.async_update_camera_config(camera_id, update)
+                return result
+            except (SpypointApiError, ClientConnectionError, asyncio.TimeoutError) as error:
+                attempt = result.attempts - 1
+                status = error.status if isinstance(error, SpypointApiError) else None
+                if not self.retry_policy.should_retry(attempt, status):
+                    LOGGER.warning(f"{camera_id} : config update failed [{error!r}]")
+                    result.status = ReconcileStatus.FAILED
+                    result.error = error
+                    return result
+                retry_after = error.headers.get('Retry-After') if isinstance(error, SpypointApiError) else None
+                delay = self.retry_policy.delay(attempt, retry_after)
+            # the slot is released while waiting, other cameras keep going
+            await asyncio.sleep(delay)
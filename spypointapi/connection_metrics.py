@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+from aiohttp import TraceConfig
+
+
+@dataclass()
+class ConnectionMetrics:
+    created: int = 0
+    reused: int = 0
+    queued: int = 0
+    # aiohttp signals no release, a connection counts as in use from its acquisition until its request ends
+    in_use: int = 0
+
+    @property
+    def acquired(self) -> int:
+        return self.created + self.reused
+
+    def trace_config(self) -> TraceConfig:
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        trace_config.on_request_end.append(self._on_request_finished)
+        trace_config.on_request_exception.append(self._on_request_finished)
+        return trace_config
+
+    async def _on_connection_create_end(self, session, context, params):
+        self.created += 1
+        self._acquire(context)
+
+    async def _on_connection_reuseconn(self, session, context, params):
+        self.reused += 1
+        self._acquire(context)
+
+    async def _on_connection_queued_start(self, session, context, params):
+        self.queued += 1
+
+    async def _on_request_finished(self, session, context, params):
+        # requests failing before they get a connection have nothing to give back
+        if getattr(context, 'connection_acquired', False):
+            context.connection_acquired = False
+            self.in_use -= 1
+
+    def _acquire(self, context):
+        # a redirect acquires another connection for the same request once the previous one is released
+        if not getattr(context, 'connection_acquired', False):
+            context.connection_acquired = True
+            self.in_use += 1
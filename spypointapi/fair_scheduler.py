@@ -0,0 +1,56 @@
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Hashable
+
+
+class FairScheduler:
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.in_use = 0
+        # keys waiting for a slot, in round-robin order
+        self._waiters: OrderedDict[Hashable, Deque[asyncio.Future]] = OrderedDict()
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable) -> AsyncIterator[None]:
+        await self._acquire(key)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, key: Hashable):
+        if self.in_use < self.max_concurrency and not self._waiters:
+            self.in_use += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was granted just before the cancellation, hand it to the next waiter
+                self._release()
+            else:
+                self._remove_waiter(key, future)
+            raise
+
+    def _release(self):
+        self.in_use -= 1
+        while self.in_use < self.max_concurrency and self._waiters:
+            key, waiters = self._waiters.popitem(last=False)
+            future = waiters.popleft()
+            if waiters:
+                self._waiters[key] = waiters
+            self.in_use += 1
+            future.set_result(None)
+
+    def _remove_waiter(self, key: Hashable, future: asyncio.Future):
+        waiters = self._waiters.get(key)
+        if waiters is None or future not in waiters:
+            return
+        waiters.remove(future)
+        if not waiters:
+            del self._waiters[key]
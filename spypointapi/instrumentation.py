@@ -0,0 +1,167 @@
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, Iterable, Protocol
+
+from aiohttp import TraceConfig
+
+try:
+    from opentelemetry import metrics as otel_metrics, trace as otel_trace
+except ImportError:
+    otel_metrics = None
+    otel_trace = None
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+LOGIN = 'login'
+TOKEN_LOADED = 'token_loaded'
+UNAUTHORIZED = 'unauthorized'
+CACHE_HIT = 'cache_hit'
+NOT_MODIFIED = 'not_modified'
+RETRY = 'retry'
+THROTTLE = 'throttle'
+
+SHARED_CAMERA_URL = '/shared-cameras/{camera_id}'
+
+
+@lru_cache(maxsize=None)
+def _template_pattern(template: str) -> re.Pattern:
+    # a {placeholder} matches one path segment, all is an endpoint of its own and not an id
+    return re.compile('^' + re.sub(r'\\\{\w+\\\}', '(?!all$)[^/]+', re.escape(template)) + '$')
+
+
+def endpoint(url: str, templates: Iterable[str] = (SHARED_CAMERA_URL,)) -> str:
+    # one label per endpoint, not per camera
+    for template in templates:
+        if _template_pattern(template).match(url):
+            return template
+    return url
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    method: str
+    endpoint: str
+    started_at: float = field(default_factory=time.time)
+    started: float = field(default_factory=perf_counter)
+    status: int | None = None
+    error: str | None = None
+    dns: float | None = None
+    connect: float | None = None
+    ttfb: float | None = None
+
+
+class Observer(Protocol):
+
+    def on_request(self, timings: RequestTimings) -> None:
+        ...
+
+    def on_decode(self, endpoint: str, body_size: int, decode: float, parse: float) -> None:
+        ...
+
+    def on_event(self, event: str, endpoint: str | None = None) -> None:
+        ...
+
+
+def trace_config() -> TraceConfig:
+    # fills dns and connect times of requests sent with a RequestTimings as trace_request_ctx
+    trace_config = TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    return trace_config
+
+
+async def _on_dns_resolvehost_start(session, context, params):
+    context.dns_started = perf_counter()
+
+
+async def _on_dns_resolvehost_end(session, context, params):
+    if isinstance(context.trace_request_ctx, RequestTimings):
+        context.trace_request_ctx.dns = perf_counter() - context.dns_started
+
+
+async def _on_connection_create_start(session, context, params):
+    context.connection_started = perf_counter()
+
+
+async def _on_connection_create_end(session, context, params):
+    if isinstance(context.trace_request_ctx, RequestTimings):
+        context.trace_request_ctx.connect = perf_counter() - context.connection_started
+
+
+class OpenTelemetryObserver:
+
+    def __init__(self, tracer: Any = None, meter: Any = None):
+        if otel_trace is None:
+            raise ImportError('opentelemetry-api is required for OpenTelemetryObserver')
+        self.tracer = tracer or otel_trace.get_tracer(__package__)
+        self.events = (meter or otel_metrics.get_meter(__package__)).create_counter('spypoint.events')
+
+    def on_request(self, timings: RequestTimings) -> None:
+        attributes = {'http.request.method': timings.method, 'url.path': timings.endpoint}
+        if timings.status is not None:
+            attributes['http.response.status_code'] = timings.status
+        if timings.error is not None:
+            attributes['error.type'] = timings.error
+        for phase in ('dns', 'connect', 'ttfb'):
+            value = getattr(timings, phase)
+            if value is not None:
+                attributes[f'spypoint.{phase}'] = value
+
+        # timings are reported once the response headers are in, the span is recorded after the fact
+        start_time = int(timings.started_at * 1e9)
+        span = self.tracer.start_span(f'{timings.method} {timings.endpoint}', start_time=start_time,
+                                      attributes=attributes)
+        span.end(end_time=start_time + int((timings.ttfb or 0) * 1e9))
+
+    def on_decode(self, endpoint: str, body_size: int, decode: float, parse: float) -> None:
+        end_time = time.time_ns()
+        span = self.tracer.start_span(f'decode {endpoint}', start_time=end_time - int((decode + parse) * 1e9),
+                                      attributes={'url.path': endpoint, 'spypoint.body_size': body_size,
+                                                  'spypoint.decode': decode, 'spypoint.parse': parse})
+        span.end(end_time=end_time)
+
+    def on_event(self, event: str, endpoint: str | None = None) -> None:
+        self.events.add(1, {'event': event, 'url.path': endpoint or ''})
+
+
+class PrometheusObserver:
+
+    def __init__(self, registry: Any = None, namespace: str = 'spypoint'):
+        if prometheus_client is None:
+            raise ImportError('prometheus-client is required for PrometheusObserver')
+        options: Dict[str, Any] = {'namespace': namespace}
+        if registry is not None:
+            options['registry'] = registry
+        self.requests = prometheus_client.Counter(
+            'requests', 'Requests sent to the Spypoint api', ['endpoint', 'status'], **options)
+        self.durations = prometheus_client.Histogram(
+            'request_phase_seconds', 'Time spent per request phase', ['endpoint', 'phase'], **options)
+        self.body_sizes = prometheus_client.Histogram(
+            'response_body_bytes', 'Size of decoded response bodies', ['endpoint'],
+            buckets=(1024, 16 * 1024, 128 * 1024, 1024 * 1024, 8 * 1024 * 1024, float('inf')), **options)
+        self.events = prometheus_client.Counter(
+            'events', 'Logins, unauthorized responses, cache hits and retries', ['event', 'endpoint'], **options)
+
+    def on_request(self, timings: RequestTimings) -> None:
+        status = timings.error if timings.status is None else str(timings.status)
+        self.requests.labels(timings.endpoint, status).inc()
+        for phase in ('dns', 'connect', 'ttfb'):
+            value = getattr(timings, phase)
+            if value is not None:
+                self.durations.labels(timings.endpoint, phase).observe(value)
+
+    def on_decode(self, endpoint: str, body_size: int, decode: float, parse: float) -> None:
+        self.body_sizes.labels(endpoint).observe(body_size)
+        self.durations.labels(endpoint, 'decode').observe(decode)
+        self.durations.labels(endpoint, 'parse').observe(parse)
+
+    def on_event(self, event: str, endpoint: str | None = None) -> None:
+        self.events.labels(event, endpoint or '').inc()
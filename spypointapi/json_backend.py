@@ -0,0 +1,20 @@
+from typing import Any, Callable
+
+loads: Callable[[bytes | str], Any]
+
+try:
+    import orjson
+
+    loads = orjson.loads
+    backend = 'orjson'
+except ImportError:
+    try:
+        import msgspec
+
+        loads = msgspec.json.decode
+        backend = 'msgspec'
+    except ImportError:
+        import json
+
+        loads = json.loads
+        backend = 'json'
@@ -0,0 +1,66 @@
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterator
+
+_WHITESPACE = ' \t\n\r'
+
+
+class JsonArrayDecoder:
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> Iterator[Any]:
+        # only keep the element being decoded, everything before it has been yielded already
+        buffer = self._buffer + self._utf8.decode(chunk, final=final)
+        position = 0
+        try:
+            while not self._finished:
+                while position < len(buffer) and (buffer[position] in _WHITESPACE
+                                                  or (self._started and buffer[position] == ',')):
+                    position += 1
+                if position == len(buffer):
+                    break
+                if not self._started:
+                    if buffer[position] != '[':
+                        raise ValueError(f'Expected a JSON array, got [{buffer[position]}]')
+                    self._started = True
+                    position += 1
+                    continue
+                if buffer[position] == ']':
+                    self._finished = True
+                    break
+                try:
+                    element, end = self._decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                # a number at the end of the buffer may continue in the next chunk
+                if end == len(buffer) and not final:
+                    break
+                position = end
+                yield element
+        finally:
+            self._buffer = buffer[position:]
+
+        if final and not self._finished:
+            raise ValueError('Unexpected end of JSON array')
+
+
+def iter_json_array(raw: bytes) -> Iterator[Any]:
+    # one small decode per element instead of a single call holding the GIL for the whole body
+    yield from JsonArrayDecoder().feed(raw, final=True)
+
+
+async def async_iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    decoder = JsonArrayDecoder()
+    async for chunk in chunks:
+        for element in decoder.feed(chunk):
+            yield element
+    for element in decoder.feed(b'', final=True):
+        yield element
@@ -0,0 +1,15 @@
+import base64
+import json
+from typing import Any, Dict
+
+
+def decode_unverified_claims(token: str) -> Dict[str, Any]:
+    # the token is only read for its expiry, the api verifies it, not us
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except (IndexError, ValueError) as error:
+        raise ValueError(f'Invalid JWT [{error}]') from error
+    if not isinstance(claims, dict):
+        raise ValueError('Invalid JWT [claims are not a JSON object]')
+    return claims
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List
+
+
+@dataclass(slots=True)
+class Photo:
+    id: str
+    camera_id: str
+    date: datetime
+    name: str | None = None
+    url: str | None = None
+    hd_url: str | None = None
+    tags: List[str] | None = None
@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from .photo import Photo
+
+
+class PhotoApiResponse:
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> List[Photo]:
+        return [PhotoApiResponse.photo_from_json(d) for d in data.get('photos', [])]
+
+    @classmethod
+    def photo_from_json(cls, data: Dict[str, Any]) -> Photo:
+        return Photo(
+            id=data['id'],
+            camera_id=data.get('camera', ''),
+            date=PhotoApiResponse.date_from_json(data['date']),
+            name=data.get('originName', None),
+            url=PhotoApiResponse.url_from_json(data.get('large', None)),
+            hd_url=PhotoApiResponse.url_from_json(data.get('hd', None)),
+            tags=data.get('tag', None),
+        )
+
+    @classmethod
+    def url_from_json(cls, image: Dict[str, Any] | None) -> str | None:
+        if not image or None in (image.get('host'), image.get('path')):
+            return None
+        return f"https://{image['host']}/{image['path'].lstrip('/')}"
+
+    @classmethod
+    def date_from_json(cls, date_str: str) -> datetime:
+        return datetime.fromisoformat(date_str.rstrip('Z')).replace(tzinfo=timezone.utc)
+
+    @classmethod
+    def date_to_json(cls, date: datetime) -> str:
+        return date.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import inspect
+import os
+from http import HTTPStatus
+from typing import Awaitable, BinaryIO, Callable, Tuple
+
+from aiohttp import ClientResponse, ClientSession
+
+from ..spypoint_api_errors import SpypointApiError
+
+CHUNK_SIZE = 64 * 1024
+# chunks are gathered into larger blocks, each write is a hop to a worker thread
+WRITE_SIZE = 1024 * 1024
+
+Writer = Callable[[bytes], Awaitable[None] | None]
+
+
+def file_md5(path: str) -> str:
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def async_download_to_file(session: ClientSession, url: str, path: str) -> bool:
+    headers = {}
+    if os.path.exists(path):
+        # photo storage answers 304 when the etag, the md5 of the content, matches the local file
+        headers['If-None-Match'] = f'"{await asyncio.to_thread(file_md5, path)}"'
+
+    partial_path = f'{path}.part'
+    validator_path = f'{partial_path}.validator'
+    offset, validator = await asyncio.to_thread(_read_partial, partial_path, validator_path)
+    if offset and validator:
+        # the photo may have changed since the partial file was written, If-Range gets all of it back then
+        headers['Range'] = f'bytes={offset}-'
+        headers['If-Range'] = validator
+
+    async with session.get(url, headers=headers) as response:
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            return False
+        if response.status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+            # the offset is at or past the size of the photo, start over
+            await asyncio.to_thread(_remove_partial, partial_path, validator_path)
+            return await async_download_to_file(session, url, path)
+        _raise_on_download_error(response)
+
+        resumed = response.status == HTTPStatus.PARTIAL_CONTENT
+        # disk writes can stall, they run in a thread so the event loop keeps serving other requests
+        file = await asyncio.to_thread(_open_partial, partial_path, validator_path, resumed,
+                                       _validator(response))
+        try:
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                buffer += chunk
+                if len(buffer) >= WRITE_SIZE:
+                    data, buffer = buffer, bytearray()
+                    await asyncio.to_thread(file.write, data)
+            await asyncio.to_thread(file.write, buffer)
+        finally:
+            await asyncio.to_thread(file.close)
+    await asyncio.to_thread(os.replace, partial_path, path)
+    await asyncio.to_thread(_remove_partial, partial_path, validator_path)
+    return True
+
+
+def _validator(response: ClientResponse) -> str | None:
+    # If-Range only takes a strong etag or a date
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def _read_partial(partial_path: str, validator_path: str) -> Tuple[int, str | None]:
+    if not os.path.exists(partial_path):
+        return 0, None
+    try:
+        with open(validator_path) as file:
+            validator = file.read() or None
+    except FileNotFoundError:
+        validator = None
+    return os.path.getsize(partial_path), validator
+
+
+def _open_partial(partial_path: str, validator_path: str, resumed: bool, validator: str | None) -> BinaryIO:
+    if resumed:
+        return open(partial_path, 'ab')
+    # a full response starts the partial file over, it can be resumed only if the photo has a validator
+    if validator:
+        with open(validator_path, 'w') as file:
+            file.write(validator)
+    elif os.path.exists(validator_path):
+        os.remove(validator_path)
+    return open(partial_path, 'wb')
+
+
+def _remove_partial(partial_path: str, validator_path: str):
+    for partial in (partial_path, validator_path):
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+async def async_download_to_writer(session: ClientSession, url: str, write: Writer):
+    async with session.get(url) as response:
+        _raise_on_download_error(response)
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            result = write(chunk)
+            if inspect.isawaitable(result):
+                await result
+
+
+def _raise_on_download_error(response: ClientResponse):
+    if not response.ok:
+        raise SpypointApiError(response)
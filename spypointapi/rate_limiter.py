@@ -0,0 +1,62 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class AdaptiveRateLimiter:
+
+    def __init__(self, rate: float = 10.0, burst: int = 10,
+                 concurrency: int = 10, min_concurrency: int = 1, max_concurrency: int = 50,
+                 increase: float = 1.0, decrease: float = 0.5):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency_limit = float(concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.in_flight = 0
+        self._decreased_at = float('-inf')
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._bucket_lock = asyncio.Lock()
+        self._slot_available = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        async with self._slot_available:
+            await self._slot_available.wait_for(lambda: self.in_flight < int(self.concurrency_limit))
+            self.in_flight += 1
+        try:
+            await self._async_take_token()
+            # the time the request is sent, passed back to on_throttle
+            yield time.monotonic()
+        finally:
+            async with self._slot_available:
+                self.in_flight -= 1
+                self._slot_available.notify_all()
+
+    async def _async_take_token(self):
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        # additive increase, about one more concurrent request per window of successful requests
+        self.concurrency_limit = min(self.max_concurrency,
+                                     self.concurrency_limit + self.increase / self.concurrency_limit)
+
+    def on_throttle(self, sent_at: float | None = None):
+        # requests sent before the last decrease were throttled at the previous limit, a burst of them
+        # decreases the limit once
+        if sent_at is not None and sent_at < self._decreased_at:
+            return
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease)
+        self._decreased_at = time.monotonic()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+
+@dataclass()
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+
+@dataclass()
+class CacheEntry:
+    value: Any
+    etag: str | None = None
+    last_modified: str | None = None
+    expires_at: float = 0.0
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+
+    def __init__(self, ttls: Dict[str, float] | None = None, default_ttl: float = 60.0, max_entries: int = 256):
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def ttl_for(self, url: str) -> float:
+        prefixes = [prefix for prefix in self.ttls if url.startswith(prefix)]
+        if not prefixes:
+            return self.default_ttl
+        return self.ttls[max(prefixes, key=len)]
+
+    def get_fresh(self, url: str) -> CacheEntry | None:
+        entry = self._entries.get(url)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        return entry
+
+    async def async_get(self, url: str, fetch: Callable[[CacheEntry | None], Awaitable[CacheEntry]]) -> Any:
+        entry = self.get_fresh(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+            self.stats.hits += 1
+            return entry.value
+
+        task = self._in_flight.get(url)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.create_task(self._async_fetch(url, fetch))
+            self._in_flight[url] = task
+        # shielded so one cancelled caller does not cancel the request the others are waiting on
+        return (await asyncio.shield(task)).value
+
+    async def _async_fetch(self, url: str, fetch: Callable[[CacheEntry | None], Awaitable[CacheEntry]]) -> CacheEntry:
+        try:
+            stale = self._entries.get(url)
+            entry = await fetch(stale)
+            if entry is stale:
+                self.stats.revalidations += 1
+            entry.expires_at = time.monotonic() + self.ttl_for(url)
+            self._store(url, entry)
+            return entry
+        finally:
+            del self._in_flight[url]
+
+    def _store(self, url: str, entry: CacheEntry):
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, url: str | None = None):
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
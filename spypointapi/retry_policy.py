@@ -0,0 +1,53 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import FrozenSet
+
+THROTTLING_STATUSES = frozenset({HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE})
+
+
+@dataclass()
+class RequestStats:
+    requests: int = 0
+    retries: int = 0
+    throttles: int = 0
+
+
+@dataclass()
+class RetryPolicy:
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }))
+
+    def should_retry(self, attempt: int, status: int | None = None) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        server_delay = self.retry_after_from_header(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.backoff_max)
+        # exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @classmethod
+    def retry_after_from_header(cls, retry_after: str | None) -> float | None:
+        if not retry_after:
+            return None
+        if retry_after.isdigit():
+            return float(retry_after)
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,246 @@
+import asyncio
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections.abc import Sequence
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from logging import Logger, getLogger
+from typing import AsyncIterator, Iterable, List, Tuple
+
+from .cameras.camera import Camera
+from .cameras.fleet_snapshot import DictionaryColumn, FleetSnapshot, NumericColumn
+
+LOGGER: Logger = getLogger(__package__)
+
+MAGIC = b'SPFLEET\x02'
+# magic, version, taken at in utc microseconds, number of rows, number of sections
+_HEADER = struct.Struct('<8sQqII')
+# offset and length of a section, sections start on 8 byte boundaries so casts stay aligned
+_SECTION = struct.Struct('<QQ')
+# ids and names as offsets and utf-8 data, notifications as row offsets, validity, offsets and utf-8 data,
+# values and validity per numeric column, codes, validity, dictionary offsets and dictionary data per dictionary column
+_SECTION_COUNT = 8 + 2 * len(FleetSnapshot.numeric_columns) + 4 * len(FleetSnapshot.dictionary_columns)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class MappedStrings(Sequence):
+    # strings decoded on access from an offsets array and utf-8 data, nothing is copied up front
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('string index out of range')
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+
+class MappedStringLists(Sequence):
+    # row offsets index into the flattened strings, a row without validity has no list at all
+
+    def __init__(self, offsets: memoryview, validity: memoryview, items: MappedStrings):
+        self._offsets = offsets
+        self._validity = validity
+        self._items = items
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Tuple[str, ...] | None:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('string list index out of range')
+        if not self._validity[index]:
+            return None
+        return tuple(self._items[item] for item in range(self._offsets[index], self._offsets[index + 1]))
+
+
+def _encode_strings(values: Iterable[str]) -> Tuple[bytes, bytes]:
+    offsets = array('I', [0])
+    data = bytearray()
+    for value in values:
+        data += value.encode()
+        offsets.append(len(data))
+    return offsets.tobytes(), bytes(data)
+
+
+def _encode_string_lists(values: Iterable[Sequence[str] | None]) -> Tuple[bytes, bytes, bytes, bytes]:
+    offsets = array('I', [0])
+    validity = bytearray()
+    items: List[str] = []
+    for value in values:
+        items += value or ()
+        offsets.append(len(items))
+        validity.append(value is not None)
+    return offsets.tobytes(), bytes(validity), *_encode_strings(items)
+
+
+def encode_snapshot(snapshot: FleetSnapshot, version: int) -> bytes:
+    sections: List[bytes | bytearray | memoryview] = [*_encode_strings(snapshot.ids),
+                                                      *_encode_strings(snapshot.names),
+                                                      *_encode_string_lists(snapshot.notifications)]
+    for name in FleetSnapshot.numeric_columns:
+        column = snapshot.column(name)
+        sections += [memoryview(column.values).cast('B'), column.validity]
+    for name in FleetSnapshot.dictionary_columns:
+        column = snapshot.column(name)
+        sections += [memoryview(column.codes).cast('B'), column.validity, *_encode_strings(column.dictionary)]
+
+    taken_at = (snapshot.taken_at - _EPOCH) // timedelta(microseconds=1)
+    data = bytearray(_HEADER.pack(MAGIC, version, taken_at, len(snapshot), len(sections)))
+    offset = len(data) + _SECTION.size * len(sections)
+    table = bytearray()
+    payload = bytearray()
+    for section in sections:
+        padding = -offset % 8
+        payload += bytes(padding)
+        offset += padding
+        table += _SECTION.pack(offset, len(section))
+        payload += section
+        offset += len(section)
+    return bytes(data + table + payload)
+
+
+def _read_layout(data: mmap.mmap | bytes) -> Tuple[int, int, int, List[Tuple[int, int]]]:
+    # everything is checked before any view is taken, a rejected mapping can be closed right away
+    if len(data) < _HEADER.size:
+        raise ValueError('Not a shared fleet snapshot, the header is truncated')
+    magic, version, taken_at, rows, count = _HEADER.unpack_from(data)
+    if magic != MAGIC or count != _SECTION_COUNT:
+        raise ValueError('Not a shared fleet snapshot')
+    if len(data) < _HEADER.size + count * _SECTION.size:
+        raise ValueError('Corrupted shared fleet snapshot, the section table is truncated')
+    sections = [_SECTION.unpack_from(data, _HEADER.size + index * _SECTION.size) for index in range(count)]
+
+    # fixed sizes, or the item size for the variable ones
+    sizes: List[int | Tuple[int]] = [(rows + 1) * 4, (1,), (rows + 1) * 4, (1,), (rows + 1) * 4, rows, (4,), (1,)]
+    for typecode in FleetSnapshot.numeric_columns.values():
+        sizes += [rows * array(typecode).itemsize, rows]
+    for _ in FleetSnapshot.dictionary_columns:
+        sizes += [rows * 4, rows, (4,), (1,)]
+    for (offset, length), size in zip(sections, sizes):
+        valid = length % size[0] == 0 if isinstance(size, tuple) else length == size
+        if not valid or offset + length > len(data):
+            raise ValueError('Corrupted shared fleet snapshot')
+    return version, taken_at, rows, sections
+
+
+def map_snapshot(data: mmap.mmap | bytes) -> Tuple[int, FleetSnapshot]:
+    version, taken_at, rows, layout = _read_layout(data)
+    view = memoryview(data)
+    sections = iter([view[offset:offset + length] for offset, length in layout])
+    snapshot = FleetSnapshot(_EPOCH + timedelta(microseconds=taken_at))
+    # the columns are views over the mapping, a mapped snapshot is read only
+    snapshot.ids = MappedStrings(next(sections).cast('I'), next(sections))
+    snapshot.names = MappedStrings(next(sections).cast('I'), next(sections))
+    snapshot.notifications = MappedStringLists(next(sections).cast('I'), next(sections),
+                                               MappedStrings(next(sections).cast('I'), next(sections)))
+    for name, typecode in FleetSnapshot.numeric_columns.items():
+        snapshot.columns[name] = NumericColumn(next(sections).cast(typecode), next(sections))
+    for name in FleetSnapshot.dictionary_columns:
+        codes, validity = next(sections).cast('i'), next(sections)
+        dictionary = list(MappedStrings(next(sections).cast('I'), next(sections)))
+        snapshot.columns[name] = DictionaryColumn(codes, validity, dictionary,
+                                                  {value: code for code, value in enumerate(dictionary)})
+    return version, snapshot
+
+
+class SharedFleetPublisher:
+
+    def __init__(self, path: str, mode: int = 0o644):
+        self.path = path
+        # mkstemp creates the file readable by its owner only, readers may run as other users
+        self.mode = mode
+        self.version = 0
+        # a restarted publisher keeps counting from the published version, readers never see it go back
+        try:
+            with open(path, 'rb') as file:
+                magic, version, *_ = _HEADER.unpack(file.read(_HEADER.size))
+            if magic == MAGIC:
+                self.version = version
+        except (OSError, struct.error):
+            pass
+
+    def publish(self, snapshot: FleetSnapshot) -> int:
+        version = self.version + 1
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.fleet-')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(encode_snapshot(snapshot, version))
+                os.fchmod(file.fileno(), self.mode)
+            # readers map either the previous file or this one, never a partial write
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        self.version = version
+        return version
+
+    def publish_cameras(self, cameras: Iterable[Camera], taken_at: datetime | None = None) -> int:
+        return self.publish(FleetSnapshot.from_cameras(cameras, taken_at))
+
+
+class SharedFleetReader:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self.snapshot: FleetSnapshot | None = None
+        self._file_id: Tuple[int, int, int] | None = None
+
+    def refresh(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        # the publisher replaces the file, a new inode means a new version without reading anything
+        if (stat.st_dev, stat.st_ino, stat.st_mtime_ns) == self._file_id:
+            return False
+
+        with open(self.path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            if stat.st_size < _HEADER.size:
+                raise ValueError(f'{self.path} is not a shared fleet snapshot, the header is truncated')
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            version = _read_layout(data)[0]
+            if version == self.version:
+                data.close()
+                snapshot = None
+            else:
+                version, snapshot = map_snapshot(data)
+        except ValueError:
+            # views taken before a late failure keep the mapping open until they are collected
+            with suppress(BufferError):
+                data.close()
+            raise
+        # only a file that was read is skipped next time, a rejected one is read again
+        self._file_id = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        if snapshot is None:
+            return False
+        # snapshots already handed out keep the previous mapping alive until they are dropped
+        self.version, self.snapshot = version, snapshot
+        return True
+
+    async def async_iter_snapshots(self, interval: float = 1.0) -> AsyncIterator[FleetSnapshot]:
+        while True:
+            try:
+                changed = self.refresh()
+            except ValueError as error:
+                LOGGER.warning(f"{self.path} : skipped [{error!r}]")
+                changed = False
+            if changed:
+                yield self.snapshot
+            await asyncio.sleep(interval)
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import timedelta
+from functools import partial
+from logging import Logger, getLogger
+from typing import Any, Callable, Dict, List, Tuple
+
+from aiohttp import ClientSession, TCPConnector
+
+from .cameras.camera import Camera
+from .connection_metrics import ConnectionMetrics
+from .fair_scheduler import FairScheduler
+from .instrumentation import trace_config
+from .response_cache import ResponseCache
+from .spypoint_api import SpypointApi
+
+LOGGER: Logger = getLogger(__package__)
+
+
+class SpypointAccountPool:
+
+    def __init__(self, credentials: List[Tuple[str, str]],
+                 max_concurrency: int = 20,
+                 limit_per_host: int = 10,
+                 keepalive_timeout: float = 60.0,
+                 token_refresh_skew: timedelta = timedelta(minutes=5),
+                 token_refresh_window: timedelta = timedelta(minutes=30),
+                 cache_factory: Callable[[], ResponseCache] | None = None,
+                 **api_options: Any):
+        if 'cache' in api_options:
+            # cached responses are keyed by url only, a shared cache would serve one account's cameras to another
+            raise ValueError('A cache cannot be shared between accounts, pass cache_factory instead')
+        self.credentials = credentials
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.token_refresh_skew = token_refresh_skew
+        self.token_refresh_window = token_refresh_window
+        self.cache_factory = cache_factory
+        self.api_options = api_options
+        self.scheduler = FairScheduler(max_concurrency)
+        self.connection_metrics = ConnectionMetrics()
+        self.session: ClientSession | None = None
+        self.apis: Dict[str, SpypointApi] = {}
+
+    async def __aenter__(self) -> 'SpypointAccountPool':
+        connector = TCPConnector(limit=self.scheduler.max_concurrency,
+                                 limit_per_host=self.limit_per_host,
+                                 keepalive_timeout=self.keepalive_timeout)
+        trace_configs = [self.connection_metrics.trace_config()]
+        if self.api_options.get('observer') is not None:
+            trace_configs.append(trace_config())
+        self.session = ClientSession(connector=connector, trace_configs=trace_configs)
+        for index, (username, password) in enumerate(self.credentials):
+            self.apis[username] = SpypointApi(username, password, self.session,
+                                              token_refresh_skew=self._token_refresh_skew(index),
+                                              request_limiter=partial(self.scheduler.slot, username),
+                                              cache=self.cache_factory() if self.cache_factory else None,
+                                              **self.api_options)
+        return self
+
+    async def __aexit__(self, *args):
+        await asyncio.gather(*[api.async_close() for api in self.apis.values()])
+        await self.session.close()
+        self.session = None
+        self.apis = {}
+
+    def _token_refresh_skew(self, index: int) -> timedelta:
+        # spread refreshes over the window so accounts logged in together do not refresh together
+        return self.token_refresh_skew + self.token_refresh_window * index / len(self.credentials)
+
+    async def async_get_all_cameras(self) -> Dict[str, List[Camera] | Exception]:
+        usernames = list(self.apis)
+        results = await asyncio.gather(*[self.apis[username].async_get_cameras() for username in usernames],
+                                       return_exceptions=True)
+        for username, result in zip(usernames, results):
+            if isinstance(result, Exception):
+                LOGGER.warning(f"{username} : failed to get cameras [{result!r}]")
+        return dict(zip(usernames, results))
@@ -1,41 +1,162 @@
 import asyncio
-from datetime import datetime, timedelta
+import os
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
-from logging import Logger, getLogger
-from typing import List
-import jwt
-from aiohttp import ClientSession, ClientResponse
+from logging import DEBUG, Logger, getLogger
+from time import perf_counter
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Set, Tuple
+from aiohttp import ClientConnectionError, ClientSession, ClientResponse, ClientTimeout
 
-from . import Camera, SpypointApiError, SpypointApiInvalidCredentialsError
-from .cameras.camera_api_response import CameraApiResponse
+from .cameras.camera import Camera
+from .cameras.camera_api_response import CameraApiResponse, local_timezone
+from .cameras.camera_changes import CameraChange, CameraChangeTracker
+from .cameras.camera_config import CameraConfig
+from .instrumentation import (CACHE_HIT, LOGIN, NOT_MODIFIED, RETRY, SHARED_CAMERA_URL, THROTTLE, TOKEN_LOADED,
+                              UNAUTHORIZED, Observer, RequestTimings, endpoint)
+from .json_stream import async_iter_json_array
+from .jwt_claims import decode_unverified_claims
+from .photos.photo import Photo
+from .photos.photo_api_response import PhotoApiResponse
+from .photos.photo_download import Writer, async_download_to_file, async_download_to_writer
+from .rate_limiter import AdaptiveRateLimiter
+from .response_cache import CacheEntry, ResponseCache
+from .retry_policy import THROTTLING_STATUSES, RequestStats, RetryPolicy
 from .shared_cameras.shared_cameras_api_response import SharedCamerasApiResponse
+from .spypoint_api_errors import SpypointApiError, SpypointApiInvalidCredentialsError
+from .spypoint_api_logging import async_read_log_body, redact_headers, redact_json
+from .spypoint_api_response import SpypointApiResponse
+from .token_store import StoredToken, TokenStore
 
 LOGGER: Logger = getLogger(__package__)
 
 
+async def _async_gather(*coroutines: Awaitable[Any]) -> List[Any]:
+    # like asyncio.gather, but the first failure cancels the siblings instead of leaving them running
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coroutine) for coroutine in coroutines]
+    except BaseExceptionGroup as error:
+        raise error.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
 class SpypointApi:
     base_url = 'https://restapi.spypoint.com/api/v3'
+    log_body_max_size = 4096
+    stream_chunk_size = 64 * 1024
+    photos_page_size = 100
+    camera_config_url = '/camera/config/{camera_id}'
+    # urls reported to observers by their template, so metrics get one label per endpoint
+    endpoint_templates = (SHARED_CAMERA_URL, camera_config_url)
 
-    def __init__(self, username: str, password: str, session: ClientSession):
+    def __init__(self, username: str, password: str, session: ClientSession,
+                 token_refresh_skew: timedelta = timedelta(minutes=5),
+                 max_concurrency: int = 10,
+                 request_timeout: float | None = None,
+                 partial_results: bool = False,
+                 cache: ResponseCache | None = None,
+                 request_limiter: Callable[[], AsyncContextManager] | None = None,
+                 rate_limiter: AdaptiveRateLimiter | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 token_store: TokenStore | None = None,
+                 observer: Observer | None = None,
+                 decode_offload_threshold: int | None = None):
         self.username = username
         self.password = password
         self.session = session
         self.headers = {'Content-Type': 'application/json'}
         self.expires_at = datetime.now() - timedelta(seconds=1)
+        self.token_refresh_skew = token_refresh_skew
+        self._token_lifetime: timedelta | None = None
+        self._login_task: asyncio.Task | None = None
+        self.token_store = token_store
+        self._last_token: str | None = None
+        self.partial_results = partial_results
+        self.cache = cache
+        self.request_limiter = request_limiter or nullcontext
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.request_stats = RequestStats()
+        self.observer = observer
+        self.decode_offload_threshold = decode_offload_threshold
+        self._camera_changes = CameraChangeTracker()
+        self._shared_camera_ids: Set[str] | None = None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._shared_camera_semaphore = asyncio.Semaphore(max_concurrency)
+        self._request_options = {} if request_timeout is None else {'timeout': ClientTimeout(total=request_timeout)}
 
     async def async_authenticate(self):
-        if datetime.now() < self.expires_at:
+        now = datetime.now()
+        skew = self.token_refresh_skew
+        if self._token_lifetime is not None:
+            # a skew longer than the token lifetime would log in again on every request
+            skew = min(skew, self._token_lifetime / 2)
+        if now < self.expires_at - skew:
+            return
+
+        if now < self.expires_at:
+            # token is still valid, refresh it in the background
+            self._start_login()
+            return
+
+        await asyncio.shield(self._start_login())
+
+    def _start_login(self) -> asyncio.Task:
+        if self._login_task is None or self._login_task.done():
+            self._login_task = asyncio.create_task(self._async_login())
+            self._login_task.add_done_callback(self._on_login_done)
+        return self._login_task
+
+    @staticmethod
+    def _on_login_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            LOGGER.debug(f"/user/login : failed [{task.exception()!r}]")
+
+    async def _async_login(self):
+        if await self._async_load_stored_token():
             return
 
         json = {'username': self.username, 'password': self.password}
-        async with self.session.post(f'{self.base_url}/user/login', json=json, headers=self.headers) as response:
-            await self._log('/user/login', response, self.headers, json)
-            self._raise_on_authenticate_error(response)
-            body = await response.json()
-            jwt_token = body['token']
-            claimset = jwt.decode(jwt_token, options={"verify_signature": False})
-            self.headers['Authorization'] = 'Bearer ' + jwt_token
-            self.expires_at = datetime.fromtimestamp(claimset['exp'])
+        options = {**self._request_options, 'json': json}
+        # logins share the request limiter, a pool refreshing many tokens stays within its concurrency
+        async with self.request_limiter():
+            async with await self._async_session_request('POST', '/user/login', self.headers, options) as response:
+                await self._log('/user/login', response, self.headers, json)
+                self._raise_on_authenticate_error(response)
+                body = await response.json()
+                jwt_token = body['token']
+                claims = decode_unverified_claims(jwt_token)
+                self._set_token(jwt_token, datetime.fromtimestamp(claims['exp']))
+        self._observe(LOGIN, '/user/login')
+
+        if self.token_store is not None:
+            await self.token_store.async_save(self.username, StoredToken(jwt_token, self.expires_at))
+
+    async def async_close(self):
+        # a background token refresh must not outlive the session it uses
+        task = self._login_task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._login_task = None
+
+    async def _async_load_stored_token(self) -> bool:
+        if self.token_store is None:
+            return False
+        stored = await self.token_store.async_load(self.username)
+        # skip the token being refreshed or rejected, another process may have stored a newer one
+        if stored is None or stored.token == self._last_token or datetime.now() >= stored.expires_at:
+            return False
+        self._set_token(stored.token, stored.expires_at)
+        self._observe(TOKEN_LOADED)
+        return True
+
+    def _set_token(self, token: str, expires_at: datetime):
+        self._last_token = token
+        self.headers['Authorization'] = 'Bearer ' + token
+        self.expires_at = expires_at
+        self._token_lifetime = max(expires_at - datetime.now(), timedelta(0))
 
     @staticmethod
     def _raise_on_authenticate_error(response: ClientResponse):
@@ -45,44 +166,377 @@ class SpypointApi:
             raise SpypointApiError(response)
 
     async def async_get_cameras(self) -> List[Camera]:
-        own_cameras = await self.async_get_own_cameras()
-        shared_cameras = await self.async_get_shared_cameras()
+        own_cameras, shared_cameras = await _async_gather(self.async_get_own_cameras(),
+                                                          self.async_get_shared_cameras())
         return own_cameras + shared_cameras
 
+    async def async_iter_camera_changes(self) -> AsyncIterator[CameraChange]:
+        failed_ids: Set[str] = set()
+
+        async def get_shared_cameras() -> List[Camera]:
+            camera_ids = await self._async_get_shared_camera_ids()
+            return await self._async_get_shared_cameras_by_id(camera_ids, failed_ids)
+
+        own_cameras, shared_cameras = await _async_gather(self.async_get_own_cameras(), get_shared_cameras())
+        # the tracker is only touched on the loop, decoding may have run in a worker thread
+        own_cameras = self._camera_changes.reuse_unchanged(own_cameras)
+        # with partial results, a shared camera that failed to fetch is still there
+        for change in self._camera_changes.update(own_cameras + shared_cameras, failed_ids):
+            yield change
+
+    async def async_get_camera(self, camera_id: str, refresh: bool = False) -> Camera | None:
+        return (await self.async_get_cameras_by_ids([camera_id], refresh)).get(camera_id)
+
+    async def async_get_cameras_by_ids(self, camera_ids: Iterable[str], refresh: bool = False,
+                                       failed_ids: Set[str] | None = None) -> Dict[str, Camera]:
+        # with partial results, ids skipped because their fetch failed are added to failed_ids,
+        # the other missing ids are no longer owned nor shared
+        camera_ids = list(dict.fromkeys(camera_ids))
+        if self._shared_camera_ids is None:
+            await self._async_get_shared_camera_ids()
+        shared_ids = [camera_id for camera_id in camera_ids if camera_id in self._shared_camera_ids]
+        own_ids = [camera_id for camera_id in camera_ids if camera_id not in self._shared_camera_ids]
+        if refresh and self.cache is not None:
+            for camera_id in shared_ids:
+                self.cache.invalidate(f'/shared-cameras/{camera_id}')
+            if own_ids:
+                self.cache.invalidate('/camera/all')
+
+        # owned cameras have no per camera endpoint, a single /camera/all (or its cached snapshot) serves them all
+        failed: Set[str] = set()
+        gets = [self._async_get_shared_cameras_by_id(shared_ids, failed)]
+        if own_ids:
+            gets.append(self._coalesced('/camera/all', self.async_get_own_cameras))
+        try:
+            cameras = {camera.id: camera for result in await _async_gather(*gets) for camera in result}
+        except SpypointApiError:
+            # a camera that is no longer shared fails to fetch, drop it instead of failing every camera
+            unshared_ids = await self._async_unshared_camera_ids(shared_ids)
+            if not unshared_ids:
+                raise
+            return await self.async_get_cameras_by_ids(
+                [camera_id for camera_id in camera_ids if camera_id not in unshared_ids], refresh, failed_ids)
+
+        missing_ids = [camera_id for camera_id in own_ids if camera_id not in cameras]
+        if missing_ids or failed:
+            # may have been shared or unshared since the shared camera ids were last fetched
+            failed -= await self._async_unshared_camera_ids(failed)
+            newly_shared_ids = [camera_id for camera_id in missing_ids if camera_id in self._shared_camera_ids]
+            for camera in await self._async_get_shared_cameras_by_id(newly_shared_ids, failed):
+                cameras[camera.id] = camera
+        if failed_ids is not None:
+            failed_ids |= failed
+
+        return {camera_id: cameras[camera_id] for camera_id in camera_ids if camera_id in cameras}
+
     async def async_get_own_cameras(self) -> List[Camera]:
-        async with await self._get('/camera/all') as response:
-            body = await response.json()
-            return CameraApiResponse.from_json(body)
+        return await self._get_parsed('/camera/all', CameraApiResponse.from_json)
+
+    async def async_iter_own_cameras(self) -> AsyncIterator[Camera]:
+        timezone = local_timezone()
+        async with self._open_get('/camera/all', stream=True) as response:
+            async for data in async_iter_json_array(response.content.iter_chunked(self.stream_chunk_size)):
+                yield CameraApiResponse.camera_from_json(data, timezone)
 
     async def async_get_shared_cameras(self) -> List[Camera]:
-        async with await self._get('/shared-cameras/all') as response:
-            body = await response.json()
-            camera_ids = SharedCamerasApiResponse.from_json(body)
-            gets_by_id = [self._async_get_shared_camera(camera_id) for camera_id in camera_ids]
-            return await asyncio.gather(*gets_by_id)
+        camera_ids = await self._async_get_shared_camera_ids()
+        return await self._async_get_shared_cameras_by_id(camera_ids)
+
+    async def async_update_camera_config(self, camera_id: str, config: CameraConfig) -> None:
+        # not retried here, ConfigReconciler retries with its own policy
+        async with self._open_request('PUT', self.camera_config_url.format(camera_id=camera_id),
+                                      json=config.to_json(), retry=False):
+            pass
+        if self.cache is not None:
+            self.cache.invalidate('/camera/all')
+            self.cache.invalidate(f'/shared-cameras/{camera_id}')
+
+    async def async_iter_photos(self, camera_ids: Iterable[str], since: datetime | None = None,
+                                before: datetime | None = None) -> AsyncIterator[Photo]:
+        camera_ids = list(camera_ids)
+        date_end = before or datetime(2100, 1, 1, tzinfo=timezone.utc)
+        # ids already yielded with a date equal to date_end, the next page returns them again
+        boundary_ids: Set[str] = set()
+        while True:
+            json = {'camera': camera_ids, 'dateEnd': PhotoApiResponse.date_to_json(date_end),
+                    'favorite': False, 'hd': False, 'limit': self.photos_page_size, 'tag': []}
+            photos = await self._async_parse('/photo/all', await self._post('/photo/all', json),
+                                             PhotoApiResponse.from_json)
+            new_photos = [photo for photo in photos if photo.id not in boundary_ids]
+            for photo in new_photos:
+                if since is not None and photo.date <= since:
+                    return
+                yield photo
+            if len(photos) < self.photos_page_size:
+                return
+            if not new_photos:
+                # a full page sharing one date, dateEnd is the only cursor so the rest of that date is out of reach
+                LOGGER.warning(f"/photo/all : more than {self.photos_page_size} photos at {date_end}, "
+                               f"some were skipped")
+                date_end -= timedelta(milliseconds=1)
+                boundary_ids = set()
+                continue
+            # the next page ends at the oldest photo of this one, photos sharing its date are returned again
+            if photos[-1].date != date_end:
+                boundary_ids = set()
+            date_end = photos[-1].date
+            boundary_ids |= {photo.id for photo in photos if photo.date == date_end}
+
+    async def async_download_photo(self, photo: Photo, destination: str | Writer, hd: bool = False) -> bool:
+        url = photo.hd_url if hd and photo.hd_url else photo.url
+        if url is None:
+            raise ValueError(f'Photo {photo.id} has no url')
+        # photos are served by the storage host, the api token is not sent there
+        if isinstance(destination, str):
+            return await async_download_to_file(self.session, url, destination)
+        await async_download_to_writer(self.session, url, destination)
+        return True
+
+    async def async_download_photos(self, photos: Iterable[Photo], directory: str, hd: bool = False,
+                                    max_concurrency: int = 4) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def download(photo: Photo) -> str | None:
+            path = os.path.join(directory, f'{photo.id}.jpg')
+            async with semaphore:
+                return path if await self.async_download_photo(photo, path, hd) else None
+
+        paths = await asyncio.gather(*[download(photo) for photo in photos])
+        return [path for path in paths if path is not None]
+
+    async def _async_get_shared_camera_ids(self) -> List[str]:
+        camera_ids = await self._get_parsed('/shared-cameras/all', SharedCamerasApiResponse.from_json)
+        self._shared_camera_ids = set(camera_ids)
+        return camera_ids
+
+    async def _async_unshared_camera_ids(self, camera_ids: Iterable[str]) -> Set[str]:
+        if self.cache is not None:
+            self.cache.invalidate('/shared-cameras/all')
+        await self._async_get_shared_camera_ids()
+        return {camera_id for camera_id in camera_ids if camera_id not in self._shared_camera_ids}
+
+    async def _async_get_shared_cameras_by_id(self, camera_ids: List[str],
+                                              failed_ids: Set[str] | None = None) -> List[Camera]:
+        gets_by_id = [self._async_get_shared_camera_limited(camera_id) for camera_id in camera_ids]
+        if not self.partial_results:
+            return await _async_gather(*gets_by_id)
+
+        cameras = []
+        for camera_id, result in zip(camera_ids, await asyncio.gather(*gets_by_id, return_exceptions=True)):
+            if isinstance(result, Exception):
+                LOGGER.warning(f"/shared-cameras/{camera_id} : skipped [{result!r}]")
+                if failed_ids is not None:
+                    failed_ids.add(camera_id)
+            else:
+                cameras.append(result)
+        return cameras
+
+    async def _async_get_shared_camera_limited(self, camera_id) -> Camera:
+        async def get() -> Camera:
+            async with self._shared_camera_semaphore:
+                return await self._async_get_shared_camera(camera_id)
+
+        return await self._coalesced(f'/shared-cameras/{camera_id}', get)
+
+    async def _coalesced(self, key: str, get: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(get())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shielded so one cancelled caller does not cancel the request the others are waiting on
+        return await asyncio.shield(task)
 
     async def _async_get_shared_camera(self, camera_id) -> Camera:
-        async with await self._get(f'/shared-cameras/{camera_id}') as response:
-            body = await response.json()
+        def parse(body: Dict[str, Any]) -> Camera:
             body['id'] = camera_id
             return CameraApiResponse.camera_from_json(body)
 
-    async def _get(self, url: str) -> ClientResponse:
+        return await self._get_parsed(f'/shared-cameras/{camera_id}', parse)
+
+    async def _get_parsed(self, url: str, parse: Callable[[Any], Any]) -> Any:
+        if self.cache is None:
+            return await self._async_parse(url, await self._get(url), parse)
+
+        if self.observer is not None and self.cache.get_fresh(url) is not None:
+            self._observe(CACHE_HIT, url)
+        return await self.cache.async_get(url, lambda entry: self._async_get_cache_entry(url, parse, entry))
+
+    async def _async_get_cache_entry(self, url: str, parse: Callable[[Any], Any], entry: CacheEntry | None) -> CacheEntry:
+        response = await self._get(url, entry.validators if entry else None)
+        if response.status == HTTPStatus.NOT_MODIFIED and entry is not None:
+            self._observe(NOT_MODIFIED, url)
+            return entry
+        return CacheEntry(value=await self._async_parse(url, response, parse),
+                          etag=response.headers.get('ETag'),
+                          last_modified=response.headers.get('Last-Modified'))
+
+    async def _async_parse(self, url: str, response: SpypointApiResponse, parse: Callable[[Any], Any]) -> Any:
+        # parse maps decoded json to models and may run in a worker thread, it must not touch shared state
+        offload = self.decode_offload_threshold is not None and len(response.body) >= self.decode_offload_threshold
+        if not offload and self.observer is None:
+            return parse(response.json())
+
+        if not offload:
+            value, decode, parse_time = self._timed_parse(response, parse)
+        else:
+            # decoding and mapping thousands of cameras takes hundreds of milliseconds, run it in a thread
+            value, decode, parse_time = await asyncio.get_running_loop().run_in_executor(
+                None, self._timed_parse, response, parse)
+        if self.observer is not None:
+            self.observer.on_decode(endpoint(url, self.endpoint_templates), len(response.body), decode, parse_time)
+        return value
+
+    @staticmethod
+    def _timed_parse(response: SpypointApiResponse, parse: Callable[[Any], Any]) -> Tuple[Any, float, float]:
+        start = perf_counter()
+        data = response.json()
+        decoded = perf_counter()
+        value = parse(data)
+        return value, decoded - start, perf_counter() - decoded
+
+    async def _get(self, url: str, headers: Dict[str, str] | None = None) -> SpypointApiResponse:
+        async with self._open_get(url, headers) as response:
+            return SpypointApiResponse(status=response.status, headers=response.headers, body=await response.read())
+
+    async def _post(self, url: str, json: Dict[str, Any]) -> SpypointApiResponse:
+        async with self._open_request('POST', url, json=json) as response:
+            return SpypointApiResponse(status=response.status, headers=response.headers, body=await response.read())
+
+    def _open_get(self, url: str, headers: Dict[str, str] | None = None,
+                  stream: bool = False) -> AsyncContextManager[ClientResponse]:
+        return self._open_request('GET', url, headers, stream)
+
+    @asynccontextmanager
+    async def _open_request(self, method: str, url: str, headers: Dict[str, str] | None = None,
+                            stream: bool = False, json: Dict[str, Any] | None = None,
+                            retry: bool | None = None) -> AsyncIterator[ClientResponse]:
+        response, slots = await self._async_response(method, url, headers, stream, json, retry)
+        try:
+            yield response
+        finally:
+            response.release()
+            # the limiter slots cover reading the body, not only waiting for the headers
+            await slots.aclose()
+
+    async def _async_response(self, method: str, url: str, headers: Dict[str, str] | None, stream: bool,
+                              json: Dict[str, Any] | None, retry: bool | None = None,
+                              retry_unauthorized: bool = True) -> Tuple[ClientResponse, AsyncExitStack]:
         await self.async_authenticate()
-        response = await self.session.get(f'{self.base_url}{url}', headers=self.headers)
-        await self._log(url, response, self.headers)
-        self._raise_on_get_error(response)
-        return response
+        authorization = self.headers.get('Authorization')
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        response, slots = await self._async_send(method, url, request_headers, json, retry)
+        try:
+            # reading the body for the log would consume the stream
+            await self._log(url, response, request_headers, json, log_body=not stream or not response.ok)
+            if response.status == HTTPStatus.UNAUTHORIZED:
+                self._observe(UNAUTHORIZED, url)
+            if response.status == HTTPStatus.UNAUTHORIZED and retry_unauthorized:
+                response.release()
+                await slots.aclose()
+                self._invalidate_token(authorization)
+                return await self._async_response(method, url, headers, stream, json, retry,
+                                                  retry_unauthorized=False)
+            self._raise_on_get_error(response, authorization)
+        except BaseException:
+            # the caller never gets the response, give its connection and slots back now
+            response.release()
+            await slots.aclose()
+            raise
+        return response, slots
+
+    async def _async_send(self, method: str, url: str, headers: Dict[str, str], json: Dict[str, Any] | None,
+                          retry: bool | None = None) -> Tuple[ClientResponse, AsyncExitStack]:
+        # only GETs are retried unless the caller knows the request is safe to send again
+        retry_policy = self.retry_policy if (method == 'GET' if retry is None else retry) else None
+        attempt = 0
+        while True:
+            try:
+                response, slots = await self._async_send_once(method, url, headers, json)
+            except (ClientConnectionError, asyncio.TimeoutError) as error:
+                if retry_policy is None or not retry_policy.should_retry(attempt):
+                    raise
+                delay = retry_policy.delay(attempt)
+                LOGGER.debug(f"{url} : retrying in {delay:.2f}s [{error!r}]")
+            else:
+                if retry_policy is None or not retry_policy.should_retry(attempt, response.status):
+                    return response, slots
+                delay = retry_policy.delay(attempt, response.headers.get('Retry-After'))
+                LOGGER.debug(f"{url} : retrying in {delay:.2f}s [status={response.status}]")
+                response.release()
+                await slots.aclose()
+            attempt += 1
+            self.request_stats.retries += 1
+            self._observe(RETRY, url)
+            await asyncio.sleep(delay)
+
+    async def _async_send_once(self, method: str, url: str, headers: Dict[str, str],
+                               json: Dict[str, Any] | None) -> Tuple[ClientResponse, AsyncExitStack]:
+        options = self._request_options if json is None else {**self._request_options, 'json': json}
+        rate_limiter_slot = nullcontext if self.rate_limiter is None else self.rate_limiter.slot
+        # the slots are held until the response is released, the caller closes them
+        slots = AsyncExitStack()
+        try:
+            await slots.enter_async_context(self.request_limiter())
+            sent_at = await slots.enter_async_context(rate_limiter_slot())
+            response = await self._async_session_request(method, url, headers, options)
+        except BaseException:
+            await slots.aclose()
+            raise
+        self.request_stats.requests += 1
+        if response.status in THROTTLING_STATUSES:
+            self.request_stats.throttles += 1
+            self._observe(THROTTLE, url)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(sent_at)
+        elif self.rate_limiter is not None:
+            self.rate_limiter.on_success()
+        return response, slots
+
+    async def _async_session_request(self, method: str, url: str, headers: Dict[str, str],
+                                     options: Dict[str, Any]) -> ClientResponse:
+        if self.observer is None:
+            return await self.session.request(method, f'{self.base_url}{url}', headers=headers, **options)
 
-    def _raise_on_get_error(self, response: ClientResponse):
+        timings = RequestTimings(method, endpoint(url, self.endpoint_templates))
+        try:
+            response = await self.session.request(method, f'{self.base_url}{url}', headers=headers,
+                                                  trace_request_ctx=timings, **options)
+        except BaseException as error:
+            timings.error = type(error).__name__
+            raise
+        else:
+            timings.status = response.status
+            return response
+        finally:
+            timings.ttfb = perf_counter() - timings.started
+            self.observer.on_request(timings)
+
+    def _observe(self, event: str, url: str | None = None):
+        if self.observer is not None:
+            self.observer.on_event(event, None if url is None else endpoint(url, self.endpoint_templates))
+
+    def _raise_on_get_error(self, response: ClientResponse, authorization: str | None):
         if response.status == HTTPStatus.UNAUTHORIZED:
-            self.expires_at = datetime.now() - timedelta(seconds=1)
-            del self.headers['Authorization']
+            self._invalidate_token(authorization)
 
         if not response.ok:
             raise SpypointApiError(response)
 
-    @staticmethod
-    async def _log(url: str, response: ClientResponse, headers: dict, json: dict = None) -> None:
+    def _invalidate_token(self, authorization: str | None):
+        # a concurrent request may already have logged in again with a new token
+        if authorization != self.headers.get('Authorization'):
+            return
+        self.expires_at = datetime.now() - timedelta(seconds=1)
+        self.headers.pop('Authorization', None)
+
+    async def _log(self, url: str, response: ClientResponse, headers: dict, json: dict = None,
+                   log_body: bool = True) -> None:
+        if not LOGGER.isEnabledFor(DEBUG):
+            return
+        body = await async_read_log_body(response, self.log_body_max_size) if log_body else '<streamed>'
         LOGGER.debug(
-            f"{url} : Request[[ headers=[{headers}] body=[{json}] ]] - Response[[ status=[{response.status}] headers=[{dict(response.headers)}] body=[{await response.text()}] ]]")
+            "%s : Request[[ headers=[%s] body=[%s] ]] - Response[[ status=[%s] headers=[%s] body=[%s] ]]",
+            url, redact_headers(headers), redact_json(json),
+            response.status, dict(response.headers), body)
@@ -0,0 +1,30 @@
+import re
+from typing import Any, Dict
+
+from aiohttp import ClientResponse
+
+REDACTED = '***'
+
+_JWT_PATTERN = re.compile(rb'eyJ[\w-]+\.[\w-]+\.[\w-]*')
+_SENSITIVE_HEADERS = ('Authorization',)
+_SENSITIVE_FIELDS = ('password',)
+
+
+def redact_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {key: REDACTED if key in _SENSITIVE_HEADERS else value for key, value in headers.items()}
+
+
+def redact_json(json: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    if json is None:
+        return None
+    return {key: REDACTED if key in _SENSITIVE_FIELDS else value for key, value in json.items()}
+
+
+async def async_read_log_body(response: ClientResponse, max_size: int) -> str:
+    # read() caches the body on the response, so the json parse that follows does not read it again
+    body = await response.read()
+    sample = _JWT_PATTERN.sub(REDACTED.encode(), body[:max_size])
+    text = sample.decode(response.get_encoding(), errors='replace')
+    if len(body) > max_size:
+        text += f'... ({len(body)} bytes)'
+    return text
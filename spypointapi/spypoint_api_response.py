@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from .json_backend import loads
+
+
+@dataclass()
+class SpypointApiResponse:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return loads(self.body)
@@ -0,0 +1,352 @@
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .cameras.camera import Camera
+from .cameras.camera_changes import CameraChange, CameraChangeType
+
+MAGIC = b'SPTH\x01'
+FIELDS = ('battery', 'signal', 'temperature', 'memory')
+# values are stored as integers keeping two decimals
+SCALES = (100, 100, 100, 100)
+
+_IDS = b'I'
+_RECORDS = b'R'
+# type, first timestamp, last timestamp, number of ids or records, payload length
+_BLOCK = struct.Struct('<cqqII')
+_COUNT = struct.Struct('<I')
+# camera index and end of its run of records, fixed width so a block can be binary searched
+_DIRECTORY_ENTRY = struct.Struct('<II')
+
+Values = Tuple[int | None, ...]
+Record = Tuple[int, int, Values]
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetryPoint:
+    time: datetime
+    battery: float | None = None
+    signal: float | None = None
+    temperature: float | None = None
+    memory: float | None = None
+
+
+def _write_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, position: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _scale(camera: Camera) -> Values:
+    return tuple(None if value is None else round(value * scale)
+                 for value, scale in zip((camera.battery, camera.signal, camera.temperature, camera.memory), SCALES))
+
+
+def _point(timestamp: int, values: Values) -> TelemetryPoint:
+    return TelemetryPoint(datetime.fromtimestamp(timestamp, timezone.utc),
+                          *(None if value is None else value / scale for value, scale in zip(values, SCALES)))
+
+
+class TelemetryHistory:
+    compaction_interval = timedelta(days=1)
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ids: List[str] = []
+        self._indexes: Dict[str, int] = {}
+        # last values of every camera, unchanged telemetry is not recorded again
+        self._last: Dict[int, Tuple[int, Values]] = {}
+        self._open()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'TelemetryHistory':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def record(self, cameras: Iterable[Camera]) -> int:
+        new_ids = []
+        records = []
+        for camera in cameras:
+            index = self._indexes.get(camera.id)
+            if index is None:
+                index = len(self._ids)
+                self._ids.append(camera.id)
+                self._indexes[camera.id] = index
+                new_ids.append(camera.id)
+
+            timestamp = int(camera.last_update_time.timestamp())
+            values = _scale(camera)
+            last = self._last.get(index)
+            if last is not None and (timestamp <= last[0] or values == last[1]):
+                continue
+            self._last[index] = (timestamp, values)
+            records.append((index, timestamp, values))
+
+        # one write per poll, ids first so a torn records block never references unknown cameras
+        data = bytearray()
+        if new_ids:
+            data += self._encode_ids(new_ids)
+        if records:
+            data += self._encode_records(records)
+        if data:
+            self._file.write(data)
+            self._file.flush()
+        return len(records)
+
+    def record_changes(self, changes: Iterable[CameraChange]) -> int:
+        return self.record(change.camera for change in changes if change.type != CameraChangeType.REMOVED)
+
+    def query(self, camera_id: str, start: datetime | None = None, end: datetime | None = None) -> List[TelemetryPoint]:
+        return [_point(timestamp, values) for timestamp, values in self._iter_camera(camera_id, start, end)]
+
+    def downsample(self, camera_id: str, interval: timedelta, start: datetime | None = None,
+                   end: datetime | None = None) -> List[TelemetryPoint]:
+        seconds = int(interval.total_seconds())
+        buckets: Dict[int, List[List[int]]] = {}
+        for timestamp, values in self._iter_camera(camera_id, start, end):
+            bucket = buckets.setdefault(timestamp - timestamp % seconds, [[] for _ in FIELDS])
+            for field_values, value in zip(bucket, values):
+                if value is not None:
+                    field_values.append(value)
+
+        return [_point(bucket_start, tuple(sum(values) / len(values) if values else None for values in bucket))
+                for bucket_start, bucket in sorted(buckets.items())]
+
+    def compact(self, retention: timedelta | None = None, now: datetime | None = None):
+        cutoff = None
+        if retention is not None:
+            cutoff = int(((now or datetime.now(timezone.utc)) - retention).timestamp())
+
+        records = [record for record in self._read_records() if cutoff is None or record[1] >= cutoff]
+        indexes = {index: new_index for new_index, index in enumerate(sorted({record[0] for record in records}))}
+        ids = [self._ids[index] for index in indexes]
+        records = [(indexes[index], timestamp, values) for index, timestamp, values in records]
+
+        # larger blocks hold longer runs per camera, consecutive values of a camera are delta encoded
+        window = int(self.compaction_interval.total_seconds())
+        data = bytearray(MAGIC)
+        if ids:
+            data += self._encode_ids(ids)
+        records.sort(key=lambda record: record[1] - record[1] % window)
+        for _, window_records in groupby(records, key=lambda record: record[1] - record[1] % window):
+            data += self._encode_records(list(window_records))
+
+        self._file.close()
+        self._replace(bytes(data))
+        self._open()
+
+    def _open(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, 'wb') as file:
+                file.write(MAGIC)
+
+        self._ids = []
+        self._last = {}
+        end = len(MAGIC)
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f'{self.path} is not a telemetry history file')
+            record_blocks = []
+            for block_type, first, _, count, payload, block_end in self._iter_blocks(data):
+                if block_type == _IDS:
+                    self._ids.extend(self._decode_ids(data, payload, count))
+                else:
+                    record_blocks.append((first, payload))
+                end = block_end
+            # the last values of every camera, read from the tail, so a reopened history keeps skipping
+            # unchanged telemetry
+            for first, payload in reversed(record_blocks):
+                if len(self._last) == len(self._ids):
+                    break
+                block_last: Dict[int, Tuple[int, Values]] = {}
+                for index, timestamp, values in self._decode_records(data, payload, first, None):
+                    if index not in self._last:
+                        block_last[index] = (timestamp, values)
+                self._last.update(block_last)
+        self._indexes = {camera_id: index for index, camera_id in enumerate(self._ids)}
+
+        self._file = open(self.path, 'r+b')
+        # drop a block torn by a crash in the middle of a write
+        self._file.truncate(end)
+        self._file.seek(end)
+
+    @staticmethod
+    def _iter_blocks(data) -> Iterator[Tuple[bytes, int, int, int, int, int]]:
+        position = len(MAGIC)
+        while position + _BLOCK.size <= len(data):
+            block_type, first, last, count, length = _BLOCK.unpack_from(data, position)
+            payload = position + _BLOCK.size
+            if payload + length > len(data):
+                return
+            yield block_type, first, last, count, payload, payload + length
+            position = payload + length
+
+    def _iter_camera(self, camera_id: str, start: datetime | None, end: datetime | None) -> Iterator[Tuple[int, Values]]:
+        index = self._indexes.get(camera_id)
+        if index is None:
+            return
+        start_timestamp = None if start is None else int(start.timestamp())
+        end_timestamp = None if end is None else int(end.timestamp())
+        for _, timestamp, values in self._read_records(index, start_timestamp, end_timestamp):
+            if (start_timestamp is None or timestamp >= start_timestamp) and (
+                    end_timestamp is None or timestamp < end_timestamp):
+                yield timestamp, values
+
+    def _read_records(self, only_index: int | None = None, start: int | None = None,
+                      end: int | None = None) -> List[Record]:
+        records = []
+        with open(self.path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for block_type, first, last, _, payload, _ in self._iter_blocks(data):
+                if block_type != _RECORDS:
+                    continue
+                # block headers carry their time range, blocks outside the query are never decoded
+                if (start is not None and last < start) or (end is not None and first >= end):
+                    continue
+                records.extend(self._decode_records(data, payload, first, only_index))
+        return records
+
+    @staticmethod
+    def _encode_ids(ids: List[str]) -> bytes:
+        payload = bytearray()
+        for camera_id in ids:
+            encoded = camera_id.encode()
+            _write_varint(payload, len(encoded))
+            payload += encoded
+        return _BLOCK.pack(_IDS, 0, 0, len(ids), len(payload)) + payload
+
+    @staticmethod
+    def _decode_ids(data, position: int, count: int) -> List[str]:
+        ids = []
+        for _ in range(count):
+            length, position = _read_varint(data, position)
+            ids.append(bytes(data[position:position + length]).decode())
+            position += length
+        return ids
+
+    @staticmethod
+    def _encode_records(records: List[Record]) -> bytes:
+        records.sort(key=itemgetter(0, 1))
+        first = min(record[1] for record in records)
+        last = max(record[1] for record in records)
+
+        directory = bytearray()
+        runs = bytearray()
+        for index, camera_records in groupby(records, key=itemgetter(0)):
+            previous_timestamp = first
+            previous_values = [0] * len(FIELDS)
+            for _, timestamp, values in camera_records:
+                _write_varint(runs, timestamp - previous_timestamp)
+                previous_timestamp = timestamp
+                presence = 0
+                for bit, value in enumerate(values):
+                    if value is not None:
+                        presence |= 1 << bit
+                runs.append(presence)
+                for field_index, value in enumerate(values):
+                    if value is not None:
+                        _write_varint(runs, _zigzag(value - previous_values[field_index]))
+                        previous_values[field_index] = value
+            directory += _DIRECTORY_ENTRY.pack(index, len(runs))
+
+        payload = _COUNT.pack(len(directory) // _DIRECTORY_ENTRY.size) + directory + runs
+        return _BLOCK.pack(_RECORDS, first, last, len(records), len(payload)) + payload
+
+    @staticmethod
+    def _decode_records(data, position: int, first: int, only_index: int | None) -> List[Record]:
+        # the directory holds the camera index and run end of every camera, sorted by camera index
+        (cameras,) = _COUNT.unpack_from(data, position)
+        directory = position + _COUNT.size
+        runs = directory + cameras * _DIRECTORY_ENTRY.size
+
+        if only_index is None:
+            entries = [(index, run_end) for index, run_end
+                       in _DIRECTORY_ENTRY.iter_unpack(data[directory:runs])]
+        else:
+            # binary search, a query for one camera skips the runs of every other camera
+            low, high = 0, cameras
+            while low < high:
+                middle = (low + high) // 2
+                if _DIRECTORY_ENTRY.unpack_from(data, directory + middle * _DIRECTORY_ENTRY.size)[0] < only_index:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low == cameras:
+                return []
+            index, run_end = _DIRECTORY_ENTRY.unpack_from(data, directory + low * _DIRECTORY_ENTRY.size)
+            if index != only_index:
+                return []
+            run_start = 0 if low == 0 else _DIRECTORY_ENTRY.unpack_from(
+                data, directory + (low - 1) * _DIRECTORY_ENTRY.size)[1]
+            return TelemetryHistory._decode_run(data, index, first, runs + run_start, runs + run_end)
+
+        records = []
+        run_start = 0
+        for index, run_end in entries:
+            records.extend(TelemetryHistory._decode_run(data, index, first, runs + run_start, runs + run_end))
+            run_start = run_end
+        return records
+
+    @staticmethod
+    def _decode_run(data, index: int, first: int, position: int, end: int) -> List[Record]:
+        records = []
+        timestamp = first
+        previous_values = [0] * len(FIELDS)
+        while position < end:
+            delta, position = _read_varint(data, position)
+            timestamp += delta
+            presence = data[position]
+            position += 1
+            values = []
+            for field_index in range(len(FIELDS)):
+                if presence & (1 << field_index):
+                    delta, position = _read_varint(data, position)
+                    previous_values[field_index] += _unzigzag(delta)
+                    values.append(previous_values[field_index])
+                else:
+                    values.append(None)
+            records.append((index, timestamp, tuple(values)))
+        return records
+
+    def _replace(self, data: bytes):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.history-')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
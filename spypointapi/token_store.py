@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Protocol
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+@dataclass()
+class StoredToken:
+    token: str
+    expires_at: datetime
+
+    def to_json(self) -> Dict[str, str | float]:
+        return {'token': self.token, 'expires_at': self.expires_at.timestamp()}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, str | float]) -> 'StoredToken':
+        return StoredToken(token=data['token'], expires_at=datetime.fromtimestamp(data['expires_at']))
+
+
+class TokenStore(Protocol):
+
+    async def async_load(self, key: str) -> StoredToken | None:
+        ...
+
+    async def async_save(self, key: str, token: StoredToken) -> None:
+        ...
+
+
+class MemoryTokenStore:
+
+    def __init__(self):
+        self.tokens: Dict[str, StoredToken] = {}
+
+    async def async_load(self, key: str) -> StoredToken | None:
+        return self.tokens.get(key)
+
+    async def async_save(self, key: str, token: StoredToken) -> None:
+        self.tokens[key] = token
+
+
+class KeyValueTokenStore:
+
+    def __init__(self, get: Callable[[str], Awaitable[str | None]], set: Callable[[str, str], Awaitable[None]],
+                 prefix: str = 'spypoint-token:'):
+        self.get = get
+        self.set = set
+        self.prefix = prefix
+
+    async def async_load(self, key: str) -> StoredToken | None:
+        value = await self.get(self.prefix + key)
+        if value is None:
+            return None
+        return StoredToken.from_json(json.loads(value))
+
+    async def async_save(self, key: str, token: StoredToken) -> None:
+        await self.set(self.prefix + key, json.dumps(token.to_json()))
+
+
+class FileTokenStore:
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def async_load(self, key: str) -> StoredToken | None:
+        data = await asyncio.to_thread(self._read_locked)
+        if key not in data:
+            return None
+        return StoredToken.from_json(data[key])
+
+    async def async_save(self, key: str, token: StoredToken) -> None:
+        await asyncio.to_thread(self._update_locked, key, token)
+
+    def _read_locked(self) -> Dict[str, Dict]:
+        with self._lock():
+            return self._read()
+
+    def _update_locked(self, key: str, token: StoredToken):
+        # read, modify and write under the lock so processes sharing the file do not drop each other's tokens
+        with self._lock():
+            data = self._read()
+            data[key] = token.to_json()
+            self._write(data)
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, data: Dict[str, Dict]):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.tokens-')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(data, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def _lock(self):
+        return _FileLock(f'{self.path}.lock')
+
+
+class _FileLock:
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
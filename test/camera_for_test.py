@@ -0,0 +1,10 @@
+from datetime import datetime, timezone
+
+from spypointapi import Camera
+
+REPORTED_AT = datetime(2024, 10, 30, 12, 0, tzinfo=timezone.utc)
+
+
+def camera(camera_id='1', last_update_time=REPORTED_AT, **fields) -> Camera:
+    return Camera(**{'id': camera_id, 'name': camera_id, 'model': 'model', 'modem_firmware': '',
+                     'camera_firmware': '', 'last_update_time': last_update_time, **fields})
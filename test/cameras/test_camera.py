@@ -1,7 +1,8 @@
 import unittest
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timedelta
 
-from spypointapi import Camera
+from spypointapi import Camera, Coordinates
 
 
 class CameraTest(unittest.TestCase):
@@ -20,4 +21,45 @@ class CameraTest(unittest.TestCase):
                         last_update_time=datetime.now().astimezone() - timedelta(hours=24, minutes=0, seconds=1),
                         signal=100, temperature=20, battery=200, memory=100)
 
-        self.assertEqual(camera.is_online, False)
\ No newline at end of file
+        self.assertEqual(camera.is_online, False)
+
+    def test_is_online_at_given_time(self):
+        now = datetime.now().astimezone()
+        camera = Camera(id="id", name="name", model="model",
+                        modem_firmware="modem_firmware", camera_firmware="camera_firmware",
+                        last_update_time=now)
+
+        self.assertEqual(camera.is_online_at(now + timedelta(hours=24)), True)
+        self.assertEqual(camera.is_online_at(now + timedelta(hours=24, seconds=1)), False)
+
+    def test_frozen_camera_is_hashable_and_compared_by_value(self):
+        last_update_time = datetime.now().astimezone()
+        camera = Camera(id="id", name="name", model="model",
+                        modem_firmware="modem_firmware", camera_firmware="camera_firmware",
+                        last_update_time=last_update_time, notifications=["low_battery"],
+                        coordinates=Coordinates(latitude=45.0, longitude=-70.0))
+
+        frozen = camera.freeze()
+
+        self.assertEqual(frozen, camera.freeze())
+        self.assertEqual(hash(frozen), hash(camera.freeze()))
+        self.assertEqual(frozen.notifications, ("low_battery",))
+        self.assertEqual(frozen.is_online, True)
+        with self.assertRaises(FrozenInstanceError):
+            frozen.name = "other"
+        with self.assertRaises(FrozenInstanceError):
+            frozen.coordinates.latitude = 46.0
+
+    def test_coordinates_stay_mutable(self):
+        coordinates = Coordinates(latitude=45.0, longitude=-70.0)
+
+        coordinates.latitude = 46.0
+
+        self.assertEqual(coordinates, Coordinates(latitude=46.0, longitude=-70.0))
+
+    def test_camera_has_no_instance_dict(self):
+        camera = Camera(id="id", name="name", model="model",
+                        modem_firmware="modem_firmware", camera_firmware="camera_firmware",
+                        last_update_time=datetime.now().astimezone())
+
+        self.assertFalse(hasattr(camera, '__dict__'))
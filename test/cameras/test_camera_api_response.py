@@ -1,5 +1,6 @@
+import json
 import unittest
-from datetime import datetime
+from datetime import datetime, timezone
 
 from spypointapi.cameras.camera import Coordinates, TransmitTime
 from spypointapi.cameras.camera_api_response import CameraApiResponse
@@ -295,3 +296,35 @@ class TestCameraApiResponse(unittest.TestCase):
         )
 
         self.assertEqual(camera.coordinates, None)
+
+    def test_parses_bytes_same_as_json(self):
+        data = [
+            {
+                "id": "id",
+                "config": {"name": "name", "sensibility": {"level": "medium"}},
+                "status": {
+                    "model": "model",
+                    "lastUpdate": "2024-10-30T02:03:48.716Z",
+                    "signal": {"processed": {"percentage": 77}},
+                    "coordinates": [{"position": {"type": "Point", "coordinates": [-70.1234, 45.123456]}}],
+                },
+                "activationDate": "2024-09-30T01:02:03.456Z",
+            }
+        ]
+
+        cameras = CameraApiResponse.from_bytes(json.dumps(data).encode())
+
+        self.assertEqual(cameras, CameraApiResponse.from_json(data))
+
+    def test_parses_dates_in_given_timezone(self):
+        cameras = CameraApiResponse.from_json([
+            {
+                "id": "id",
+                "config": {"name": "name"},
+                "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"},
+                "creationDate": "2024-09-20T10:00:00.000Z",
+            }
+        ], timezone.utc)
+
+        self.assertEqual(cameras[0].last_update_time, datetime(2024, 10, 30, 2, 3, 48, 716000, timezone.utc))
+        self.assertEqual(cameras[0].creation_date, datetime(2024, 9, 20, 10, 0, 0, 0, timezone.utc))
@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime, timedelta
+
+from spypointapi.cameras.camera_changes import CameraChangeTracker, CameraChangeType
+from .. import camera_for_test
+
+
+def camera_json(camera_id, last_update="2024-10-30T02:03:48.716Z", battery=None, name=None):
+    status = {"model": "model", "lastUpdate": last_update}
+    if battery is not None:
+        status["batteries"] = [battery]
+    return {"id": camera_id, "config": {"name": name or camera_id}, "status": status}
+
+
+class TestCameraChangeTracker(unittest.TestCase):
+    last_update_time = datetime.now().astimezone()
+
+    def camera(self, camera_id, last_update_time=last_update_time, battery=None, name=None):
+        return camera_for_test.camera(camera_id, last_update_time, name=name or camera_id, battery=battery)
+
+    def test_reports_added_cameras(self):
+        tracker = CameraChangeTracker()
+
+        changes = tracker.update([self.camera("1"), self.camera("2")])
+
+        self.assertEqual([(change.type, change.camera.id) for change in changes],
+                         [(CameraChangeType.ADDED, "1"), (CameraChangeType.ADDED, "2")])
+
+    def test_reports_removed_cameras(self):
+        tracker = CameraChangeTracker()
+        tracker.update([self.camera("1"), self.camera("2")])
+
+        changes = tracker.update([self.camera("1")])
+
+        self.assertEqual([(change.type, change.camera.id) for change in changes],
+                         [(CameraChangeType.REMOVED, "2")])
+
+    def test_reports_changed_fields(self):
+        tracker = CameraChangeTracker()
+        tracker.update([self.camera("1", battery=90)])
+
+        later = self.last_update_time + timedelta(hours=1)
+        changes = tracker.update([self.camera("1", last_update_time=later, battery=80)])
+
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].type, CameraChangeType.CHANGED)
+        self.assertEqual(changes[0].changes, {"last_update_time": (self.last_update_time, later),
+                                              "battery": (90, 80)})
+
+    def test_ignores_cameras_with_same_last_update_time(self):
+        tracker = CameraChangeTracker()
+        tracker.update([self.camera("1", battery=90)])
+
+        changes = tracker.update([self.camera("1", battery=90)])
+
+        self.assertEqual(changes, [])
+
+    def test_reports_changes_with_same_last_update_time(self):
+        tracker = CameraChangeTracker()
+        tracker.update([self.camera("1")])
+
+        changes = tracker.update([self.camera("1", name="renamed")])
+
+        self.assertEqual([change.changes for change in changes], [{"name": ("1", "renamed")}])
+
+    def test_keeps_unavailable_cameras(self):
+        tracker = CameraChangeTracker()
+        tracker.update([self.camera("1"), self.camera("2")])
+
+        self.assertEqual(tracker.update([self.camera("1")], unavailable_ids={"2"}), [])
+        self.assertEqual(set(tracker.cameras), {"1", "2"})
+
+    def test_parse_json_reuses_unchanged_cameras(self):
+        tracker = CameraChangeTracker()
+        tracker.update(tracker.parse_json([camera_json("1"), camera_json("2")]))
+        previous = tracker.cameras
+
+        cameras = tracker.parse_json([camera_json("1"), camera_json("2", "2024-10-30T03:00:00.000Z", battery=50)])
+
+        self.assertIs(cameras[0], previous["1"])
+        self.assertIsNot(cameras[1], previous["2"])
+        self.assertEqual(cameras[1].battery, 50)
+
+    def test_parse_json_decodes_renamed_cameras(self):
+        tracker = CameraChangeTracker()
+        tracker.update(tracker.parse_json([camera_json("1")]))
+
+        changes = tracker.update(tracker.parse_json([camera_json("1", name="renamed")]))
+
+        self.assertEqual([change.changes for change in changes], [{"name": ("1", "renamed")}])
@@ -0,0 +1,52 @@
+import unittest
+
+from spypointapi import CameraConfig
+from spypointapi.cameras.camera import TransmitTime
+from spypointapi.cameras.camera_api_response import CameraApiResponse
+from ..camera_for_test import camera
+
+
+class CameraConfigTest(unittest.TestCase):
+
+    def test_changes_only_lists_differing_desired_fields(self):
+        config = CameraConfig(delay=30, quality='high', sensibility='low')
+
+        changes = config.changes(camera(delay=30, quality='medium', sensibility=None))
+
+        self.assertEqual(changes, {'quality': ('medium', 'high'), 'sensibility': (None, 'low')})
+
+    def test_diff_keeps_changed_fields(self):
+        config = CameraConfig(delay=30, quality='high')
+
+        self.assertEqual(config.diff(camera(delay=30, quality='low')), CameraConfig(quality='high'))
+        self.assertTrue(config.diff(camera(delay=30, quality='high')).is_empty)
+
+    def test_merged_overrides_set_fields(self):
+        default = CameraConfig(delay=30, quality='high')
+
+        self.assertEqual(default.merged(CameraConfig(quality='low', multi_shot=2)),
+                         CameraConfig(delay=30, quality='low', multi_shot=2))
+
+    def test_to_json_uses_api_keys(self):
+        config = CameraConfig(capture_mode='photo', multi_shot=2, sensibility='high', transmit_auto=False,
+                              transmit_time=TransmitTime(hour=6, minute=30), trigger_speed='optimal')
+
+        self.assertEqual(config.to_json(), {
+            'captureMode': 'photo',
+            'multiShot': 2,
+            'sensibility': {'level': 'high'},
+            'transmitAuto': False,
+            'transmitTime': {'hour': 6, 'minute': 30},
+            'triggerSpeed': 'optimal',
+        })
+
+    def test_to_json_round_trips_through_camera_api_response(self):
+        config = CameraConfig(capture_mode='video', delay=30, multi_shot=2, quality='high', operation_mode='standard',
+                              sensibility='high', transmit_auto=True, transmit_format='full', transmit_freq=6,
+                              transmit_time=TransmitTime(hour=6, minute=30), trigger_speed='optimal')
+
+        decoded = CameraApiResponse.camera_from_json({
+            'id': '1', 'config': {'name': 'camera', **config.to_json()},
+            'status': {'model': 'model', 'lastUpdate': '2024-10-30T02:03:48.716Z'}})
+
+        self.assertEqual(config.changes(decoded), {})
@@ -0,0 +1,96 @@
+import random
+import unittest
+
+from spypointapi import CameraChange, CameraChangeType, CameraGeoIndex, Coordinates
+from spypointapi.cameras import camera_geo_index
+from spypointapi.cameras.camera_geo_index import haversine, haversine_many
+from ..camera_for_test import camera
+
+
+def located(camera_id, latitude, longitude):
+    return camera(camera_id, coordinates=Coordinates(latitude=latitude, longitude=longitude))
+
+
+class CameraGeoIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = CameraGeoIndex.from_cameras([
+            located('montreal', 45.5017, -73.5673),
+            located('laval', 45.6066, -73.7124),
+            located('quebec', 46.8139, -71.2080),
+            camera('no-gps'),
+        ])
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine(45.5017, -73.5673, 46.8139, -71.2080), 233_000, delta=1_000)
+        self.assertEqual(haversine(45, -73, 45, -73), 0)
+
+    def test_haversine_many_vectorized_matches_scalar(self):
+        latitudes = [random.uniform(-60, 60) for _ in range(300)]
+        longitudes = [random.uniform(-180, 180) for _ in range(300)]
+
+        distances = haversine_many(45, -73, latitudes, longitudes)
+
+        for distance, latitude, longitude in zip(distances, latitudes, longitudes):
+            self.assertAlmostEqual(distance, haversine(45, -73, latitude, longitude), delta=0.01)
+
+    def test_skips_cameras_without_coordinates(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertNotIn('no-gps', self.index)
+
+    def test_within_radius(self):
+        results = self.index.within_radius(45.55, -73.60, 20_000)
+
+        self.assertEqual([camera_id for camera_id, _ in results], ['montreal', 'laval'])
+        self.assertLess(results[0][1], results[1][1])
+
+    def test_within_bbox(self):
+        self.assertEqual(sorted(self.index.within_bbox(45, -74, 46, -73)), ['laval', 'montreal'])
+
+    def test_within_polygon(self):
+        zone = [Coordinates(45.4, -73.7), Coordinates(45.55, -73.7), Coordinates(45.55, -73.4), Coordinates(45.4, -73.4)]
+
+        self.assertEqual(self.index.within_polygon(zone), ['montreal'])
+
+    def test_nearest(self):
+        self.assertEqual([camera_id for camera_id, _ in self.index.nearest(46.5, -71.5, k=2)], ['quebec', 'montreal'])
+        self.assertEqual(len(self.index.nearest(0, 0, k=10)), 3)
+        self.assertEqual(self.index.nearest(0, 0, k=0), [])
+
+    def test_nearest_matches_linear_scan(self):
+        random.seed(1)
+        cameras = [located(str(i), random.uniform(45, 47), random.uniform(-75, -71)) for i in range(500)]
+        index = CameraGeoIndex.from_cameras(cameras, cell_size=0.05)
+
+        for _ in range(20):
+            latitude, longitude = random.uniform(44, 48), random.uniform(-76, -70)
+            expected = sorted(cameras, key=lambda c: haversine(latitude, longitude, c.coordinates.latitude,
+                                                                 c.coordinates.longitude))[:5]
+            self.assertEqual([camera_id for camera_id, _ in index.nearest(latitude, longitude, k=5)],
+                             [c.id for c in expected])
+
+    def test_updates_moved_and_removed_cameras(self):
+        self.index.update(located('laval', 46.81, -71.21))
+        self.index.remove('montreal')
+
+        self.assertEqual(self.index.within_bbox(45, -74, 46, -73), [])
+        self.assertEqual(sorted(self.index.within_radius(46.81, -71.21, 1_000)[i][0] for i in range(2)),
+                         ['laval', 'quebec'])
+
+    def test_applies_camera_changes(self):
+        moved = located('montreal', 46.0, -72.0)
+        self.index.apply_changes([
+            CameraChange(CameraChangeType.CHANGED, moved, {'coordinates': (None, moved.coordinates)}),
+            CameraChange(CameraChangeType.REMOVED, camera('quebec')),
+            CameraChange(CameraChangeType.ADDED, located('sherbrooke', 45.4042, -71.8929)),
+        ])
+
+        self.assertEqual([camera_id for camera_id, _ in self.index.nearest(46.0, -72.0, k=3)],
+                         ['montreal', 'sherbrooke', 'laval'])
+
+    @unittest.skipUnless(camera_geo_index.numpy, 'numpy is not installed')
+    def test_vectorized_radius_query(self):
+        cameras = [located(str(i), 45 + i / 1000, -73) for i in range(1000)]
+        index = CameraGeoIndex.from_cameras(cameras, cell_size=1)
+
+        self.assertEqual(len(index.within_radius(45, -73, 11_200)), 101)
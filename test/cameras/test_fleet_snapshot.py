@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from spypointapi import Coordinates, FleetSnapshot
+from spypointapi.cameras import fleet_snapshot
+from .. import camera_for_test
+
+now = datetime(2024, 10, 30, 12, 0, tzinfo=timezone.utc)
+
+
+def camera(camera_id, battery=None, hours_since_update=1, model='FLEX', coordinates=None, camera_firmware='2.0'):
+    return camera_for_test.camera(camera_id, now - timedelta(hours=hours_since_update), model=model,
+                                  modem_firmware='1.0', camera_firmware=camera_firmware,
+                                  battery=battery, coordinates=coordinates)
+
+
+class FleetSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = FleetSnapshot.from_cameras([
+            camera('1', battery=10),
+            camera('2', battery=80, model='LINK', coordinates=Coordinates(latitude=45.5, longitude=-73.5)),
+            camera('3', battery=15, hours_since_update=30),
+            camera('4'),
+        ], taken_at=now)
+
+    def test_stores_fields_column_wise(self):
+        self.assertEqual(len(self.snapshot), 4)
+        self.assertEqual(list(self.snapshot.column('battery').values), [10, 80, 15, 0])
+        self.assertEqual(self.snapshot.column('battery').validity, bytearray([1, 1, 1, 0]))
+        self.assertEqual(self.snapshot.column('battery')[3], None)
+        self.assertEqual(self.snapshot.column('latitude')[1], 45.5)
+
+    def test_stores_non_integer_temperatures(self):
+        hot = camera('5')
+        hot.temperature = 20.5
+
+        snapshot = FleetSnapshot.from_cameras([hot, camera('6')], taken_at=now)
+
+        self.assertEqual(snapshot.column('temperature')[0], 20.5)
+        self.assertEqual(snapshot.select(snapshot.where('temperature', '>', 20)), ['5'])
+
+    def test_stores_names_and_notifications(self):
+        notified = camera('5')
+        notified.notifications = ['low_battery']
+
+        snapshot = FleetSnapshot.from_cameras([notified, camera('6')], taken_at=now)
+
+        self.assertEqual(snapshot.names, ['5', '6'])
+        self.assertEqual(snapshot.notifications, [('low_battery',), None])
+
+    def test_dictionary_encodes_strings(self):
+        model = self.snapshot.column('model')
+
+        self.assertEqual(model.dictionary, ['FLEX', 'LINK'])
+        self.assertEqual(list(model.codes), [0, 1, 0, 0])
+        self.assertEqual(model[1], 'LINK')
+        self.assertEqual(self.snapshot.column('battery_type')[0], None)
+
+    def test_queries_low_battery_online_cameras(self):
+        low_battery = self.snapshot.where('battery', '<', 20)
+
+        self.assertEqual(self.snapshot.select(low_battery), ['1', '3'])
+        self.assertEqual(self.snapshot.select(FleetSnapshot.all_of(low_battery, self.snapshot.online(now))), ['1'])
+
+    def test_combines_masks(self):
+        offline = FleetSnapshot.negate(self.snapshot.online(now))
+
+        self.assertEqual(self.snapshot.select(offline), ['3'])
+        self.assertEqual(self.snapshot.select(FleetSnapshot.any_of(offline, self.snapshot.is_null('battery'))),
+                         ['3', '4'])
+
+    def test_queries_dictionary_columns(self):
+        self.assertEqual(self.snapshot.select(self.snapshot.where('model', '==', 'LINK')), ['2'])
+        self.assertEqual(self.snapshot.select(self.snapshot.where('model', '!=', 'LINK')), ['1', '3', '4'])
+        self.assertEqual(self.snapshot.select(self.snapshot.where('model', '==', 'unknown')), [])
+
+    def test_orders_dictionary_columns_by_string(self):
+        snapshot = FleetSnapshot.from_cameras([camera(str(index), camera_firmware=firmware)
+                                               for index, firmware in enumerate(['3.0', '1.0', '2.0'])], now)
+
+        self.assertEqual(snapshot.select(snapshot.where('camera_firmware', '<', '2.0')), ['1'])
+        self.assertEqual(snapshot.select(snapshot.where('camera_firmware', '>=', '2.0')), ['0', '2'])
+        numpy = fleet_snapshot.numpy
+        fleet_snapshot.numpy = None
+        try:
+            self.assertEqual(snapshot.select(snapshot.where('camera_firmware', '<', '2.0')), ['1'])
+        finally:
+            fleet_snapshot.numpy = numpy
+
+    def test_queries_without_numpy(self):
+        numpy = fleet_snapshot.numpy
+        fleet_snapshot.numpy = None
+        try:
+            self.assertEqual(self.snapshot.select(self.snapshot.where('battery', '>=', 15)), ['2', '3'])
+        finally:
+            fleet_snapshot.numpy = numpy
+
+    @unittest.skipUnless(fleet_snapshot.numpy, 'numpy is not installed')
+    def test_to_numpy_masks_missing_values(self):
+        battery = self.snapshot.to_numpy('battery')
+
+        self.assertEqual(battery.tolist(), [10, 80, 15, None])
+        self.assertEqual(battery.mean(), 35)
+
+    @unittest.skipUnless(fleet_snapshot.pyarrow, 'pyarrow is not installed')
+    def test_to_arrow(self):
+        table = self.snapshot.to_arrow()
+
+        self.assertEqual(table.column('id').to_pylist(), ['1', '2', '3', '4'])
+        self.assertEqual(table.column('name').to_pylist(), ['1', '2', '3', '4'])
+        self.assertEqual(table.column('notifications').to_pylist(), [None, None, None, None])
+        self.assertEqual(table.column('battery').to_pylist(), [10, 80, 15, None])
+        self.assertEqual(table.column('model').to_pylist(), ['FLEX', 'LINK', 'FLEX', 'FLEX'])
+        self.assertEqual(table.column('last_update_time').to_pylist()[0], now - timedelta(hours=1))
+
+    @unittest.skipUnless(fleet_snapshot.pyarrow, 'pyarrow is not installed')
+    def test_write_parquet(self):
+        import pyarrow.parquet
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fleet.parquet')
+            self.snapshot.write_parquet(path)
+
+            self.assertEqual(pyarrow.parquet.read_table(path).num_rows, 4)
+
+    def test_exports_require_optional_dependencies(self):
+        pyarrow = fleet_snapshot.pyarrow
+        fleet_snapshot.pyarrow = None
+        try:
+            with self.assertRaises(ImportError):
+                self.snapshot.to_arrow()
+        finally:
+            fleet_snapshot.pyarrow = pyarrow
@@ -0,0 +1,49 @@
+import unittest
+from datetime import datetime, timezone
+
+from spypointapi.photos.photo_api_response import PhotoApiResponse
+
+
+class TestPhotoApiResponse(unittest.TestCase):
+
+    def test_parses_json(self):
+        photos = PhotoApiResponse.from_json({
+            "photos": [
+                {
+                    "id": "photo1",
+                    "camera": "camera1",
+                    "date": "2024-10-30T02:03:48.716Z",
+                    "originName": "PICT0001.JPG",
+                    "large": {"host": "s3.amazonaws.com", "path": "/bucket/large/photo1.jpg"},
+                    "hd": {"host": "s3.amazonaws.com", "path": "bucket/hd/photo1.jpg"},
+                    "tag": ["deer"],
+                }
+            ],
+            "countPhotos": 1,
+        })
+
+        self.assertEqual(len(photos), 1)
+        photo = photos[0]
+        self.assertEqual(photo.id, "photo1")
+        self.assertEqual(photo.camera_id, "camera1")
+        self.assertEqual(photo.date, datetime(2024, 10, 30, 2, 3, 48, 716000, timezone.utc))
+        self.assertEqual(photo.name, "PICT0001.JPG")
+        self.assertEqual(photo.url, "https://s3.amazonaws.com/bucket/large/photo1.jpg")
+        self.assertEqual(photo.hd_url, "https://s3.amazonaws.com/bucket/hd/photo1.jpg")
+        self.assertEqual(photo.tags, ["deer"])
+
+    def test_parses_missing_fields(self):
+        photo = PhotoApiResponse.photo_from_json({"id": "photo1", "date": "2024-10-30T02:03:48.716Z"})
+
+        self.assertEqual(photo.url, None)
+        self.assertEqual(photo.hd_url, None)
+        self.assertEqual(photo.name, None)
+        self.assertEqual(photo.tags, None)
+
+    def test_parses_no_photos(self):
+        self.assertEqual(PhotoApiResponse.from_json({}), [])
+
+    def test_formats_date(self):
+        date = datetime(2024, 10, 30, 2, 3, 48, 716000, timezone.utc)
+
+        self.assertEqual(PhotoApiResponse.date_to_json(date), "2024-10-30T02:03:48.716Z")
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from http import HTTPStatus
+
+import aiohttp
+from aioresponses import aioresponses
+
+from spypointapi.photos.photo_download import async_download_to_file, async_download_to_writer
+
+
+class TestPhotoDownload(unittest.IsolatedAsyncioTestCase):
+    url = 'https://s3.amazonaws.com/bucket/photo1.jpg'
+    content = b'\xff\xd8' + b'jpeg' * 1000
+
+    async def test_downloads_to_file(self):
+        with aioresponses() as server, tempfile.TemporaryDirectory() as directory:
+            server.get(self.url, body=self.content)
+            path = os.path.join(directory, 'photo1.jpg')
+
+            async with aiohttp.ClientSession() as session:
+                downloaded = await async_download_to_file(session, self.url, path)
+
+            self.assertTrue(downloaded)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), self.content)
+            self.assertEqual(os.listdir(directory), ['photo1.jpg'])
+
+    async def test_skips_file_with_same_content_hash(self):
+        with aioresponses() as server, tempfile.TemporaryDirectory() as directory:
+            server.get(self.url, status=HTTPStatus.NOT_MODIFIED)
+            path = os.path.join(directory, 'photo1.jpg')
+            with open(path, 'wb') as file:
+                file.write(self.content)
+
+            async with aiohttp.ClientSession() as session:
+                downloaded = await async_download_to_file(session, self.url, path)
+
+            self.assertFalse(downloaded)
+            server.assert_called_with(self.url, 'GET',
+                                      headers={'If-None-Match': f'"{hashlib.md5(self.content).hexdigest()}"'})
+
+    async def test_resumes_partial_download(self):
+        with aioresponses() as server, tempfile.TemporaryDirectory() as directory:
+            server.get(self.url, status=HTTPStatus.PARTIAL_CONTENT, body=self.content[100:])
+            path = os.path.join(directory, 'photo1.jpg')
+            with open(f'{path}.part', 'wb') as file:
+                file.write(self.content[:100])
+            with open(f'{path}.part.validator', 'w') as file:
+                file.write('"v1"')
+
+            async with aiohttp.ClientSession() as session:
+                await async_download_to_file(session, self.url, path)
+
+            server.assert_called_with(self.url, 'GET', headers={'Range': 'bytes=100-', 'If-Range': '"v1"'})
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), self.content)
+            self.assertEqual(os.listdir(directory), ['photo1.jpg'])
+
+    async def test_restarts_partial_download_of_a_changed_photo(self):
+        with aioresponses() as server, tempfile.TemporaryDirectory() as directory:
+            server.get(self.url, body=self.content, headers={'ETag': '"v2"'})
+            path = os.path.join(directory, 'photo1.jpg')
+            with open(f'{path}.part', 'wb') as file:
+                file.write(b'old photo')
+            with open(f'{path}.part.validator', 'w') as file:
+                file.write('"v1"')
+
+            async with aiohttp.ClientSession() as session:
+                await async_download_to_file(session, self.url, path)
+
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), self.content)
+
+    async def test_does_not_resume_without_a_validator(self):
+        with aioresponses() as server, tempfile.TemporaryDirectory() as directory:
+            server.get(self.url, body=self.content)
+            path = os.path.join(directory, 'photo1.jpg')
+            with open(f'{path}.part', 'wb') as file:
+                file.write(b'old photo')
+
+            async with aiohttp.ClientSession() as session:
+                await async_download_to_file(session, self.url, path)
+
+            server.assert_called_with(self.url, 'GET', headers={})
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), self.content)
+
+    async def test_downloads_to_writer(self):
+        with aioresponses() as server:
+            server.get(self.url, body=self.content)
+            chunks = []
+
+            async with aiohttp.ClientSession() as session:
+                await async_download_to_writer(session, self.url, chunks.append)
+
+            self.assertEqual(b''.join(chunks), self.content)
@@ -24,10 +24,10 @@ class SpypointServerForTest:
         self.server.post(f'{self.base_url}/user/login', status=status, payload=body, repeat=repeat)
         return body.get('token')
 
-    def prepare_cameras_response(self, body=None, status=HTTPStatus.OK, repeat=True):
+    def prepare_cameras_response(self, body=None, status=HTTPStatus.OK, repeat=True, headers=None):
         if body is None:
             body = []
-        self.server.get(f'{self.base_url}/camera/all', status=status, payload=body, repeat=repeat)
+        self.server.get(f'{self.base_url}/camera/all', status=status, payload=body, repeat=repeat, headers=headers)
 
     def prepare_shared_cameras_response(self, body=None, status=HTTPStatus.OK, repeat=True):
         if body is None:
@@ -39,10 +39,24 @@ class SpypointServerForTest:
             body = []
         self.server.get(f'{self.base_url}/shared-cameras/{id}', status=status, payload=body, repeat=repeat)
 
+    def prepare_photos_response(self, body=None, status=HTTPStatus.OK, repeat=True):
+        if body is None:
+            body = {'photos': []}
+        self.server.post(f'{self.base_url}/photo/all', status=status, payload=body, repeat=repeat)
+
+    def prepare_camera_config_response(self, id, body=None, status=HTTPStatus.OK, repeat=True, headers=None):
+        if body is None:
+            body = {}
+        self.server.put(f'{self.base_url}/camera/config/{id}', status=status, payload=body, repeat=repeat,
+                        headers=headers)
+
     def assert_called_with(self, url, method, *args, **kwargs):
         self.server.assert_called_with(f'{self.base_url}{url}', method, *args, **kwargs)
 
-    def assert_called_n_times_with(self, times, url, method, headers, json):
+    def assert_called_n_times(self, times, url, method):
         key = (method, URL(f'{self.base_url}{url}'))
-        assert len(self.server.requests[key]) == times
+        assert len(self.server.requests.get(key, [])) == times
+
+    def assert_called_n_times_with(self, times, url, method, headers, json):
+        self.assert_called_n_times(times, url, method)
         self.assert_called_with(url, method, headers=headers, json=json)
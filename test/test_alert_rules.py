@@ -0,0 +1,166 @@
+import unittest
+from datetime import timedelta
+
+from spypointapi import Alert, AlertEngine, FleetSnapshot, NewItemsRule, OfflineRule, ThresholdRule
+from spypointapi.cameras.camera_changes import CameraChangeTracker
+from .camera_for_test import REPORTED_AT as NOW, camera
+
+
+class TestAlertEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = CameraChangeTracker()
+
+    def poll(self, engine, cameras, now=NOW):
+        return engine.evaluate_changes(self.tracker.update(cameras), now)
+
+    def test_fires_once_and_resolves(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20)])
+
+        self.assertEqual(self.poll(engine, [camera("1", battery=15), camera("2", battery=80)]),
+                         [Alert('low_battery', '1', True, 15)])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=1), battery=12),
+                                            camera("2", battery=80)]), [])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=2), battery=90),
+                                            camera("2", battery=80)]),
+                         [Alert('low_battery', '1', False, 90)])
+        self.assertFalse(engine.is_firing('low_battery', '1'))
+
+    def test_hysteresis_holds_until_clear_threshold(self):
+        engine = AlertEngine([ThresholdRule('memory_full', 'memory', '>=', 90, clear_threshold=80)])
+
+        self.poll(engine, [camera("1", memory=95)])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=1), memory=85)]), [])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=2), memory=70)]),
+                         [Alert('memory_full', '1', False, 70)])
+
+    def test_debounce_needs_consecutive_reports(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20, debounce=2)])
+
+        self.assertEqual(self.poll(engine, [camera("1", battery=15)]), [])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=1), battery=50)]), [])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=2), battery=15)]), [])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=3), battery=15)]),
+                         [Alert('low_battery', '1', True, 15)])
+
+    def test_unknown_value_keeps_state(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20)])
+
+        self.poll(engine, [camera("1", battery=15)])
+
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=1))]), [])
+        self.assertTrue(engine.is_firing('low_battery', '1'))
+
+    def test_unchanged_cameras_are_not_evaluated(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20, debounce=2)])
+
+        self.poll(engine, [camera("1", battery=15)])
+
+        self.assertEqual(self.poll(engine, [camera("1", battery=15)]), [])
+        self.assertFalse(engine.is_firing('low_battery', '1'))
+
+    def test_offline_fires_when_deadline_passes(self):
+        engine = AlertEngine([OfflineRule()])
+
+        self.assertEqual(self.poll(engine, [camera("1"), camera("2", NOW - timedelta(hours=25))]),
+                         [Alert('offline', '2', True, NOW - timedelta(hours=25))])
+        self.assertEqual(self.poll(engine, [camera("1"), camera("2", NOW - timedelta(hours=25))],
+                                   NOW + timedelta(hours=23)), [])
+        self.assertEqual(self.poll(engine, [camera("1"), camera("2", NOW - timedelta(hours=25))],
+                                   NOW + timedelta(hours=25)),
+                         [Alert('offline', '1', True, NOW)])
+
+    def test_offline_deadlines_stay_one_per_camera(self):
+        engine = AlertEngine([OfflineRule()])
+
+        for hour in range(50):
+            self.poll(engine, [camera(str(i), NOW + timedelta(hours=hour)) for i in range(10)],
+                      NOW + timedelta(hours=hour))
+
+        self.assertLessEqual(len(engine._deadlines), 20)
+        self.assertEqual(self.poll(engine, [camera(str(i), NOW + timedelta(hours=49)) for i in range(10)],
+                                   NOW + timedelta(hours=74)),
+                         [Alert('offline', str(i), True, NOW + timedelta(hours=49)) for i in range(10)])
+
+    def test_offline_resolves_on_new_report(self):
+        engine = AlertEngine([OfflineRule()])
+        self.poll(engine, [camera("1", NOW - timedelta(hours=25))])
+
+        alerts = self.poll(engine, [camera("1", NOW)], NOW + timedelta(minutes=1))
+
+        self.assertEqual(alerts, [Alert('offline', '1', False, NOW)])
+
+    def test_new_notifications_fire_once(self):
+        engine = AlertEngine([NewItemsRule()])
+
+        self.assertEqual(self.poll(engine, [camera("1", notifications=["low_battery"])]),
+                         [Alert('new_notifications', '1', True, ["low_battery"])])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=1),
+                                                   notifications=["low_battery", "sd_card_full"])]),
+                         [Alert('new_notifications', '1', True, ["sd_card_full"])])
+        self.assertEqual(self.poll(engine, [camera("1", NOW + timedelta(hours=2),
+                                                   notifications=["sd_card_full"])]), [])
+
+    def test_removed_camera_resolves_its_alerts(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20), OfflineRule()])
+        self.poll(engine, [camera("1", NOW - timedelta(hours=25), battery=15), camera("2")])
+
+        alerts = self.poll(engine, [camera("2")], NOW + timedelta(hours=30))
+
+        self.assertEqual(sorted(alerts, key=lambda alert: alert.rule),
+                         [Alert('low_battery', '1', False, 15),
+                          Alert('offline', '1', False, NOW - timedelta(hours=25)),
+                          Alert('offline', '2', True, NOW)])
+
+    def test_rejects_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            AlertEngine([ThresholdRule('low_battery', 'batery', '<', 20)])
+        with self.assertRaises(ValueError):
+            AlertEngine([ThresholdRule('low_battery', 'battery', '~', 20)])
+        with self.assertRaises(ValueError):
+            AlertEngine([OfflineRule(), OfflineRule()])
+
+
+class TestAlertEngineSnapshot(unittest.TestCase):
+
+    def test_snapshot_matches_incremental_state(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20, clear_threshold=30),
+                              OfflineRule()])
+        cameras = [camera("1", battery=15), camera("2", battery=80),
+                   camera("3", NOW - timedelta(hours=25)), camera("4", battery=25)]
+
+        alerts = engine.evaluate_snapshot(FleetSnapshot.from_cameras(cameras, NOW))
+
+        self.assertEqual(alerts, [Alert('low_battery', '1', True, 15),
+                                  Alert('offline', '3', True, NOW - timedelta(hours=25))])
+        self.assertEqual(engine.evaluate_snapshot(FleetSnapshot.from_cameras(cameras, NOW)), [])
+
+        cameras = [camera("1", battery=25), camera("2", battery=80), camera("3", NOW), camera("4", battery=25)]
+        self.assertEqual(engine.evaluate_snapshot(FleetSnapshot.from_cameras(cameras, NOW)),
+                         [Alert('offline', '3', False, NOW)])
+        self.assertTrue(engine.is_firing('low_battery', '1'))
+
+    def test_snapshot_debounce(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20, debounce=2)])
+        low = FleetSnapshot.from_cameras([camera("1", battery=15)], NOW)
+        high = FleetSnapshot.from_cameras([camera("1", battery=50)], NOW)
+
+        self.assertEqual(engine.evaluate_snapshot(low), [])
+        self.assertEqual(engine.evaluate_snapshot(high), [])
+        self.assertEqual(engine.evaluate_snapshot(low), [])
+        self.assertEqual(engine.evaluate_snapshot(low), [Alert('low_battery', '1', True, 15)])
+
+    def test_snapshot_new_notifications_fire_once(self):
+        engine = AlertEngine([NewItemsRule()])
+
+        self.assertEqual(engine.evaluate_snapshot(FleetSnapshot.from_cameras(
+            [camera("1", notifications=["low_battery"]), camera("2")], NOW)),
+            [Alert('new_notifications', '1', True, ["low_battery"])])
+        self.assertEqual(engine.evaluate_snapshot(FleetSnapshot.from_cameras(
+            [camera("1", notifications=["low_battery", "sd_card_full"]), camera("2")], NOW)),
+            [Alert('new_notifications', '1', True, ["sd_card_full"])])
+
+    def test_snapshot_of_empty_fleet(self):
+        engine = AlertEngine([ThresholdRule('low_battery', 'battery', '<', 20), OfflineRule()])
+
+        self.assertEqual(engine.evaluate_snapshot(FleetSnapshot(NOW)), [])
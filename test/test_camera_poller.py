@@ -0,0 +1,218 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import aiohttp
+
+from spypointapi import CameraChangeType, CameraPoller, SharedFleetPublisher, SharedFleetReader, SpypointApi
+from spypointapi.camera_poller import next_expected_report
+from spypointapi.cameras.camera import TransmitTime
+from . import camera_for_test
+from .spypoint_server_for_test import SpypointServerForTest
+
+
+def camera(last_update_time, transmit_freq=None, transmit_time=None, transmit_auto=None):
+    return camera_for_test.camera('id', last_update_time, transmit_freq=transmit_freq,
+                                  transmit_time=transmit_time, transmit_auto=transmit_auto)
+
+
+def camera_json(camera_id, last_update):
+    return {"id": camera_id, "config": {"name": camera_id, "transmitFreq": 6, "transmitAuto": False,
+                                        "transmitTime": {"hour": 6, "minute": 0}},
+            "status": {"model": "model", "lastUpdate": last_update}}
+
+
+class TestNextExpectedReport(unittest.TestCase):
+    today = datetime.now().astimezone().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def test_next_report_follows_transmit_time_and_frequency(self):
+        report = next_expected_report(camera(self.today.replace(hour=6, minute=2), 6, TransmitTime(6, 0)),
+                                      self.today.replace(hour=7), timedelta(hours=1))
+
+        self.assertEqual(report, self.today.replace(hour=12))
+
+    def test_next_report_before_first_transmit_time(self):
+        report = next_expected_report(camera(self.today.replace(hour=3), 12, TransmitTime(6, 30)),
+                                      self.today.replace(hour=4), timedelta(hours=1))
+
+        self.assertEqual(report, self.today.replace(hour=6, minute=30))
+
+    def test_next_report_skips_missed_reports(self):
+        report = next_expected_report(camera(self.today.replace(hour=6), 6, TransmitTime(6, 0)),
+                                      self.today.replace(hour=19), timedelta(hours=1))
+
+        self.assertEqual(report, self.today + timedelta(days=1))
+
+    def test_next_report_uses_default_interval_when_not_scheduled(self):
+        now = self.today.replace(hour=8)
+
+        self.assertEqual(next_expected_report(camera(self.today, 0, TransmitTime(6, 0)), now, timedelta(hours=1)),
+                         now + timedelta(hours=1))
+        self.assertEqual(next_expected_report(camera(self.today, 6, TransmitTime(6, 0), transmit_auto=True), now,
+                                              timedelta(hours=1)),
+                         now + timedelta(hours=1))
+
+
+class TestCameraPoller(unittest.IsolatedAsyncioTestCase):
+
+    async def test_polls_only_cameras_due_for_a_report(self):
+        with SpypointServerForTest() as server:
+            now = datetime.now().astimezone().replace(minute=0, second=0, microsecond=0)
+            last_update = now.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            server.prepare_login_response()
+            server.prepare_cameras_response([camera_json("own", last_update)])
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "shared"}]}])
+            server.prepare_shared_camera_response("shared", camera_json("shared", last_update))
+
+            changes = []
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session), callback=changes.append,
+                                      report_margin=timedelta(minutes=5))
+
+                next_poll = await poller.async_poll(now)
+
+                self.assertEqual([(change.type, change.camera.id) for change in changes],
+                                 [(CameraChangeType.ADDED, "own"), (CameraChangeType.ADDED, "shared")])
+                self.assertGreater(next_poll, now)
+                self.assertEqual(poller.next_polls["shared"], next_poll)
+
+                poller.next_polls["own"] = now + timedelta(days=1)
+                await poller.async_poll(next_poll)
+
+                server.assert_called_n_times(2, url='/shared-cameras/shared', method='GET')
+                server.assert_called_n_times(1, url='/camera/all', method='GET')
+                server.assert_called_n_times(1, url='/shared-cameras/all', method='GET')
+
+    async def test_drops_cameras_no_longer_shared(self):
+        with SpypointServerForTest() as server:
+            now = datetime.now().astimezone()
+            server.prepare_login_response()
+            server.prepare_cameras_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "shared"}]}], repeat=False)
+            server.prepare_shared_cameras_response()
+            server.prepare_shared_camera_response("shared", camera_json("shared", "2024-10-30T02:03:48.716Z"),
+                                                  repeat=False)
+            server.prepare_shared_camera_response("shared", status=HTTPStatus.FORBIDDEN)
+
+            changes = []
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session), callback=changes.append)
+                await poller.async_poll(now)
+                poller.next_polls["shared"] = now
+
+                await poller.async_poll(now)
+
+            self.assertEqual([(change.type, change.camera.id) for change in changes],
+                             [(CameraChangeType.ADDED, "shared"), (CameraChangeType.REMOVED, "shared")])
+            self.assertEqual(poller.next_polls, {})
+
+    async def test_keeps_cameras_that_failed_to_fetch_with_partial_results(self):
+        with SpypointServerForTest() as server:
+            now = datetime.now().astimezone()
+            server.prepare_login_response()
+            server.prepare_cameras_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "shared"}]}])
+            server.prepare_shared_camera_response("shared", camera_json("shared", "2024-10-30T02:03:48.716Z"),
+                                                  repeat=False)
+            server.prepare_shared_camera_response("shared", status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+            changes = []
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session, partial_results=True),
+                                      callback=changes.append, error_interval=timedelta(minutes=5))
+                await poller.async_poll(now)
+                poller.next_polls["shared"] = now
+
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    await poller.async_poll(now)
+
+            self.assertEqual([change.type for change in changes], [CameraChangeType.ADDED])
+            self.assertEqual(poller.next_polls["shared"], now + timedelta(minutes=5))
+
+    async def test_publishes_the_fleet_for_other_processes(self):
+        with SpypointServerForTest() as server, tempfile.TemporaryDirectory() as directory:
+            now = datetime.now().astimezone()
+            server.prepare_login_response()
+            server.prepare_cameras_response([camera_json("own", "2024-10-30T02:03:48.716Z")])
+            server.prepare_shared_cameras_response()
+            path = os.path.join(directory, 'fleet')
+
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session),
+                                      publisher=SharedFleetPublisher(path))
+                await poller.async_poll(now)
+
+            reader = SharedFleetReader(path)
+            self.assertTrue(reader.refresh())
+            self.assertEqual(list(reader.snapshot.ids), ["own"])
+
+    async def test_publish_failure_keeps_changes_and_poll(self):
+        with SpypointServerForTest() as server, tempfile.TemporaryDirectory() as directory:
+            now = datetime.now().astimezone()
+            server.prepare_login_response()
+            server.prepare_cameras_response([camera_json("own", "2024-10-30T02:03:48.716Z")])
+            server.prepare_shared_cameras_response()
+
+            changes = []
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session), callback=changes.append,
+                                      error_interval=timedelta(minutes=5),
+                                      publisher=SharedFleetPublisher(os.path.join(directory, 'missing', 'fleet')))
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    next_poll = await poller.async_poll(now)
+
+            self.assertEqual([change.camera.id for change in changes], ["own"])
+            self.assertNotEqual(next_poll, now + timedelta(minutes=5))
+
+    async def test_retries_a_failed_publish_without_changes(self):
+        with SpypointServerForTest() as server, tempfile.TemporaryDirectory() as directory:
+            now = datetime.now().astimezone()
+            server.prepare_login_response()
+            server.prepare_cameras_response([camera_json("own", "2024-10-30T02:03:48.716Z")])
+            server.prepare_shared_cameras_response()
+            path = os.path.join(directory, 'missing', 'fleet')
+
+            changes = []
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session), callback=changes.append,
+                                      publisher=SharedFleetPublisher(path))
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    await poller.async_poll(now)
+                os.mkdir(os.path.dirname(path))
+                poller.next_polls["own"] = now
+
+                await poller.async_poll(now)
+
+            self.assertEqual(len(changes), 1)
+            reader = SharedFleetReader(path)
+            self.assertTrue(reader.refresh())
+            self.assertEqual(list(reader.snapshot.ids), ["own"])
+
+    async def test_backs_off_offline_cameras(self):
+        with SpypointServerForTest() as server:
+            now = datetime.now().astimezone()
+            server.prepare_login_response()
+            server.prepare_cameras_response([camera_json("own", "2024-10-30T02:03:48.716Z")])
+            server.prepare_shared_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session),
+                                      offline_interval=timedelta(hours=6))
+                await poller.async_poll(now)
+
+                self.assertEqual(poller.next_polls["own"], now + timedelta(hours=6))
+
+    async def test_retries_later_on_error(self):
+        with SpypointServerForTest() as server:
+            now = datetime.now().astimezone()
+            server.prepare_login_response(status=503)
+
+            async with aiohttp.ClientSession() as session:
+                poller = CameraPoller(SpypointApi('username', 'password', session),
+                                      error_interval=timedelta(minutes=5))
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    next_poll = await poller.async_poll(now)
+
+                self.assertEqual(next_poll, now + timedelta(minutes=5))
@@ -0,0 +1,102 @@
+import unittest
+from http import HTTPStatus
+
+import aiohttp
+
+from spypointapi import CameraConfig, ConfigReconciler, RetryPolicy, SpypointApi
+from spypointapi.config_reconciler import ReconcileStatus
+from .camera_for_test import camera
+from .spypoint_server_for_test import SpypointServerForTest
+
+
+class TestConfigReconciler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_sends_one_request_with_changed_fields_per_camera(self):
+        with SpypointServerForTest() as server:
+            token = server.prepare_login_response()
+            server.prepare_camera_config_response('1')
+
+            async with aiohttp.ClientSession() as session:
+                reconciler = ConfigReconciler(SpypointApi('username', 'password', session))
+                cameras = [camera('1', delay=10, quality='low'), camera('2', delay=30, quality='high')]
+
+                results = await reconciler.async_reconcile(default=CameraConfig(delay=30, quality='high'),
+                                                           cameras=cameras)
+
+                server.assert_called_n_times(1, '/camera/config/1', 'PUT')
+                server.assert_called_with('/camera/config/1', 'PUT',
+                                          headers={'Content-Type': 'application/json',
+                                                   'Authorization': f'Bearer {token}'},
+                                          json={'delay': 30, 'quality': 'high'})
+                self.assertEqual([(result.camera_id, result.status) for result in results],
+                                 [('1', ReconcileStatus.UPDATED), ('2', ReconcileStatus.UNCHANGED)])
+                self.assertEqual(results[0].changes, {'delay': (10, 30), 'quality': ('low', 'high')})
+
+    async def test_per_camera_config_overrides_default(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_camera_config_response('2')
+
+            async with aiohttp.ClientSession() as session:
+                reconciler = ConfigReconciler(SpypointApi('username', 'password', session))
+                cameras = [camera('1', delay=30), camera('2', delay=30)]
+
+                results = await reconciler.async_reconcile({'2': CameraConfig(delay=60), 'unknown': CameraConfig()},
+                                                           default=CameraConfig(delay=30), cameras=cameras)
+
+                self.assertEqual([(result.camera_id, result.status) for result in results],
+                                 [('1', ReconcileStatus.UNCHANGED), ('2', ReconcileStatus.UPDATED),
+                                  ('unknown', ReconcileStatus.NOT_FOUND)])
+
+    async def test_retries_and_reports_failures(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_camera_config_response('1', status=HTTPStatus.TOO_MANY_REQUESTS, repeat=False,
+                                                  headers={'Retry-After': '0'})
+            server.prepare_camera_config_response('1')
+            server.prepare_camera_config_response('2', status=HTTPStatus.BAD_REQUEST)
+
+            async with aiohttp.ClientSession() as session:
+                reconciler = ConfigReconciler(SpypointApi('username', 'password', session),
+                                              retry_policy=RetryPolicy(backoff_base=0))
+                cameras = [camera('1', delay=10), camera('2', delay=10)]
+
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    results = await reconciler.async_reconcile(default=CameraConfig(delay=30), cameras=cameras)
+
+                self.assertEqual([(result.status, result.attempts) for result in results],
+                                 [(ReconcileStatus.UPDATED, 2), (ReconcileStatus.FAILED, 1)])
+                self.assertEqual(results[1].error.status, HTTPStatus.BAD_REQUEST)
+
+    async def test_api_retry_policy_does_not_retry_config_updates(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_camera_config_response('1', status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi('username', 'password', session,
+                                  retry_policy=RetryPolicy(max_retries=2, backoff_base=0))
+                reconciler = ConfigReconciler(api, retry_policy=RetryPolicy(max_retries=1, backoff_base=0))
+
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    results = await reconciler.async_reconcile(default=CameraConfig(delay=30),
+                                                               cameras=[camera('1', delay=10)])
+
+                self.assertEqual(results[0].attempts, 2)
+                server.assert_called_n_times(2, '/camera/config/1', 'PUT')
+
+    async def test_fetches_cameras_when_not_given(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response([{"id": "1", "config": {"name": "camera 1", "delay": 10},
+                                              "status": {"model": "model",
+                                                         "lastUpdate": "2024-10-30T02:03:48.716Z"}}])
+            server.prepare_shared_cameras_response()
+            server.prepare_camera_config_response('1')
+
+            async with aiohttp.ClientSession() as session:
+                reconciler = ConfigReconciler(SpypointApi('username', 'password', session))
+
+                results = await reconciler.async_reconcile({'1': CameraConfig(delay=30)})
+
+                self.assertEqual(results[0].status, ReconcileStatus.UPDATED)
@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+
+import aiohttp
+import jwt
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from spypointapi import ConnectionMetrics, SpypointApi, SpypointApiError
+
+
+class TestConnectionMetrics(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        async def login(request):
+            return web.json_response({'token': jwt.encode({'exp': 4102444800}, 'secret')})
+
+        async def cameras(request):
+            return web.json_response([])
+
+        async def shared_cameras(request):
+            # large enough not to be read along with the headers
+            return web.json_response({'error': 'x' * 1024 * 1024}, status=503)
+
+        app = web.Application()
+        app.router.add_post('/user/login', login)
+        app.router.add_get('/camera/all', cameras)
+        app.router.add_get('/shared-cameras/all', shared_cameras)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def api(self, session):
+        api = SpypointApi('username', 'password', session)
+        api.base_url = str(self.server.make_url('')).rstrip('/')
+        return api
+
+    async def test_counts_created_and_reused_connections(self):
+        metrics = ConnectionMetrics()
+
+        async with aiohttp.ClientSession(trace_configs=[metrics.trace_config()]) as session:
+            api = self.api(session)
+            for _ in range(3):
+                await api.async_get_own_cameras()
+
+            self.assertEqual(metrics.created, 1)
+            self.assertEqual(metrics.reused, 3)
+            self.assertEqual(metrics.acquired, 4)
+            self.assertEqual(metrics.in_use, 0)
+
+    async def test_releases_connection_on_error(self):
+        metrics = ConnectionMetrics()
+        # a single connection, a request that kept it would block the next one
+        connector = aiohttp.TCPConnector(limit=1)
+
+        async with aiohttp.ClientSession(connector=connector, trace_configs=[metrics.trace_config()]) as session:
+            api = self.api(session)
+            for _ in range(3):
+                with self.assertRaises(SpypointApiError):
+                    await asyncio.wait_for(api.async_get_shared_cameras(), 1)
+
+            self.assertEqual(metrics.in_use, 0)
+
+    async def test_counts_connections_in_use_until_the_request_ends(self):
+        metrics = ConnectionMetrics()
+
+        async with aiohttp.ClientSession(trace_configs=[metrics.trace_config()]) as session:
+            api = self.api(session)
+            await api.async_authenticate()
+            acquired = metrics.acquired
+            request = asyncio.create_task(api.async_get_own_cameras())
+            while metrics.acquired == acquired:
+                await asyncio.sleep(0)
+
+            self.assertEqual(metrics.in_use, 1)
+            await request
+            self.assertEqual(metrics.in_use, 0)
@@ -0,0 +1,59 @@
+import asyncio
+import unittest
+
+from spypointapi.fair_scheduler import FairScheduler
+
+
+class TestFairScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_grants_slots_round_robin_across_keys(self):
+        scheduler = FairScheduler(max_concurrency=1)
+        order = []
+
+        async def request(key, name):
+            async with scheduler.slot(key):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async with scheduler.slot('blocker'):
+            tasks = [asyncio.create_task(request('a', 'a1')),
+                     asyncio.create_task(request('a', 'a2')),
+                     asyncio.create_task(request('a', 'a3')),
+                     asyncio.create_task(request('b', 'b1'))]
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(order, ['a1', 'b1', 'a2', 'a3'])
+        self.assertEqual(scheduler.in_use, 0)
+
+    async def test_limits_concurrency(self):
+        scheduler = FairScheduler(max_concurrency=2)
+        in_flight = []
+        max_in_flight = []
+
+        async def request(key):
+            async with scheduler.slot(key):
+                in_flight.append(key)
+                max_in_flight.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.remove(key)
+
+        await asyncio.gather(*[request(key) for key in 'abcdef'])
+
+        self.assertEqual(max(max_in_flight), 2)
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        scheduler = FairScheduler(max_concurrency=1)
+
+        async def request():
+            async with scheduler.slot('a'):
+                pass
+
+        async with scheduler.slot('blocker'):
+            task = asyncio.create_task(request())
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        await request()
+        self.assertEqual(scheduler.in_use, 0)
@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from datetime import timedelta
+
+import aiohttp
+from aiohttp.test_utils import TestServer
+
+from benchmarks.fake_spypoint_server import FakeSpypointServer
+from spypointapi import RetryPolicy, SpypointApi
+
+
+class TestFakeSpypointServer(unittest.IsolatedAsyncioTestCase):
+
+    async def start(self, fake: FakeSpypointServer):
+        self.fake = fake
+        self.server = TestServer(fake.app())
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    def api(self, **options):
+        api = SpypointApi('username', 'password', self.session, **options)
+        api.base_url = str(self.server.make_url('/api/v3'))
+        return api
+
+    async def test_serves_own_and_shared_cameras(self):
+        await self.start(FakeSpypointServer(cameras=3, shared_cameras=2))
+
+        cameras = await self.api().async_get_cameras()
+
+        self.assertEqual(sorted(camera.id for camera in cameras), ['0', '1', '2', 'shared0', 'shared1'])
+        self.assertEqual(self.fake.requests['/api/v3/user/login'], 1)
+        self.assertEqual(self.fake.requests['/api/v3/shared-cameras/{camera_id}'], 2)
+
+    async def test_logs_in_again_when_token_expires(self):
+        await self.start(FakeSpypointServer(cameras=1, token_lifetime=0.5))
+        api = self.api(token_refresh_skew=timedelta(0))
+
+        await api.async_get_own_cameras()
+        await asyncio.sleep(1)
+        await api.async_get_own_cameras()
+
+        self.assertEqual(self.fake.requests['/api/v3/user/login'], 2)
+
+    async def test_retries_injected_throttling(self):
+        await self.start(FakeSpypointServer(cameras=1, throttle_rate=0.5, retry_after=0, seed=1))
+        api = self.api(retry_policy=RetryPolicy(max_retries=10, backoff_base=0, backoff_max=0))
+
+        for _ in range(5):
+            self.assertEqual(len(await api.async_get_own_cameras()), 1)
+
+        self.assertGreater(api.request_stats.throttles, 0)
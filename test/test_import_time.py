@@ -0,0 +1,28 @@
+import unittest
+
+from benchmarks.import_time import import_times
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_package_import_does_not_load_aiohttp(self):
+        for statement in ('import spypointapi', 'from spypointapi import Camera, FleetSnapshot'):
+            modules = import_times(statement)
+
+            self.assertNotIn('aiohttp', modules, statement)
+            self.assertNotIn('jwt', modules, statement)
+
+    def test_api_import_does_not_load_jwt(self):
+        modules = import_times('from spypointapi import SpypointApi')
+
+        self.assertIn('aiohttp', modules)
+        self.assertNotIn('jwt', modules)
+
+    def test_lazy_symbols_resolve(self):
+        import spypointapi
+
+        for name in spypointapi.__all__:
+            self.assertEqual(getattr(spypointapi, name).__name__, name)
+        self.assertIn('SpypointApi', dir(spypointapi))
+        with self.assertRaises(AttributeError):
+            _ = spypointapi.Unknown
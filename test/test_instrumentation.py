@@ -0,0 +1,117 @@
+import unittest
+from http import HTTPStatus
+
+import aiohttp
+import jwt
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from spypointapi import ResponseCache, SpypointApi
+from spypointapi.instrumentation import RequestTimings, endpoint, trace_config
+from .spypoint_server_for_test import SpypointServerForTest
+
+
+class RecordingObserver:
+
+    def __init__(self):
+        self.requests = []
+        self.decodes = []
+        self.events = []
+
+    def on_request(self, timings: RequestTimings) -> None:
+        self.requests.append(timings)
+
+    def on_decode(self, endpoint: str, body_size: int, decode: float, parse: float) -> None:
+        self.decodes.append((endpoint, body_size, decode, parse))
+
+    def on_event(self, event: str, endpoint: str | None = None) -> None:
+        self.events.append((event, endpoint))
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+
+    def test_endpoint_groups_shared_cameras(self):
+        self.assertEqual(endpoint('/shared-cameras/abc'), '/shared-cameras/{camera_id}')
+        self.assertEqual(endpoint('/shared-cameras/all'), '/shared-cameras/all')
+        self.assertEqual(endpoint('/camera/all'), '/camera/all')
+
+    def test_endpoint_groups_urls_by_template(self):
+        templates = SpypointApi.endpoint_templates
+
+        self.assertEqual(endpoint('/camera/config/abc', templates), '/camera/config/{camera_id}')
+        self.assertEqual(endpoint('/shared-cameras/abc', templates), '/shared-cameras/{camera_id}')
+        self.assertEqual(endpoint('/camera/all', templates), '/camera/all')
+
+    async def test_reports_requests_decoding_and_login(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response({'token': jwt.encode({'exp': 4102444800}, 'secret')})
+            server.prepare_cameras_response([])
+            server.prepare_shared_cameras_response([{'sharedCameras': [{'cameraId': 'abc'}]}])
+            server.prepare_shared_camera_response('abc', {'config': {'name': 'camera'},
+                                                                'status': {'model': 'model', 'lastUpdate': '2024-10-30T02:03:48.716Z'}})
+
+            async with aiohttp.ClientSession() as session:
+                observer = RecordingObserver()
+                api = SpypointApi('username', 'password', session, observer=observer)
+                await api.async_get_cameras()
+
+                self.assertEqual(sorted((timings.method, timings.endpoint, timings.status)
+                                        for timings in observer.requests),
+                                 [('GET', '/camera/all', 200),
+                                  ('GET', '/shared-cameras/all', 200),
+                                  ('GET', '/shared-cameras/{camera_id}', 200),
+                                  ('POST', '/user/login', 200)])
+                self.assertTrue(all(timings.ttfb >= 0 for timings in observer.requests))
+                self.assertEqual(sorted(decode[0] for decode in observer.decodes),
+                                 ['/camera/all', '/shared-cameras/all', '/shared-cameras/{camera_id}'])
+                self.assertEqual(observer.events, [('login', '/user/login')])
+
+    async def test_counts_unauthorized_responses(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response({'token': jwt.encode({'exp': 4102444800}, 'secret')})
+            server.prepare_cameras_response(status=HTTPStatus.UNAUTHORIZED, repeat=False)
+            server.prepare_cameras_response([])
+
+            async with aiohttp.ClientSession() as session:
+                observer = RecordingObserver()
+                api = SpypointApi('username', 'password', session, observer=observer)
+                await api.async_get_own_cameras()
+
+                self.assertEqual(observer.events, [('login', '/user/login'),
+                                                   ('unauthorized', '/camera/all'),
+                                                   ('login', '/user/login')])
+
+    async def test_counts_cache_hits(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response({'token': jwt.encode({'exp': 4102444800}, 'secret')})
+            server.prepare_cameras_response([])
+
+            async with aiohttp.ClientSession() as session:
+                observer = RecordingObserver()
+                api = SpypointApi('username', 'password', session, cache=ResponseCache(), observer=observer)
+                await api.async_get_own_cameras()
+                await api.async_get_own_cameras()
+
+                self.assertEqual(observer.events, [('login', '/user/login'), ('cache_hit', '/camera/all')])
+                self.assertEqual(len(observer.decodes), 1)
+
+    async def test_trace_config_times_connection(self):
+        async def login(request):
+            return web.json_response({'token': jwt.encode({'exp': 4102444800}, 'secret')})
+
+        app = web.Application()
+        app.router.add_post('/user/login', login)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            async with aiohttp.ClientSession(trace_configs=[trace_config()]) as session:
+                observer = RecordingObserver()
+                api = SpypointApi('username', 'password', session, observer=observer)
+                api.base_url = str(server.make_url('')).rstrip('/')
+                await api.async_authenticate()
+
+                [timings] = observer.requests
+                self.assertGreaterEqual(timings.connect, 0)
+                self.assertGreaterEqual(timings.ttfb, timings.connect)
+        finally:
+            await server.close()
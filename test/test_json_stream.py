@@ -0,0 +1,41 @@
+import json
+import unittest
+
+from spypointapi.json_stream import async_iter_json_array, iter_json_array
+
+
+async def chunked(raw: bytes, size: int):
+    for i in range(0, len(raw), size):
+        yield raw[i:i + size]
+
+
+class TestJsonStream(unittest.IsolatedAsyncioTestCase):
+
+    async def test_yields_array_elements(self):
+        data = [{"id": "1", "name": "caméra"}, {"id": "2", "values": [1, 2, {"a": "]"}]}, 12345, "text", None]
+        raw = json.dumps(data, ensure_ascii=False).encode()
+
+        for size in (1, 3, 7, len(raw)):
+            elements = [element async for element in async_iter_json_array(chunked(raw, size))]
+            self.assertEqual(elements, data)
+
+    async def test_yields_nothing_for_empty_array(self):
+        elements = [element async for element in async_iter_json_array(chunked(b' [ ] ', 1))]
+
+        self.assertEqual(elements, [])
+
+    async def test_raises_on_truncated_array(self):
+        with self.assertRaises(ValueError):
+            _ = [element async for element in async_iter_json_array(chunked(b'[{"id": "1"}, {"id"', 4))]
+
+    async def test_raises_when_not_an_array(self):
+        with self.assertRaises(ValueError):
+            _ = [element async for element in async_iter_json_array(chunked(b'{"id": "1"}', 4))]
+
+    def test_iter_json_array(self):
+        data = [{"id": "1", "name": "caméra"}, [1, 2], 3.5]
+
+        self.assertEqual(list(iter_json_array(json.dumps(data, ensure_ascii=False).encode())), data)
+
+        with self.assertRaises(ValueError):
+            list(iter_json_array(b'[1, 2'))
@@ -0,0 +1,19 @@
+import unittest
+
+import jwt
+
+from spypointapi.jwt_claims import decode_unverified_claims
+
+
+class TestJwtClaims(unittest.TestCase):
+
+    def test_decodes_claims_without_verifying_signature(self):
+        for claims in ({'exp': 1627417600}, {'exp': 1627417600, 'sub': 'user'}, {'exp': 1, 'a': 'ab'}):
+            token = jwt.encode(claims, 'secret')
+
+            self.assertEqual(decode_unverified_claims(token), claims)
+
+    def test_raises_on_invalid_token(self):
+        for token in ('', 'not-a-jwt', 'a.!!!.c', 'a.W10.c'):
+            with self.assertRaises(ValueError):
+                decode_unverified_claims(token)
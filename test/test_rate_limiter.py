@@ -0,0 +1,62 @@
+import asyncio
+import time
+import unittest
+
+from spypointapi import AdaptiveRateLimiter
+
+
+class TestAdaptiveRateLimiter(unittest.IsolatedAsyncioTestCase):
+
+    async def test_limits_request_rate_after_burst(self):
+        limiter = AdaptiveRateLimiter(rate=100, burst=5)
+
+        start = time.monotonic()
+        for _ in range(10):
+            async with limiter.slot():
+                pass
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    async def test_limits_concurrency(self):
+        limiter = AdaptiveRateLimiter(rate=1000, burst=100, concurrency=2)
+        max_in_flight = []
+
+        async def request():
+            async with limiter.slot():
+                max_in_flight.append(limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[request() for _ in range(6)])
+
+        self.assertEqual(max(max_in_flight), 2)
+
+    def test_halves_concurrency_on_throttle_and_grows_it_back_additively(self):
+        limiter = AdaptiveRateLimiter(concurrency=8, min_concurrency=1, max_concurrency=10)
+
+        limiter.on_throttle()
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+        for _ in range(4):
+            limiter.on_success()
+        self.assertAlmostEqual(limiter.concurrency_limit, 5, delta=0.1)
+
+        for _ in range(10):
+            limiter.on_throttle()
+        self.assertEqual(limiter.concurrency_limit, 1)
+
+    async def test_decreases_once_for_throttles_sent_before_the_decrease(self):
+        limiter = AdaptiveRateLimiter(rate=1000, burst=100, concurrency=8)
+        sent_at = []
+
+        async def request():
+            async with limiter.slot() as sent:
+                sent_at.append(sent)
+
+        await asyncio.gather(*[request() for _ in range(4)])
+        for sent in sent_at:
+            limiter.on_throttle(sent)
+        self.assertEqual(limiter.concurrency_limit, 4)
+
+        await request()
+        limiter.on_throttle(sent_at[-1])
+        self.assertEqual(limiter.concurrency_limit, 2)
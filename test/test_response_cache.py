@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+
+from spypointapi.response_cache import CacheEntry, ResponseCache
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+
+    async def test_returns_cached_value_until_ttl_expires(self):
+        cache = ResponseCache(default_ttl=60)
+        fetches = []
+
+        async def fetch(entry):
+            fetches.append(entry)
+            return CacheEntry(value=len(fetches))
+
+        self.assertEqual(await cache.async_get('/camera/all', fetch), 1)
+        self.assertEqual(await cache.async_get('/camera/all', fetch), 1)
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+    async def test_fetches_again_with_stale_entry_when_expired(self):
+        cache = ResponseCache(default_ttl=0)
+        stale_entries = []
+
+        async def fetch(entry):
+            stale_entries.append(entry)
+            return entry or CacheEntry(value='value', etag='"etag"')
+
+        await cache.async_get('/camera/all', fetch)
+        self.assertEqual(await cache.async_get('/camera/all', fetch), 'value')
+
+        self.assertIsNone(stale_entries[0])
+        self.assertEqual(stale_entries[1].validators, {'If-None-Match': '"etag"'})
+        self.assertEqual(cache.stats.revalidations, 1)
+
+    async def test_uses_longest_matching_prefix_ttl(self):
+        cache = ResponseCache(ttls={'/shared-cameras/': 300, '/shared-cameras/all': 60}, default_ttl=10)
+
+        self.assertEqual(cache.ttl_for('/shared-cameras/all'), 60)
+        self.assertEqual(cache.ttl_for('/shared-cameras/id1'), 300)
+        self.assertEqual(cache.ttl_for('/camera/all'), 10)
+
+    async def test_evicts_least_recently_used_entry(self):
+        cache = ResponseCache(max_entries=2)
+
+        async def fetch(entry):
+            return CacheEntry(value='value')
+
+        await cache.async_get('/a', fetch)
+        await cache.async_get('/b', fetch)
+        await cache.async_get('/a', fetch)
+        await cache.async_get('/c', fetch)
+
+        self.assertIsNotNone(cache.get_fresh('/a'))
+        self.assertIsNone(cache.get_fresh('/b'))
+        self.assertEqual(cache.stats.evictions, 1)
+
+    async def test_coalesces_concurrent_fetches(self):
+        cache = ResponseCache()
+        fetches = []
+
+        async def fetch(entry):
+            fetches.append(entry)
+            await asyncio.sleep(0.01)
+            return CacheEntry(value='value')
+
+        values = await asyncio.gather(*[cache.async_get('/camera/all', fetch) for _ in range(5)])
+
+        self.assertEqual(values, ['value'] * 5)
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(cache.stats.coalesced, 4)
+
+    async def test_invalidates_entry(self):
+        cache = ResponseCache()
+
+        async def fetch(entry):
+            return CacheEntry(value='value')
+
+        await cache.async_get('/camera/all', fetch)
+        cache.invalidate('/camera/all')
+
+        self.assertIsNone(cache.get_fresh('/camera/all'))
@@ -0,0 +1,42 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+
+from spypointapi import RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_retries_throttling_and_server_errors(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.should_retry(0, HTTPStatus.TOO_MANY_REQUESTS))
+        self.assertTrue(policy.should_retry(1, HTTPStatus.BAD_GATEWAY))
+        self.assertTrue(policy.should_retry(0))
+        self.assertFalse(policy.should_retry(0, HTTPStatus.NOT_FOUND))
+        self.assertFalse(policy.should_retry(2, HTTPStatus.SERVICE_UNAVAILABLE))
+
+    def test_backs_off_exponentially_with_jitter(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+
+        for attempt, maximum in ((0, 1), (1, 2), (2, 4), (5, 5)):
+            delay = policy.delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, maximum)
+
+    def test_honors_retry_after_seconds(self):
+        policy = RetryPolicy(backoff_max=30)
+
+        self.assertEqual(policy.delay(0, '7'), 7)
+        self.assertEqual(policy.delay(0, '120'), 30)
+
+    def test_honors_retry_after_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+
+        delay = RetryPolicy.retry_after_from_header(format_datetime(retry_at, usegmt=True))
+
+        self.assertAlmostEqual(delay, 10, delta=1.5)
+
+    def test_ignores_invalid_retry_after(self):
+        self.assertIsNone(RetryPolicy.retry_after_from_header('soon'))
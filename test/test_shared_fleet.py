@@ -0,0 +1,163 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import timedelta
+
+from spypointapi import Coordinates, FleetSnapshot, SharedFleetPublisher, SharedFleetReader
+from spypointapi.shared_fleet import MAGIC, encode_snapshot, map_snapshot
+from .camera_for_test import REPORTED_AT, camera
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+taken_at = REPORTED_AT + timedelta(hours=1)
+
+
+class TestSharedFleetLayout(unittest.TestCase):
+
+    def test_mapped_snapshot_matches_the_original(self):
+        original = FleetSnapshot.from_cameras([camera("1", battery=90.5, coordinates=Coordinates(45.5, -73.6),
+                                                      notifications=["low_battery", "sd_card_full"]),
+                                               camera("é-2", model="other", notifications=[]),
+                                               camera("3", battery=10)], taken_at)
+
+        version, mapped = map_snapshot(encode_snapshot(original, 7))
+
+        self.assertEqual(version, 7)
+        self.assertEqual(mapped.taken_at, taken_at)
+        self.assertEqual(list(mapped.ids), ["1", "é-2", "3"])
+        self.assertEqual(list(mapped.names), ["1", "é-2", "3"])
+        self.assertEqual(list(mapped.notifications), [("low_battery", "sd_card_full"), (), None])
+        for name in original.columns:
+            self.assertEqual([mapped.column(name)[row] for row in range(3)],
+                             [original.column(name)[row] for row in range(3)], name)
+        self.assertEqual(mapped.select(mapped.where('battery', '<', 50)), ["3"])
+        self.assertEqual(mapped.select(mapped.where('model', '==', 'other')), ["é-2"])
+        self.assertEqual(mapped.select(mapped.online(taken_at)), ["1", "é-2", "3"])
+
+    def test_maps_an_empty_fleet(self):
+        version, mapped = map_snapshot(encode_snapshot(FleetSnapshot(taken_at), 1))
+
+        self.assertEqual(len(mapped), 0)
+        self.assertEqual(mapped.where('battery', '<', 50), b'')
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            map_snapshot(b'\x00' * 64)
+        with self.assertRaises(ValueError):
+            map_snapshot(MAGIC)
+        with self.assertRaises(ValueError):
+            map_snapshot(encode_snapshot(FleetSnapshot.from_cameras([camera("1")]), 1)[:-8])
+
+    @unittest.skipUnless(numpy, 'numpy is not installed')
+    def test_numpy_views_the_mapped_columns(self):
+        _, mapped = map_snapshot(encode_snapshot(FleetSnapshot.from_cameras([camera("1", battery=90), camera("2")]), 1))
+
+        battery = mapped.to_numpy('battery')
+
+        self.assertEqual(battery[0], 90)
+        self.assertTrue(battery.mask[1])
+
+
+class TestSharedFleet(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'fleet')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reader_sees_new_versions_only(self):
+        publisher = SharedFleetPublisher(self.path)
+        reader = SharedFleetReader(self.path)
+
+        self.assertFalse(reader.refresh())
+        self.assertEqual(publisher.publish_cameras([camera("1", battery=90)], taken_at), 1)
+        self.assertTrue(reader.refresh())
+        self.assertEqual(reader.version, 1)
+        self.assertFalse(reader.refresh())
+
+        previous = reader.snapshot
+        publisher.publish_cameras([camera("1", battery=80), camera("2", battery=70)], taken_at)
+        self.assertTrue(reader.refresh())
+        self.assertEqual(list(reader.snapshot.ids), ["1", "2"])
+        # a snapshot handed out earlier still reads the version it was mapped from
+        self.assertEqual(previous.column('battery')[0], 90)
+
+    def test_published_file_is_readable_by_other_users(self):
+        SharedFleetPublisher(self.path).publish_cameras([camera("1")])
+
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_published_file_has_the_given_mode(self):
+        SharedFleetPublisher(self.path, mode=0o640).publish_cameras([camera("1")])
+
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+    def test_rejected_file_is_read_again_once_replaced(self):
+        reader = SharedFleetReader(self.path)
+        with open(self.path, 'wb') as file:
+            file.write(MAGIC)
+
+        with self.assertRaises(ValueError):
+            reader.refresh()
+        with self.assertRaises(ValueError):
+            reader.refresh()
+
+        SharedFleetPublisher(self.path).publish_cameras([camera("1")])
+        self.assertTrue(reader.refresh())
+        self.assertEqual(list(reader.snapshot.ids), ["1"])
+
+    def test_same_version_in_a_new_file_is_not_a_change(self):
+        SharedFleetPublisher(self.path).publish_cameras([camera("1")])
+        reader = SharedFleetReader(self.path)
+        reader.refresh()
+        copy = os.path.join(self.directory.name, 'copy')
+        shutil.copy(self.path, copy)
+        os.replace(copy, self.path)
+
+        self.assertFalse(reader.refresh())
+        self.assertEqual(reader.version, 1)
+
+    def test_restarted_publisher_keeps_counting(self):
+        SharedFleetPublisher(self.path).publish_cameras([camera("1")])
+
+        self.assertEqual(SharedFleetPublisher(self.path).publish_cameras([camera("1")]), 2)
+
+    def test_other_process_reads_the_published_fleet(self):
+        SharedFleetPublisher(self.path).publish_cameras([camera("1", battery=90), camera("2", battery=15)], taken_at)
+        script = ("import sys\n"
+                  "from spypointapi import SharedFleetReader\n"
+                  "reader = SharedFleetReader(sys.argv[1])\n"
+                  "reader.refresh()\n"
+                  "print(reader.version, reader.snapshot.select(reader.snapshot.where('battery', '<', 20)))\n")
+
+        output = subprocess.run([sys.executable, '-c', script, self.path], check=True, capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        self.assertEqual(output.stdout.strip(), "1 ['2']")
+
+
+class TestSharedFleetNotifications(unittest.IsolatedAsyncioTestCase):
+
+    async def test_iterates_published_snapshots(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fleet')
+            publisher = SharedFleetPublisher(path)
+            reader = SharedFleetReader(path)
+            snapshots = reader.async_iter_snapshots(interval=0.01)
+
+            publisher.publish_cameras([camera("1")])
+            first = await asyncio.wait_for(anext(snapshots), 1)
+            publisher.publish_cameras([camera("1"), camera("2")])
+            second = await asyncio.wait_for(anext(snapshots), 1)
+            await snapshots.aclose()
+
+            self.assertEqual((len(first), len(second)), (1, 2))
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import jwt
+
+from spypointapi import ResponseCache, SpypointAccountPool, SpypointApiError
+from .spypoint_server_for_test import SpypointServerForTest
+
+
+class TestSpypointAccountPool(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_all_cameras_by_account(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response([{"id": "1", "config": {"name": "camera 1"},
+                                              "status": {"model": "model",
+                                                         "lastUpdate": "2024-10-30T02:03:48.716Z"}}])
+            server.prepare_shared_cameras_response()
+
+            async with SpypointAccountPool([('user1', 'password1'), ('user2', 'password2')]) as pool:
+                cameras = await pool.async_get_all_cameras()
+
+                self.assertEqual(list(cameras), ['user1', 'user2'])
+                self.assertEqual([camera.id for camera in cameras['user1']], ['1'])
+                self.assertEqual([camera.id for camera in cameras['user2']], ['1'])
+                self.assertIs(pool.apis['user1'].session, pool.apis['user2'].session)
+
+    async def test_get_all_cameras_returns_errors_by_account(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+            async with SpypointAccountPool([('user1', 'password1')]) as pool:
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    cameras = await pool.async_get_all_cameras()
+
+                self.assertIsInstance(cameras['user1'], SpypointApiError)
+
+    async def test_logins_share_the_concurrency_limit(self):
+        with SpypointServerForTest() as server:
+            in_flight = []
+            max_in_flight = []
+
+            async def slow_login(url, **kwargs):
+                in_flight.append(url)
+                max_in_flight.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.remove(url)
+
+            server.server.post(f'{server.base_url}/user/login', callback=slow_login, repeat=True,
+                               payload={'token': jwt.encode({'exp': 1627417600}, 'secret')})
+            credentials = [(f'user{i}', 'password') for i in range(4)]
+
+            async with SpypointAccountPool(credentials, max_concurrency=2) as pool:
+                await asyncio.gather(*[api.async_authenticate() for api in pool.apis.values()])
+
+            self.assertEqual(max(max_in_flight), 2)
+
+    async def test_cancels_background_logins_on_exit(self):
+        with SpypointServerForTest() as server:
+            login_started = asyncio.Event()
+
+            async def hanging_login(url, **kwargs):
+                login_started.set()
+                await asyncio.sleep(10)
+
+            server.server.post(f'{server.base_url}/user/login', callback=hanging_login, repeat=True)
+
+            async with SpypointAccountPool([('user1', 'password1')]) as pool:
+                api = pool.apis['user1']
+                api.expires_at = datetime.now() + timedelta(minutes=1)
+                await api.async_authenticate()
+                task = api._login_task
+                await login_started.wait()
+
+            self.assertTrue(task.cancelled())
+
+    async def test_staggers_token_refresh(self):
+        credentials = [(f'user{i}', 'password') for i in range(4)]
+
+        async with SpypointAccountPool(credentials, token_refresh_skew=timedelta(minutes=5),
+                                       token_refresh_window=timedelta(minutes=20)) as pool:
+            skews = [api.token_refresh_skew for api in pool.apis.values()]
+
+        self.assertEqual(skews, [timedelta(minutes=5), timedelta(minutes=10),
+                                 timedelta(minutes=15), timedelta(minutes=20)])
+
+    async def test_gives_each_account_its_own_cache(self):
+        credentials = [('user1', 'password1'), ('user2', 'password2')]
+
+        async with SpypointAccountPool(credentials, cache_factory=ResponseCache) as pool:
+            self.assertIsInstance(pool.apis['user1'].cache, ResponseCache)
+            self.assertIsNot(pool.apis['user1'].cache, pool.apis['user2'].cache)
+
+    def test_rejects_a_shared_cache(self):
+        with self.assertRaises(ValueError):
+            SpypointAccountPool([('user1', 'password1')], cache=ResponseCache())
@@ -1,12 +1,20 @@
+import asyncio
+import threading
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
 
 import aiohttp
 import jwt
+from yarl import URL
 
-from spypointapi import SpypointApi
+from spypointapi import AdaptiveRateLimiter, CameraConfig, MemoryTokenStore, RetryPolicy, SpypointApi
 from spypointapi.cameras.camera_api_response import CameraApiResponse
+from spypointapi.cameras.camera_changes import CameraChangeType
+from spypointapi.photos.photo import Photo
+from spypointapi.response_cache import ResponseCache
+from spypointapi.retry_policy import RequestStats
+from spypointapi.token_store import StoredToken
 from spypointapi.spypoint_api import SpypointApiInvalidCredentialsError, SpypointApiError
 from .spypoint_server_for_test import SpypointServerForTest
 
@@ -131,6 +139,7 @@ class TestSpypointApi(unittest.IsolatedAsyncioTestCase):
         with SpypointServerForTest() as server:
             server.prepare_login_response()
             server.prepare_cameras_response(status=HTTPStatus.UNAUTHORIZED)
+            server.prepare_shared_cameras_response(status=HTTPStatus.UNAUTHORIZED)
 
             async with aiohttp.ClientSession() as session:
                 api = SpypointApi(self.username, self.password, session)
@@ -140,3 +149,527 @@ class TestSpypointApi(unittest.IsolatedAsyncioTestCase):
 
                 self.assertLess(api.expires_at, datetime.now())
                 self.assertIsNone(api.headers.get('Authorization'))
+
+    async def test_get_cameras_cancels_shared_cameras_when_own_cameras_fail(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response(status=HTTPStatus.INTERNAL_SERVER_ERROR)
+            cancelled = asyncio.Event()
+
+            async def get_shared_cameras():
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                api.async_get_shared_cameras = get_shared_cameras
+
+                with self.assertRaises(SpypointApiError):
+                    await api.async_get_cameras()
+
+                self.assertTrue(cancelled.is_set())
+
+    async def test_authentication_error_keeps_token_from_concurrent_login(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response(status=HTTPStatus.UNAUTHORIZED, repeat=False)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+
+                async def concurrent_login(url, **kwargs):
+                    api.headers['Authorization'] = 'Bearer concurrent'
+                    api.expires_at = datetime.now() + timedelta(hours=1)
+
+                server.server.get(f'{server.base_url}/camera/all', status=HTTPStatus.UNAUTHORIZED,
+                                  callback=concurrent_login)
+
+                with self.assertRaises(SpypointApiError):
+                    await api.async_get_own_cameras()
+
+                self.assertEqual(api.headers.get('Authorization'), 'Bearer concurrent')
+
+    async def test_concurrent_requests_authenticate_once(self):
+        with SpypointServerForTest() as server:
+            token = jwt.encode({'exp': int((datetime.now() + timedelta(hours=1)).timestamp())}, 'secret')
+            server.prepare_login_response({'token': token})
+            server.prepare_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                await asyncio.gather(*[api.async_get_own_cameras() for _ in range(10)])
+
+                server.assert_called_n_times_with(1, url='/user/login',
+                                                  method='POST',
+                                                  headers={'Content-Type': 'application/json'},
+                                                  json={'username': self.username, 'password': self.password})
+
+    async def test_refreshes_token_in_background_when_about_to_expire(self):
+        with SpypointServerForTest() as server:
+            token = jwt.encode({'exp': int((datetime.now() + timedelta(hours=1)).timestamp())}, 'secret')
+            server.prepare_login_response({'token': token})
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, token_refresh_skew=timedelta(minutes=5))
+                api.headers['Authorization'] = 'Bearer old'
+                api.expires_at = datetime.now() + timedelta(minutes=1)
+
+                await api.async_authenticate()
+                self.assertEqual(api.headers.get('Authorization'), 'Bearer old')
+
+                await api._login_task
+                self.assertEqual(api.headers.get('Authorization'), f'Bearer {token}')
+
+    async def test_refresh_skew_longer_than_token_lifetime_does_not_log_in_every_request(self):
+        with SpypointServerForTest() as server:
+            token = jwt.encode({'exp': int((datetime.now() + timedelta(hours=1)).timestamp())}, 'secret')
+            server.prepare_login_response({'token': token})
+            server.prepare_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, token_refresh_skew=timedelta(hours=2))
+                for _ in range(3):
+                    await api.async_get_own_cameras()
+
+                server.assert_called_n_times(1, url='/user/login', method='POST')
+
+    async def test_get_cameras_logs_in_again_and_retries_on_authentication_error(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response(status=HTTPStatus.UNAUTHORIZED, repeat=False)
+            server.prepare_cameras_response([])
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                cameras = await api.async_get_own_cameras()
+
+                self.assertEqual(cameras, [])
+                server.assert_called_n_times(2, url='/camera/all', method='GET')
+                server.assert_called_n_times(2, url='/user/login', method='POST')
+
+    async def test_get_shared_cameras_limits_concurrent_requests(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            camera_ids = [f'id{i}' for i in range(10)]
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": i} for i in camera_ids]}])
+
+            in_flight = []
+            max_in_flight = []
+
+            async def slow_response(url, **kwargs):
+                in_flight.append(url)
+                max_in_flight.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.remove(url)
+
+            for camera_id in camera_ids:
+                server.server.get(f'{server.base_url}/shared-cameras/{camera_id}', callback=slow_response,
+                                  payload={"config": {"name": camera_id},
+                                           "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}})
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, max_concurrency=3)
+                cameras = await api.async_get_shared_cameras()
+
+                self.assertEqual([camera.id for camera in cameras], camera_ids)
+                self.assertEqual(max(max_in_flight), 3)
+
+    async def test_get_shared_cameras_partial_results_skips_failing_cameras(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "id1"}, {"cameraId": "id2"}]}])
+            server.prepare_shared_camera_response("id1", status=HTTPStatus.INTERNAL_SERVER_ERROR)
+            server.prepare_shared_camera_response("id2", {
+                "config": {"name": "camera 2", },
+                "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z", }
+            })
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, partial_results=True)
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    cameras = await api.async_get_shared_cameras()
+
+                self.assertEqual([camera.id for camera in cameras], ["id2"])
+
+    async def test_get_shared_cameras_fails_on_first_error_without_partial_results(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "id1"}]}])
+            server.prepare_shared_camera_response("id1", status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+
+                with self.assertRaises(SpypointApiError):
+                    await api.async_get_shared_cameras()
+
+    async def test_get_own_cameras_from_cache(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response([])
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, cache=ResponseCache())
+                await api.async_get_own_cameras()
+                cameras = await api.async_get_own_cameras()
+
+                self.assertEqual(cameras, [])
+                server.assert_called_n_times(1, url='/camera/all', method='GET')
+                self.assertEqual(api.cache.stats.hits, 1)
+
+    async def test_get_own_cameras_revalidates_cache_with_etag(self):
+        with SpypointServerForTest() as server:
+            token = server.prepare_login_response()
+            server.prepare_cameras_response([], headers={'ETag': '"v1"'}, repeat=False)
+            server.prepare_cameras_response(status=HTTPStatus.NOT_MODIFIED, repeat=False)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, cache=ResponseCache(default_ttl=0))
+                first = await api.async_get_own_cameras()
+                second = await api.async_get_own_cameras()
+
+                self.assertIs(first, second)
+                server.assert_called_with(
+                    url='/camera/all',
+                    method='GET',
+                    headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}',
+                             'If-None-Match': '"v1"'})
+                self.assertEqual(api.cache.stats.revalidations, 1)
+
+    async def test_iter_camera_changes(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            camera = {"id": "1", "config": {"name": "camera 1"},
+                      "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}}
+            server.prepare_cameras_response([camera], repeat=False)
+            server.prepare_cameras_response([camera], repeat=False)
+            server.prepare_cameras_response([], repeat=False)
+            server.prepare_shared_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+
+                added = [change async for change in api.async_iter_camera_changes()]
+                unchanged = [change async for change in api.async_iter_camera_changes()]
+                removed = [change async for change in api.async_iter_camera_changes()]
+
+                self.assertEqual([(change.type, change.camera.id) for change in added],
+                                 [(CameraChangeType.ADDED, "1")])
+                self.assertEqual(unchanged, [])
+                self.assertEqual([(change.type, change.camera.id) for change in removed],
+                                 [(CameraChangeType.REMOVED, "1")])
+
+    async def test_iter_camera_changes_keeps_shared_cameras_that_failed_to_fetch(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "1"}]}])
+            camera = {"config": {"name": "camera 1"},
+                      "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}}
+            server.prepare_shared_camera_response("1", camera, repeat=False)
+            server.prepare_shared_camera_response("1", status=HTTPStatus.INTERNAL_SERVER_ERROR, repeat=False)
+            server.prepare_shared_camera_response("1", camera, repeat=False)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, partial_results=True)
+
+                added = [change async for change in api.async_iter_camera_changes()]
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    failed = [change async for change in api.async_iter_camera_changes()]
+                recovered = [change async for change in api.async_iter_camera_changes()]
+
+                self.assertEqual([change.type for change in added], [CameraChangeType.ADDED])
+                self.assertEqual(failed, [])
+                self.assertEqual(recovered, [])
+
+    async def test_iter_own_cameras(self):
+        with SpypointServerForTest() as server:
+            cameras_response = [
+                {"id": str(i), "config": {"name": f"camera {i}"},
+                 "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}}
+                for i in range(100)
+            ]
+            server.prepare_login_response()
+            server.prepare_cameras_response(cameras_response)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                api.stream_chunk_size = 100
+                with self.assertLogs('spypointapi', level='DEBUG'):
+                    cameras = [camera async for camera in api.async_iter_own_cameras()]
+
+                self.assertEqual(cameras, CameraApiResponse.from_json(cameras_response))
+
+    async def test_get_own_cameras_decodes_large_responses_in_executor(self):
+        with SpypointServerForTest() as server:
+            cameras_response = [
+                {"id": str(i), "config": {"name": f"camera {i}"},
+                 "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}}
+                for i in range(100)
+            ]
+            server.prepare_login_response()
+            server.prepare_cameras_response(cameras_response)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, decode_offload_threshold=1024)
+                threads = []
+
+                def parse(data):
+                    threads.append(threading.current_thread())
+                    return CameraApiResponse.from_json(data)
+
+                cameras = await api._get_parsed('/camera/all', parse)
+
+                self.assertEqual(cameras, CameraApiResponse.from_json(cameras_response))
+                self.assertIsNot(threads[0], threading.main_thread())
+                self.assertEqual(await api.async_get_own_cameras(), cameras)
+
+    async def test_iter_camera_changes_updates_the_tracker_on_the_loop(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response([{"id": str(i), "config": {"name": f"camera {i}"},
+                                              "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}}
+                                             for i in range(100)])
+            server.prepare_shared_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, decode_offload_threshold=1024)
+                threads = []
+                reuse_unchanged = api._camera_changes.reuse_unchanged
+
+                def record_thread(cameras):
+                    threads.append(threading.current_thread())
+                    return reuse_unchanged(cameras)
+
+                api._camera_changes.reuse_unchanged = record_thread
+                changes = [change async for change in api.async_iter_camera_changes()]
+
+                self.assertEqual(len(changes), 100)
+                self.assertEqual(threads, [threading.main_thread()])
+
+    async def test_get_own_cameras_retries_server_errors(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response(status=HTTPStatus.SERVICE_UNAVAILABLE, repeat=False)
+            server.prepare_cameras_response(status=HTTPStatus.TOO_MANY_REQUESTS, repeat=False,
+                                            headers={'Retry-After': '0'})
+            server.prepare_cameras_response([])
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session,
+                                  rate_limiter=AdaptiveRateLimiter(concurrency=4),
+                                  retry_policy=RetryPolicy(backoff_base=0))
+                cameras = await api.async_get_own_cameras()
+
+                self.assertEqual(cameras, [])
+                self.assertEqual(api.request_stats, RequestStats(requests=3, retries=2, throttles=2))
+                self.assertLess(api.rate_limiter.concurrency_limit, 4)
+
+    async def test_rate_limiter_slot_is_held_until_the_body_is_read(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, rate_limiter=AdaptiveRateLimiter())
+                async with api._open_get('/camera/all', stream=True) as response:
+                    self.assertEqual(api.rate_limiter.in_flight, 1)
+                    await response.read()
+
+                self.assertEqual(api.rate_limiter.in_flight, 0)
+
+    async def test_get_own_cameras_gives_up_after_max_retries(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response(status=HTTPStatus.BAD_GATEWAY)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session,
+                                  retry_policy=RetryPolicy(max_retries=2, backoff_base=0))
+
+                with self.assertRaises(SpypointApiError):
+                    await api.async_get_own_cameras()
+
+                server.assert_called_n_times(3, url='/camera/all', method='GET')
+
+    async def test_does_not_retry_writes(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_camera_config_response('id', status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session,
+                                  retry_policy=RetryPolicy(max_retries=2, backoff_base=0))
+
+                with self.assertRaises(SpypointApiError):
+                    await api.async_update_camera_config('id', CameraConfig(delay=10))
+
+                server.assert_called_n_times(1, url='/camera/config/id', method='PUT')
+
+    async def test_uses_stored_token_without_login(self):
+        with SpypointServerForTest() as server:
+            server.prepare_cameras_response()
+            store = MemoryTokenStore()
+            await store.async_save(self.username, StoredToken('stored', datetime.now() + timedelta(hours=1)))
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, token_store=store)
+                await api.async_get_own_cameras()
+
+                server.assert_called_n_times(0, url='/user/login', method='POST')
+                server.assert_called_with(
+                    url='/camera/all',
+                    method='GET',
+                    headers={'Content-Type': 'application/json', 'Authorization': 'Bearer stored'})
+
+    async def test_stores_token_after_login(self):
+        with SpypointServerForTest() as server:
+            token = server.prepare_login_response()
+            store = MemoryTokenStore()
+            await store.async_save(self.username, StoredToken('expired', datetime.now() - timedelta(seconds=1)))
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, token_store=store)
+                await api.async_authenticate()
+
+                self.assertEqual(await store.async_load(self.username),
+                                 StoredToken(token, datetime.fromtimestamp(1627417600)))
+
+    async def test_logs_in_when_stored_token_is_rejected(self):
+        with SpypointServerForTest() as server:
+            token = server.prepare_login_response()
+            server.prepare_cameras_response(status=HTTPStatus.UNAUTHORIZED, repeat=False)
+            server.prepare_cameras_response()
+            store = MemoryTokenStore()
+            await store.async_save(self.username, StoredToken('revoked', datetime.now() + timedelta(hours=1)))
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, token_store=store)
+                await api.async_get_own_cameras()
+
+                server.assert_called_n_times(1, url='/user/login', method='POST')
+                self.assertEqual(api.headers['Authorization'], f'Bearer {token}')
+
+    async def test_get_shared_camera_by_id(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "shared"}]}])
+            server.prepare_shared_camera_response("shared", {
+                "config": {"name": "camera 1", },
+                "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z", }
+            })
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                cameras = await asyncio.gather(api.async_get_camera("shared"), api.async_get_camera("shared"))
+
+                self.assertEqual([camera.id for camera in cameras], ["shared", "shared"])
+                server.assert_called_n_times(1, url='/shared-cameras/shared', method='GET')
+                server.assert_called_n_times(0, url='/camera/all', method='GET')
+
+    async def test_get_cameras_by_ids_fetches_owned_cameras_once(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response([
+                {"id": camera_id, "config": {"name": camera_id},
+                 "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z"}}
+                for camera_id in ("own1", "own2", "own3")
+            ])
+            server.prepare_shared_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, cache=ResponseCache())
+                cameras = await api.async_get_cameras_by_ids(["own3", "own1", "own1", "unknown"])
+                camera = await api.async_get_camera("own2")
+
+                self.assertEqual(list(cameras), ["own3", "own1"])
+                self.assertEqual(camera.id, "own2")
+                server.assert_called_n_times(1, url='/camera/all', method='GET')
+
+    async def test_get_camera_refresh_bypasses_cache(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_shared_cameras_response([{"sharedCameras": [{"cameraId": "shared"}]}])
+            server.prepare_shared_camera_response("shared", {
+                "config": {"name": "camera 1", },
+                "status": {"model": "model", "lastUpdate": "2024-10-30T02:03:48.716Z", }
+            })
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session, cache=ResponseCache())
+                await api.async_get_camera("shared")
+                await api.async_get_camera("shared")
+                await api.async_get_camera("shared", refresh=True)
+
+                server.assert_called_n_times(2, url='/shared-cameras/shared', method='GET')
+
+    async def test_get_camera_not_found(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response()
+            server.prepare_shared_cameras_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+
+                self.assertIsNone(await api.async_get_camera("unknown"))
+
+    async def test_iter_photos_pages_until_since(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+
+            def photo(photo_id, hour):
+                return {"id": photo_id, "camera": "camera1", "date": f"2024-10-30T{hour:02}:00:00.000Z",
+                        "large": {"host": "s3.amazonaws.com", "path": f"{photo_id}.jpg"}}
+
+            server.prepare_photos_response({"photos": [photo("p5", 5), photo("p4", 4)]}, repeat=False)
+            server.prepare_photos_response({"photos": [photo("p4", 4), photo("p3", 3)]}, repeat=False)
+            server.prepare_photos_response({"photos": [photo("p2", 2), photo("p1", 1)]}, repeat=False)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                api.photos_page_size = 2
+                since = datetime(2024, 10, 30, 1, 30, tzinfo=timezone.utc)
+                photos = [photo async for photo in api.async_iter_photos(["camera1"], since=since)]
+
+                self.assertEqual([photo.id for photo in photos], ["p5", "p4", "p3", "p2"])
+                server.assert_called_with(
+                    url='/photo/all',
+                    method='POST',
+                    headers=api.headers,
+                    json={'camera': ['camera1'], 'dateEnd': '2024-10-30T03:00:00.000Z', 'favorite': False,
+                          'hd': False, 'limit': 2, 'tag': []})
+
+    async def test_iter_photos_steps_past_a_full_page_sharing_one_date(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+
+            def photo(photo_id, hour):
+                return {"id": photo_id, "camera": "camera1", "date": f"2024-10-30T{hour:02}:00:00.000Z"}
+
+            server.prepare_photos_response({"photos": [photo("a", 5), photo("b", 5)]}, repeat=False)
+            server.prepare_photos_response({"photos": [photo("b", 5), photo("a", 5)]}, repeat=False)
+            server.prepare_photos_response({"photos": [photo("c", 4), photo("d", 3)]}, repeat=False)
+            server.prepare_photos_response({"photos": [photo("e", 2)]}, repeat=False)
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi(self.username, self.password, session)
+                api.photos_page_size = 2
+                with self.assertLogs('spypointapi', level='WARNING'):
+                    photos = [photo async for photo in api.async_iter_photos(["camera1"])]
+
+                self.assertEqual([photo.id for photo in photos], ["a", "b", "c", "d", "e"])
+                requests = server.server.requests[('POST', URL(f'{server.base_url}/photo/all'))]
+                self.assertEqual([request.kwargs['json']['dateEnd'] for request in requests],
+                                 ['2100-01-01T00:00:00.000Z', '2024-10-30T05:00:00.000Z',
+                                  '2024-10-30T04:59:59.999Z', '2024-10-30T03:00:00.000Z'])
+
+    async def test_download_photo_without_url(self):
+        async with aiohttp.ClientSession() as session:
+            api = SpypointApi(self.username, self.password, session)
+
+            with self.assertRaises(ValueError):
+                await api.async_download_photo(Photo(id="p1", camera_id="camera1", date=datetime.now()), 'p1.jpg')
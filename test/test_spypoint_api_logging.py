@@ -0,0 +1,67 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+import aiohttp
+import jwt
+
+from spypointapi import SpypointApi
+from spypointapi.spypoint_api_logging import redact_headers, redact_json
+from .spypoint_server_for_test import SpypointServerForTest
+
+
+class TestSpypointApiLogging(unittest.IsolatedAsyncioTestCase):
+
+    def test_redacts_authorization_header(self):
+        headers = redact_headers({'Content-Type': 'application/json', 'Authorization': 'Bearer token'})
+
+        self.assertEqual(headers, {'Content-Type': 'application/json', 'Authorization': '***'})
+
+    def test_redacts_password(self):
+        json = redact_json({'username': 'username', 'password': 'password'})
+
+        self.assertEqual(json, {'username': 'username', 'password': '***'})
+
+    async def test_logs_redacted_request_and_response(self):
+        with SpypointServerForTest() as server:
+            token = jwt.encode({'exp': 1627417600}, 'secret')
+            server.prepare_login_response({'token': token})
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi('username', 'password', session)
+                with self.assertLogs('spypointapi', level='DEBUG') as logs:
+                    await api.async_authenticate()
+
+                output = '\n'.join(logs.output)
+                self.assertIn('/user/login', output)
+                self.assertNotIn("'password'}", output)
+                self.assertNotIn(token, output)
+
+    async def test_truncates_large_response_body(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+            server.prepare_cameras_response([{'id': str(i)} for i in range(1000)])
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi('username', 'password', session)
+                api.log_body_max_size = 100
+                await api.async_authenticate()
+                with self.assertLogs('spypointapi', level='DEBUG') as logs:
+                    body = (await api._get('/camera/all')).json()
+
+                self.assertEqual(len(body), 1000)
+                self.assertIn('bytes)', logs.output[0])
+                self.assertLess(len(logs.output[0]), 1000)
+
+    async def test_does_not_read_response_when_debug_is_disabled(self):
+        with SpypointServerForTest() as server:
+            server.prepare_login_response()
+
+            async with aiohttp.ClientSession() as session:
+                api = SpypointApi('username', 'password', session)
+                logging.getLogger('spypointapi').setLevel(logging.INFO)
+                self.addCleanup(logging.getLogger('spypointapi').setLevel, logging.NOTSET)
+                with patch('spypointapi.spypoint_api.async_read_log_body') as read_log_body:
+                    await api.async_authenticate()
+
+                read_log_body.assert_not_called()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from spypointapi import CameraChange, CameraChangeType, TelemetryHistory
+from spypointapi.telemetry_history import TelemetryPoint
+from . import camera_for_test
+
+start = datetime(2024, 10, 30, tzinfo=timezone.utc)
+
+
+def camera(camera_id, minutes, battery=90.0, signal=None, temperature=20, memory=12.5):
+    return camera_for_test.camera(camera_id, start + timedelta(minutes=minutes),
+                                  battery=battery, signal=signal, temperature=temperature, memory=memory)
+
+
+class TelemetryHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'history')
+        self.history = TelemetryHistory(self.path)
+
+    def tearDown(self):
+        self.history.close()
+        self.directory.cleanup()
+
+    def test_records_and_queries_telemetry(self):
+        self.history.record([camera('1', 0, battery=90.5), camera('2', 0, battery=50)])
+        self.history.record([camera('1', 5, battery=89.25, signal=70), camera('2', 5, battery=49)])
+
+        self.assertEqual(self.history.query('1'), [
+            TelemetryPoint(start, battery=90.5, temperature=20, memory=12.5),
+            TelemetryPoint(start + timedelta(minutes=5), battery=89.25, signal=70, temperature=20, memory=12.5),
+        ])
+        self.assertEqual([point.battery for point in self.history.query('2')], [50, 49])
+        self.assertEqual(self.history.query('unknown'), [])
+
+    def test_keeps_fractional_temperatures(self):
+        self.history.record([camera('1', 0, temperature=20.5)])
+
+        self.assertEqual([point.temperature for point in self.history.query('1')], [20.5])
+
+    def test_skips_unchanged_telemetry(self):
+        self.assertEqual(self.history.record([camera('1', 0)]), 1)
+        self.assertEqual(self.history.record([camera('1', 5)]), 0)
+        self.assertEqual(self.history.record([camera('1', 10, battery=80)]), 1)
+
+    def test_records_changes(self):
+        changes = [CameraChange(CameraChangeType.ADDED, camera('1', 0)),
+                   CameraChange(CameraChangeType.REMOVED, camera('2', 0))]
+
+        self.assertEqual(self.history.record_changes(changes), 1)
+        self.assertEqual(self.history.query('2'), [])
+
+    def test_queries_time_range(self):
+        for minutes in range(0, 60, 10):
+            self.history.record([camera('1', minutes, battery=100 - minutes)])
+
+        points = self.history.query('1', start + timedelta(minutes=20), start + timedelta(minutes=40))
+
+        self.assertEqual([point.battery for point in points], [80, 70])
+
+    def test_downsamples(self):
+        for minutes in range(0, 120, 30):
+            self.history.record([camera('1', minutes, battery=100 - minutes / 10)])
+
+        points = self.history.downsample('1', timedelta(hours=1))
+
+        self.assertEqual([(point.time, point.battery) for point in points],
+                         [(start, 98.5), (start + timedelta(hours=1), 92.5)])
+
+    def test_reopens_existing_history(self):
+        self.history.record([camera('1', 0), camera('2', 0)])
+        self.history.close()
+
+        self.history = TelemetryHistory(self.path)
+        self.history.record([camera('2', 5, battery=10)])
+
+        self.assertEqual([point.battery for point in self.history.query('2')], [90, 10])
+
+    def test_reopened_history_skips_unchanged_telemetry(self):
+        self.history.record([camera('1', 0), camera('2', 0, battery=50)])
+        self.history.record([camera('1', 5, battery=80)])
+        self.history.close()
+
+        self.history = TelemetryHistory(self.path)
+
+        self.assertEqual(self.history.record([camera('1', 10, battery=80), camera('2', 10, battery=50)]), 0)
+        self.assertEqual(self.history.record([camera('1', 3, battery=70)]), 0)
+
+    def test_ignores_torn_write(self):
+        self.history.record([camera('1', 0)])
+        self.history.close()
+        size = os.path.getsize(self.path)
+        with open(self.path, 'ab') as file:
+            file.write(b'R\x00\x01')
+
+        self.history = TelemetryHistory(self.path)
+
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual(len(self.history.query('1')), 1)
+
+    def test_compacts_with_retention(self):
+        for minutes in range(0, 60 * 48, 60):
+            self.history.record([camera('1', minutes, battery=100 - minutes / 60), camera('2', 0)])
+        size = os.path.getsize(self.path)
+
+        self.history.compact(retention=timedelta(hours=24), now=start + timedelta(hours=48))
+
+        self.assertLess(os.path.getsize(self.path), size)
+        self.assertEqual(self.history.query('2'), [])
+        points = self.history.query('1')
+        self.assertEqual(len(points), 24)
+        self.assertEqual(points[0].time, start + timedelta(hours=24))
+        self.assertEqual(self.history.record([camera('1', 60 * 48, battery=0)]), 1)
+        self.assertEqual(self.history.query('1')[-1].battery, 0)
+
+    def test_rejects_other_files(self):
+        other = os.path.join(self.directory.name, 'other')
+        with open(other, 'wb') as file:
+            file.write(b'not a history file')
+
+        with self.assertRaises(ValueError):
+            TelemetryHistory(other)
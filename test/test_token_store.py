@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from spypointapi import FileTokenStore, KeyValueTokenStore, MemoryTokenStore
+from spypointapi.token_store import StoredToken
+
+
+class TestTokenStore(unittest.IsolatedAsyncioTestCase):
+    token = StoredToken(token='token', expires_at=datetime(2030, 1, 1, 12, 0, 0))
+
+    async def test_memory_store(self):
+        store = MemoryTokenStore()
+        await store.async_save('username', self.token)
+
+        self.assertEqual(await store.async_load('username'), self.token)
+        self.assertIsNone(await store.async_load('other'))
+
+    async def test_key_value_store(self):
+        values = {}
+
+        async def get(key):
+            return values.get(key)
+
+        async def set(key, value):
+            values[key] = value
+
+        store = KeyValueTokenStore(get, set)
+        await store.async_save('username', self.token)
+
+        self.assertEqual(list(values), ['spypoint-token:username'])
+        self.assertEqual(await store.async_load('username'), self.token)
+        self.assertIsNone(await store.async_load('other'))
+
+    async def test_file_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tokens.json')
+            other = StoredToken(token='other', expires_at=datetime(2031, 1, 1))
+
+            await FileTokenStore(path).async_save('username', self.token)
+            await FileTokenStore(path).async_save('other', other)
+            store = FileTokenStore(path)
+
+            self.assertEqual(await store.async_load('username'), self.token)
+            self.assertEqual(await store.async_load('other'), other)
+            self.assertIsNone(await store.async_load('missing'))
+            self.assertEqual(sorted(os.listdir(directory)), ['tokens.json', 'tokens.json.lock'])
+
+    async def test_file_store_without_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileTokenStore(os.path.join(directory, 'tokens.json'))
+
+            self.assertIsNone(await store.async_load('username'))